@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+"""Times the PedigreeIds and GlobalIds arrays genGrid adds to a 0.25 degree
+global grid: the python SetValue loop genGrid used to run against
+vcs2vtk.genIdArray. Timings only, nothing is asserted."""
+from __future__ import print_function
+import time
+import vtk
+import vcs.vcs2vtk
+
+
+def loopIds(n, name):
+    ids = vtk.vtkIntArray()
+    ids.SetName(name)
+    ids.SetNumberOfTuples(n)
+    for i in range(0, n):
+        ids.SetValue(i, i)
+    return ids
+
+
+def main():
+    # cells of a 0.25 degree global grid
+    n = 1440 * 720
+
+    start = time.time()
+    loopIds(n, "PedigreeIds")
+    loopIds(n, "GlobalIds")
+    loop = time.time() - start
+
+    start = time.time()
+    vcs.vcs2vtk.genIdArray(n, "PedigreeIds")
+    vcs.vcs2vtk.genIdArray(n, "GlobalIds")
+    shared = time.time() - start
+
+    print("%d cells" % n)
+    print("PedigreeIds and GlobalIds with a python loop: %.4fs" % loop)
+    print("PedigreeIds and GlobalIds from the shared buffer: %.4fs" % shared)
+
+
+if __name__ == "__main__":
+    main()
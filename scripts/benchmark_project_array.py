@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""Times vcs2vtk.projectArray and vcs2vtk.project_numpy against transforming
+10^6 points one tuple at a time with TransformPoint.
+Timings only, nothing is asserted."""
+from __future__ import print_function
+import time
+import numpy
+from vtk.util import numpy_support as VN
+import vcs
+import vcs.vcs2vtk
+
+
+def main():
+    n = 10 ** 6
+    p = vcs.createprojection()
+    p.type = "robinson"
+    wc = [-180., 180., -90., 90.]
+    geo = vcs.vcs2vtk.getGeoTransform(p, wc)
+    lonLat = numpy.zeros((n, 3))
+    lonLat[:, 0] = numpy.random.uniform(-180., 180., n)
+    lonLat[:, 1] = numpy.random.uniform(-90., 90., n)
+
+    w = VN.numpy_to_vtk(lonLat, deep=True)
+    start = time.time()
+    for i in range(0, w.GetNumberOfTuples()):
+        tuple = [0, 0, 0]
+        w.GetTypedTuple(i, tuple)
+        geo.TransformPoint(tuple, tuple)
+        w.SetTypedTuple(i, tuple)
+    loop = time.time() - start
+
+    w = VN.numpy_to_vtk(lonLat, deep=True)
+    start = time.time()
+    vcs.vcs2vtk.projectArray(w, p, wc)
+    bulk = time.time() - start
+
+    start = time.time()
+    vcs.vcs2vtk.project_numpy(lonLat[:, 0], lonLat[:, 1], p, wc)
+    projectNumpy = time.time() - start
+
+    print("%d points" % n)
+    print("TransformPoint loop: %.4fs" % loop)
+    print("projectArray: %.4fs" % bulk)
+    print("project_numpy: %.4fs" % projectNumpy)
+
+
+if __name__ == "__main__":
+    main()
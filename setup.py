@@ -36,11 +36,17 @@ setup(name="vcs",
       zip_safe=True,
       data_files=[('share/vcs', ('share/wmo_symbols.json',
                                  'share/data_continent_coarse',
+                                 'share/data_continent_coarse.npz',
                                  'share/data_continent_political',
+                                 'share/data_continent_political.npz',
                                  'share/data_continent_river',
+                                 'share/data_continent_river.npz',
                                  'share/data_continent_states',
+                                 'share/data_continent_states.npz',
                                  'share/data_continent_other7',
+                                 'share/data_continent_other7.npz',
                                  'share/data_continent_fine',
+                                 'share/data_continent_fine.npz',
                                  'share/initial.attributes',
                                  'share/cdat.png',
                                  'share/marker_icon.png',
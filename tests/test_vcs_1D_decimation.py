@@ -0,0 +1,44 @@
+import unittest
+import numpy
+import vcs
+from vcs.coordinates import Coordinates
+from vcs.vcsvtk.pipeline1d import segmentCoordinates, decimateCoordinates
+
+
+class TestVCS1DDecimation(unittest.TestCase):
+    def testSegments(self):
+        x = numpy.ma.arange(8.)
+        y = numpy.ma.masked_array(numpy.arange(8.), mask=[1, 0, 0, 1, 0, 0, 0, 1])
+        xs, ys, rows = segmentCoordinates(x, y)
+        self.assertEqual(xs, [[1., 2.], [4., 5., 6.]])
+        self.assertEqual(ys, xs)
+        self.assertEqual(rows.tolist(), [0, 0])
+
+    def testMinMaxPerColumn(self):
+        x = numpy.arange(1000.)
+        y = numpy.sin(x)
+        y[10] = 5.
+        y[11] = -5.
+        xs, ys, _ = segmentCoordinates(numpy.ma.array(x), numpy.ma.array(y))
+        dx, dy = decimateCoordinates(xs, ys, 0., 1000., 10)
+        # at most first, last, min and max of each column
+        self.assertLessEqual(len(dx.values), 40)
+        self.assertEqual(dx.values[0], 0.)
+        self.assertEqual(dx.values[-1], 999.)
+        self.assertIn(5., dy.values)
+        self.assertIn(-5., dy.values)
+        # the points stay in order
+        self.assertTrue((numpy.diff(dx.values) > 0).all())
+
+    def testLinesAreKept(self):
+        xs = Coordinates.fromGroups([[0., 1., 2.], [3., 4.]])
+        dx, dy = decimateCoordinates(xs, xs.copy(), 0., 4., 1)
+        self.assertEqual(dx, [[0., 2.], [3., 4.]])
+
+    def testAttribute(self):
+        gm = vcs.create1d()
+        self.assertFalse(gm.decimate)
+        gm.decimate = True
+        self.assertTrue(vcs.create1d(source=gm).decimate)
+        with self.assertRaises(ValueError):
+            gm.decimate = "yes"
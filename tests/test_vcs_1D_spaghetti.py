@@ -0,0 +1,83 @@
+import unittest
+import basevcstest
+import MV2
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import vcs
+import vcs.vcs2vtk
+from vcs.vcsvtk.pipeline1d import segmentCoordinates
+
+
+class TestVCS1DSpaghetti(unittest.TestCase):
+    def testCurves(self):
+        x = numpy.ma.arange(4.)
+        curves = numpy.ma.masked_array([[0., 1., 2., 3.], [4., 5., 6., 7.], [8., 9., 10., 11.]],
+                                       mask=[[0, 0, 0, 0], [0, 1, 0, 0], [1, 1, 1, 1]])
+        xs, ys, rows = segmentCoordinates(x, curves)
+        # the curves are not joined, the masked values split them
+        self.assertEqual(xs, [[0., 1., 2., 3.], [0.], [2., 3.]])
+        self.assertEqual(ys, [[0., 1., 2., 3.], [4.], [6., 7.]])
+        self.assertEqual(rows.tolist(), [0, 1, 1])
+
+    def testSinglePolyData(self):
+        x = numpy.linspace(0., 1., 50)
+        curves = numpy.sin(numpy.arange(100)[:, None] + x * 10.)
+        xs, ys, rows = segmentCoordinates(x, curves)
+        colors = vcs.getcolors(range(101), split=0)
+        ln = vcs.createline()
+        ln.x = xs
+        ln.y = ys
+        ln.color = [colors[row] for row in rows]
+        ln.worldcoordinate = [0., 1., -1., 1.]
+
+        class Context(object):
+            contextView = vtk.vtkContextView()
+            renWin = contextView.GetRenderWindow()
+        vcs.vcs2vtk.prepLine(Context, ln)
+        # all the curves are in one polydata item
+        scene = Context.contextView.GetScene()
+        self.assertEqual(scene.GetNumberOfItems(), 1)
+        polydata = scene.GetItem(0).GetDrawAreaItem().GetItem(0).GetPolyData()
+        self.assertEqual(polydata.GetNumberOfCells(), 100)
+        self.assertEqual(polydata.GetNumberOfPoints(), 5000)
+        cellColors = VN.vtk_to_numpy(polydata.GetCellData().GetArray("Colors"))
+        self.assertEqual(len(numpy.unique(cellColors, axis=0)), len(set(ln.color)))
+
+    def testAttribute(self):
+        gm = vcs.create1d()
+        self.assertFalse(gm.spaghetti)
+        gm.spaghetti = True
+        self.assertTrue(vcs.create1d(source=gm).spaghetti)
+
+
+class TestVCS1DSpaghettiPlot(basevcstest.VCSBaseTest):
+    def getCurves(self):
+        x = numpy.linspace(0., 2. * numpy.pi, 60)
+        data = MV2.array(numpy.sin(numpy.arange(12)[:, numpy.newaxis] * .5 + x))
+        data.id = "curves"
+        return data
+
+    def testPlot(self):
+        data = self.getCurves()
+        # a fully masked curve and a gap in another one
+        data[3] = MV2.masked
+        data[5, 20:30] = MV2.masked
+        gm = self.x.create1d()
+        gm.spaghetti = True
+        gm.marker = "dot"
+        gm.markersize = 2
+        self.x.plot(data, gm, bg=self.bg)
+        # the values axis spans all the curves, not only the first one
+        self.assertLessEqual(min(gm.datawc_y1, gm.datawc_y2), data.min())
+        self.assertGreaterEqual(max(gm.datawc_y1, gm.datawc_y2), data.max())
+        self.checkImage("test_vcs_1D_spaghetti.png")
+
+    def testAllMasked(self):
+        data = self.getCurves()
+        data[:] = MV2.masked
+        gm = self.x.create1d()
+        gm.spaghetti = True
+        gm.marker = "dot"
+        self.x.plot(data, gm, bg=self.bg)
+        self.assertEqual([gm.datawc_y1, gm.datawc_y2], [0., 1.])
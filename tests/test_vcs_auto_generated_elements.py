@@ -0,0 +1,87 @@
+import collections
+import unittest
+import numpy
+import vcs
+import vcs.registry
+import basevcstest
+
+
+class Display(object):
+    def __init__(self, name, template, newelements):
+        self.name = name
+        self.template = template
+        self._template_origin = "default"
+        self.g_type = "boxfill"
+        self.g_name = "default"
+        self.newelements = newelements
+
+
+class TestVCSAutoGeneratedElements(unittest.TestCase):
+    def setUp(self):
+        self.limit = vcs.registry.autoGeneratedLimit
+        self.elements = collections.OrderedDict()
+        for typ in ["line", "template", "boxfill"]:
+            self.elements[typ] = vcs.registry.ElementsRegistry(default=None)
+        self.elements["display"] = vcs.registry.DisplaysRegistry(self.elements)
+
+    def tearDown(self):
+        vcs.registry.autoGeneratedLimit = self.limit
+
+    def plot(self, i):
+        generations = dict((typ, self.elements[typ].generation()) for typ in self.elements)
+        self.elements["line"]["__line_%i" % i] = None
+        self.elements["template"]["__template_%i" % i] = None
+        newelements = dict((typ, self.elements[typ].createdSince(generations[typ])) for typ in self.elements)
+        dn = Display("__display_%i" % i, "__template_%i" % i, newelements)
+        self.elements["display"][dn.name] = dn
+        vcs.registry.trackAutoGenerated(self.elements, generations, dn)
+        return dn
+
+    def testEviction(self):
+        vcs.registry.autoGeneratedLimit = 2
+        for i in range(10):
+            dn = self.plot(i)
+            if i % 2 == 0:
+                del self.elements["display"][dn.name]
+        # referenced elements are kept even above the limit
+        self.assertEqual(self.elements["line"].tracked(), ["__line_%i" % i for i in range(1, 10, 2)])
+        self.assertIn("default", self.elements["template"])
+        self.elements["display"].clear()
+        vcs.registry.trackAutoGenerated(self.elements, {})
+        self.assertEqual(sorted(self.elements["line"].keys()), ["__line_7", "__line_9", "default"])
+        self.assertEqual(sorted(self.elements["template"].keys()), ["__template_7", "__template_9", "default"])
+
+    def testNoLimit(self):
+        vcs.registry.autoGeneratedLimit = None
+        for i in range(5):
+            del self.elements["display"][self.plot(i).name]
+        self.assertEqual(len(self.elements["line"]), 6)
+
+
+class TestVCSAutoGeneratedCanvas(basevcstest.VCSBaseTest):
+    def setUp(self):
+        super(TestVCSAutoGeneratedCanvas, self).setUp()
+        self.limit = vcs.registry.autoGeneratedLimit
+
+    def tearDown(self):
+        vcs.registry.autoGeneratedLimit = self.limit
+        super(TestVCSAutoGeneratedCanvas, self).tearDown()
+
+    def testPlotAndEvict(self):
+        vcs.registry.autoGeneratedLimit = 0
+        # 1D plots and templates plot primitives without storing displays
+        gm = self.x.create1d()
+        data = numpy.sin(numpy.arange(100) / 10.)
+        self.x.plot(data, gm, bg=self.bg)
+        self.x.clear()
+        self.x.plot(data, gm, bg=self.bg)
+        for typ, registry in vcs.elements.items():
+            if typ == "display":
+                continue
+            # only the elements of the current display are left
+            for name in registry.tracked():
+                self.assertGreater(registry._references[name], 0, (typ, name))
+        # the texts are removed with their texttables and textorientations
+        for name, text in vcs.elements["textcombined"].items():
+            self.assertIn(text.Tt_name, vcs.elements["texttable"])
+            self.assertIn(text.To_name, vcs.elements["textorientation"])
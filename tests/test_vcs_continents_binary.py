@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy
+import vcs
+import vcs.vcs2vtk
+
+
+class TestVCSContinentsBinary(unittest.TestCase):
+    def testSidecarMatchesText(self):
+        fnm = os.path.join(vcs.vcs_egg_path, "data_continent_coarse")
+        points, offsets = vcs.vcs2vtk.readContinentsText(fnm)
+        binaryPoints, binaryOffsets = vcs.vcs2vtk.readContinentsBinary(fnm + ".npz")
+        self.assertTrue(numpy.array_equal(points, binaryPoints))
+        self.assertTrue(numpy.array_equal(offsets, binaryOffsets))
+
+    def testWriteSidecar(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fnm = os.path.join(tmpdir, "data_continent_user")
+            shutil.copy(os.path.join(vcs.vcs_egg_path, "data_continent_other7"), fnm)
+            text = vcs.vcs2vtk.readContinents(fnm)
+            sidecar = vcs.vcs2vtk.writeContinentsBinary(fnm)
+            self.assertEqual(sidecar, fnm + ".npz")
+            self.assertIsNotNone(vcs.vcs2vtk.readContinentsBinary(
+                sidecar, vcs.vcs2vtk.getContinentsFingerprint(fnm)))
+            binary = vcs.vcs2vtk.readContinents(fnm)
+            self.assertEqual(text.GetNumberOfPoints(), binary.GetNumberOfPoints())
+            self.assertEqual(text.GetNumberOfCells(), binary.GetNumberOfCells())
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def testStaleSidecar(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            fnm = os.path.join(tmpdir, "data_continent_user")
+            shutil.copy(os.path.join(vcs.vcs_egg_path, "data_continent_other7"), fnm)
+            sidecar = vcs.vcs2vtk.writeContinentsBinary(fnm)
+            # the text file is replaced, the sidecar still looks newer
+            shutil.copy(os.path.join(vcs.vcs_egg_path, "data_continent_coarse"), fnm)
+            mtime = os.path.getmtime(fnm)
+            os.utime(sidecar, (mtime + 10, mtime + 10))
+            self.assertIsNone(vcs.vcs2vtk.readContinentsBinary(
+                sidecar, vcs.vcs2vtk.getContinentsFingerprint(fnm)))
+            expected = vcs.vcs2vtk.readContinents(os.path.join(vcs.vcs_egg_path, "data_continent_coarse"))
+            poly = vcs.vcs2vtk.readContinents(fnm)
+            self.assertEqual(poly.GetNumberOfPoints(), expected.GetNumberOfPoints())
+            self.assertEqual(poly.GetNumberOfCells(), expected.GetNumberOfCells())
+        finally:
+            shutil.rmtree(tmpdir)
@@ -0,0 +1,26 @@
+import os
+import unittest
+import vtk
+import vcs
+import vcs.vcs2vtk
+
+
+class TestVCSContinentsCache(unittest.TestCase):
+    def testProjectedContinentsAreMemorized(self):
+        fnm = os.path.join(vcs.vcs_egg_path, "data_continent_coarse")
+        projection = vcs.getprojection("default")
+        wc = [-180., 180., -90., 90.]
+        cache = vcs.vcs2vtk.continentsCache
+        cache.clear()
+        first = vcs.vcs2vtk.prepProjectedContinents(fnm, projection, wc)
+        colors = vtk.vtkUnsignedCharArray()
+        colors.SetName("Colors")
+        first.GetCellData().AddArray(colors)
+        second = vcs.vcs2vtk.prepProjectedContinents(fnm, projection, wc)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(first.GetNumberOfPoints(), second.GetNumberOfPoints())
+        # arrays added by a plot do not end up in the cache
+        self.assertIsNone(second.GetCellData().GetArray("Colors"))
+        vcs.vcs2vtk.prepProjectedContinents(fnm, projection, [0., 360., -90., 90.])
+        self.assertEqual(cache.misses, 2)
@@ -0,0 +1,96 @@
+import copy
+import unittest
+import numpy
+import vcs
+from vcs.coordinates import Coordinates
+
+
+class TestVCSCoordinates(unittest.TestCase):
+    def testListView(self):
+        c = Coordinates.fromArray(numpy.array([[0, 1, 2], [3, 4, 5]]))
+        self.assertEqual(len(c), 2)
+        self.assertEqual(c[1], [3., 4., 5.])
+        self.assertEqual(c[-1], [3., 4., 5.])
+        self.assertEqual(c[:1], [[0., 1., 2.]])
+        self.assertEqual(list(c), [[0., 1., 2.], [3., 4., 5.]])
+        self.assertEqual(c, [[0, 1, 2], [3, 4, 5]])
+        self.assertEqual(c, Coordinates.fromGroups([[0, 1, 2], [3, 4, 5]]))
+        self.assertNotEqual(c, Coordinates.fromArray([0, 1, 2, 3, 4, 5]))
+        # groups are views of the values
+        self.assertTrue(numpy.shares_memory(c.group(1), c.values))
+        with self.assertRaises(IndexError):
+            c[2]
+        # the lists write their changes back to the groups
+        c[0].append(6.)
+        self.assertEqual(c, [[0., 1., 2., 6.], [3., 4., 5.]])
+        c[1][0] += 1.
+        self.assertEqual(c.values.tolist(), [0., 1., 2., 6., 4., 4., 5.])
+        # copies are plain lists
+        group = copy.copy(c[0])
+        group.append(7.)
+        self.assertEqual(c[0], [0., 1., 2., 6.])
+
+    def testEdit(self):
+        c = Coordinates.fromGroups([[0, 1], [2]])
+        c[0] = [5, 6, 7]
+        c.append([8])
+        del c[1]
+        self.assertEqual(c, [[5, 6, 7], [8]])
+        self.assertEqual(c.offsets.tolist(), [0, 3, 4])
+        self.assertEqual(Coordinates.fromGroups([]).tolist(), [])
+
+    def testPrimitives(self):
+        ln = vcs.createline()
+        ln.x = numpy.array([[0., .5], [.5, 1.]])
+        self.assertIsInstance(ln.x, Coordinates)
+        self.assertEqual(ln.x, [[0., .5], [.5, 1.]])
+        # a copy, not the arrays of the other line
+        ln2 = vcs.createline()
+        ln2.x = ln.x
+        self.assertIsNot(ln2.x, ln.x)
+        with self.assertRaises(ValueError):
+            ln.y = numpy.array(["a", "b"])
+        m = vcs.createmarker()
+        m.x = numpy.arange(4)
+        self.assertEqual(m.x.values.dtype, numpy.float64)
+        self.assertEqual(m.x, [[0., 1., 2., 3.]])
+
+    # the edits made by vcs.editors on array backed primitives
+    def testLineEditor(self):
+        ln = vcs.createline()
+        ln.x = numpy.array([[0., .5, 1.], [0., .5, 1.]])
+        ln.y = numpy.array([[0., .5, 1.], [1., .5, 0.]])
+        # drag_stop
+        ln.x[1][2] = .9
+        ln.y[1][2] = .1
+        # double_release
+        ln.x[1].insert(1, .2)
+        ln.y[1].insert(1, .8)
+        self.assertEqual(ln.x, [[0., .5, 1.], [0., .2, .5, .9]])
+        self.assertEqual(ln.y, [[0., .5, 1.], [1., .8, .5, .1]])
+        self.assertEqual(ln.x.offsets.tolist(), [0, 3, 7])
+
+    def testMarkerEditor(self):
+        m = vcs.createmarker()
+        m.x = numpy.array([.1, .2])
+        m.y = numpy.array([.1, .2])
+        # click_release
+        m.x[0].append(.3)
+        m.y[0].append(.4)
+        # adjust
+        m.x[0][1] += .05
+        m.y[0][1] -= .05
+        self.assertTrue(numpy.allclose(m.x.values, [.1, .25, .3]))
+        self.assertTrue(numpy.allclose(m.y.values, [.1, .15, .4]))
+
+    def testFillareaEditor(self):
+        fa = vcs.createfillarea()
+        fa.x = numpy.array([[.1, .5, .9]])
+        fa.y = numpy.array([[.1, .9, .1]])
+        # drag_stop and click_release
+        fa.x[0][0], fa.y[0][0] = .2, .2
+        # double_release
+        fa.x[0].insert(2, .7)
+        fa.y[0].insert(2, .5)
+        self.assertEqual(fa.x, [[.2, .5, .7, .9]])
+        self.assertEqual(fa.y, [[.2, .9, .5, .1]])
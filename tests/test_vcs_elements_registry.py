@@ -0,0 +1,29 @@
+import unittest
+import vcs
+from vcs.registry import ElementsRegistry
+
+
+class TestVCSElementsRegistry(unittest.TestCase):
+    def testCreatedSince(self):
+        registry = ElementsRegistry(default=0)
+        generation = registry.generation()
+        registry["a"] = 1
+        registry["b"] = 2
+        # replacing an element does not make it new
+        registry["default"] = 3
+        self.assertEqual(registry.createdSince(generation), ["a", "b"])
+        del registry["a"]
+        registry.pop("missing", None)
+        registry.setdefault("c", 4)
+        self.assertEqual(registry.createdSince(generation), ["b", "c"])
+        self.assertEqual(registry.createdSince(registry.generation()), [])
+
+    def testPlotRecordsNewElements(self):
+        x = vcs.init(bg=True)
+        generation = vcs.elements["template"].generation()
+        dn = x.plot([1, 2, 3, 4, 5])
+        self.assertEqual(set(dn.newelements["template"]),
+                         set(vcs.elements["template"].createdSince(generation)))
+        x.clear()
+        for name in dn.newelements["template"]:
+            self.assertNotIn(name, vcs.elements["template"])
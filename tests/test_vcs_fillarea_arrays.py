@@ -0,0 +1,69 @@
+import unittest
+import numpy
+import vcs
+import vcs.vcs2vtk
+from vcs.coordinates import Coordinates
+
+
+class TestVCSFillareaArrays(unittest.TestCase):
+    def testFlatCoordinates(self):
+        fa = vcs.createfillarea()
+        fa.x = Coordinates(numpy.array([0., .1, .2, .3, .4, .5, .6]), [0, 3, 7])
+        fa.y = Coordinates(numpy.array([.5, .4, .3, .2, .1, 0., .1]), [0, 3, 7])
+        fa.color = numpy.array([16, 200])
+        fa.style = ["solid", "hatch"]
+        n = vcs.vcs2vtk.prepPrimitive(fa)
+        self.assertEqual(n, 2)
+        x, y, offsets = vcs.vcs2vtk.getPolygonArrays(fa, n)
+        self.assertEqual(offsets.tolist(), [0, 3, 7])
+        self.assertEqual(x.tolist(), fa.x.values.tolist())
+
+        # same colors as the lists of polygons
+        lists = vcs.createfillarea()
+        lists.x = [[0., .1, .2], [.3, .4, .5, .6]]
+        lists.y = [[.5, .4, .3], [.2, .1, 0., .1]]
+        lists.color = [16, 200]
+        lists.style = ["solid", "hatch"]
+        self.assertEqual(vcs.vcs2vtk.prepPrimitive(lists), 2)
+        cmap = vcs.elements["colormap"]["default"]
+        colors = vcs.vcs2vtk.getFillareaColors(fa, cmap, n)
+        self.assertEqual(colors.tolist(), vcs.vcs2vtk.getFillareaColors(lists, cmap, n).tolist())
+        self.assertEqual(colors[0].tolist(), [int(c / 100. * 255) for c in cmap.index[16]])
+        x, y, offsets = vcs.vcs2vtk.getPolygonArrays(lists, n)
+        self.assertEqual(offsets.tolist(), [0, 3, 7])
+
+        # one polygon per row of 2D arrays
+        rows = vcs.createfillarea()
+        rows.x = numpy.array([[0., .1, .2], [.3, .4, .5]])
+        rows.y = numpy.array([[.5, .4, .3], [.2, .1, 0.]])
+        self.assertEqual(vcs.vcs2vtk.prepPrimitive(rows), 2)
+        self.assertEqual(vcs.vcs2vtk.getPolygonArrays(rows, 2)[2].tolist(), [0, 3, 6])
+
+        polygons = vcs.vcs2vtk.genPolygons(x, y, offsets, numpy.array([False, True]))
+        self.assertEqual(polygons.GetNumberOfCells(), 1)
+        self.assertEqual(polygons.GetNumberOfPoints(), 4)
+
+    def testValidation(self):
+        fa = vcs.createfillarea()
+        with self.assertRaises(ValueError):
+            fa.x = Coordinates(numpy.zeros(3), [0, 2, 1, 3])
+        with self.assertRaises(ValueError):
+            fa.y = Coordinates(numpy.zeros(3), [0, 2])
+        with self.assertRaises(ValueError):
+            fa.color = numpy.array([16, 300])
+        with self.assertRaises(ValueError):
+            fa.x = numpy.zeros((2, 3, 4))
+        # x and y with different polygons
+        fa.x = Coordinates(numpy.zeros(4), [0, 2, 4])
+        fa.y = Coordinates(numpy.zeros(4), [0, 1, 4])
+        with self.assertRaises(ValueError):
+            vcs.vcs2vtk.getPolygonArrays(fa, 2)
+
+    def testDump(self):
+        fa = vcs.createfillarea()
+        fa.x = Coordinates(numpy.array([0., .1, .2, .3]), [0, 1, 4])
+        fa.y = Coordinates(numpy.array([0., .1, 0., .1]), [0, 1, 4])
+        d, _ = vcs.utils.dumpToDict(fa)
+        # the polygons are the groups of the lists
+        self.assertEqual(d["x"], [[0.], [.1, .2, .3]])
+        self.assertNotIn("offsets", d)
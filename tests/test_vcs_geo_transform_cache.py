@@ -0,0 +1,23 @@
+import unittest
+import vcs
+import vcs.vcs2vtk
+
+
+class TestVCSGeoTransformCache(unittest.TestCase):
+    def testTransformIsShared(self):
+        p = vcs.createprojection()
+        p.type = "robinson"
+        wc = [-180., 180., -90., 90.]
+        geo = vcs.vcs2vtk.getGeoTransform(p, wc)
+        self.assertIs(vcs.vcs2vtk.getGeoTransform(p, wc), geo)
+        self.assertIsNot(vcs.vcs2vtk.getGeoTransform(p, [0., 360., -90., 90.]), geo)
+
+    def testModifiedProjection(self):
+        p = vcs.createprojection()
+        p.type = "robinson"
+        wc = [-180., 180., -90., 90.]
+        geo = vcs.vcs2vtk.getGeoTransform(p, wc)
+        p.centralmeridian = 20.
+        modified = vcs.vcs2vtk.getGeoTransform(p, wc)
+        self.assertIsNot(modified, geo)
+        self.assertEqual(modified.GetDestinationProjection().GetCentralMeridian(), 20.)
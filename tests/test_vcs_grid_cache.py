@@ -0,0 +1,134 @@
+import unittest
+import cdms2
+import MV2
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import vcs
+import vcs.vcs2vtk
+
+
+class TestVCSGridCache(unittest.TestCase):
+    def testHitsAndMisses(self):
+        cache = vcs.vcs2vtk.LRUCache(10)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def testEviction(self):
+        cache = vcs.vcs2vtk.LRUCache(5, sizeFunction=lambda value: value)
+        cache.put("a", 2)
+        cache.put("b", 2)
+        cache.get("a")
+        # "b" is the least recently used entry
+        cache.put("c", 2)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        # too large to be cached
+        cache.put("d", 6)
+        self.assertNotIn("d", cache)
+        self.assertEqual(len(cache), 2)
+
+    def testDisabled(self):
+        cache = vcs.vcs2vtk.LRUCache(10)
+        cache.enabled = False
+        cache.put("a", 1)
+        self.assertEqual(len(cache), 0)
+        cache.enabled = True
+        cache.maxSize = 0
+        cache.put("a", 1)
+        self.assertEqual(len(cache), 0)
+
+    def testCopyGridGeometry(self):
+        grid = vtk.vtkPolyData()
+        pts = vtk.vtkPoints()
+        pts.InsertNextPoint(0., 0., 0.)
+        grid.SetPoints(pts)
+        scalars = VN.numpy_to_vtk(numpy.array([1.]), deep=True)
+        scalars.SetName("scalar")
+        grid.GetPointData().SetScalars(scalars)
+        ids = VN.numpy_to_vtk(numpy.array([0]), deep=True, array_type=vtk.VTK_ID_TYPE)
+        ids.SetName("PedigreeIds")
+        grid.GetPointData().SetPedigreeIds(ids)
+        copy = vcs.vcs2vtk.copyGridGeometry(grid)
+        self.assertIsNone(copy.GetPointData().GetScalars())
+        self.assertIsNotNone(copy.GetPointData().GetPedigreeIds())
+        self.assertIsNotNone(grid.GetPointData().GetScalars())
+        self.assertEqual(copy.GetNumberOfPoints(), 1)
+
+    def getLatLonData(self, offset=0.):
+        lat = cdms2.createUniformLatitudeAxis(-88.75, 72, 2.5)
+        lon = cdms2.createUniformLongitudeAxis(0., 144, 2.5)
+        values = numpy.arange(72 * 144, dtype=numpy.float64).reshape((72, 144)) + offset
+        data = MV2.masked_greater(MV2.array(values), 5000. + offset)
+        data.setAxis(0, lat)
+        data.setAxis(1, lon)
+        return data
+
+    def assertArraysEqual(self, first, second):
+        if first is None or second is None:
+            self.assertIs(first, second)
+        else:
+            self.assertTrue(numpy.array_equal(VN.vtk_to_numpy(first), VN.vtk_to_numpy(second)))
+
+    def assertGridsEqual(self, hit, miss):
+        for key in ["xm", "xM", "ym", "yM", "cellData", "wrap"]:
+            self.assertEqual(hit[key], miss[key])
+        hitGrid = hit["vtk_backend_grid"]
+        missGrid = miss["vtk_backend_grid"]
+        self.assertEqual(hitGrid.GetClassName(), missGrid.GetClassName())
+        self.assertEqual(hitGrid.GetNumberOfCells(), missGrid.GetNumberOfCells())
+        self.assertArraysEqual(hitGrid.GetPoints().GetData(), missGrid.GetPoints().GetData())
+        if missGrid.IsA("vtkPolyData"):
+            self.assertArraysEqual(hitGrid.GetPolys().GetConnectivityArray(),
+                                   missGrid.GetPolys().GetConnectivityArray())
+        else:
+            self.assertEqual(hitGrid.GetDimensions(), missGrid.GetDimensions())
+        self.assertArraysEqual(hitGrid.GetPointGhostArray(), missGrid.GetPointGhostArray())
+        for attributes in ["GetCellData", "GetPointData"]:
+            hitAttributes = getattr(hitGrid, attributes)()
+            missAttributes = getattr(missGrid, attributes)()
+            self.assertArraysEqual(hitAttributes.GetScalars(), missAttributes.GetScalars())
+            self.assertArraysEqual(hitAttributes.GetPedigreeIds(), missAttributes.GetPedigreeIds())
+
+    def checkHitMatchesMiss(self, data, otherData, gm, pedigreeIds=True):
+        cache = vcs.vcs2vtk.gridCache
+        cache.clear()
+        vcs.vcs2vtk.genGrid(data, None, gm, pedigreeIds=pedigreeIds)
+        # same grid with new values: the geometry comes from the cache
+        hit = vcs.vcs2vtk.genGrid(otherData, None, gm, pedigreeIds=pedigreeIds)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 1)
+        cache.enabled = False
+        try:
+            miss = vcs.vcs2vtk.genGrid(otherData, None, gm, pedigreeIds=pedigreeIds)
+        finally:
+            cache.enabled = True
+        self.assertGridsEqual(hit, miss)
+        return miss
+
+    def testGenGridWrapped(self):
+        gm = vcs.createboxfill()
+        gm.datawc_x1 = -180.
+        gm.datawc_x2 = 180.
+        miss = self.checkHitMatchesMiss(self.getLatLonData(), self.getLatLonData(1.), gm)
+        self.assertIsNotNone(miss["vtk_backend_grid"].GetCellData().GetPedigreeIds())
+
+    def testGenGridHiddenPoints(self):
+        gm = vcs.createboxfill()
+        gm.projection = "orthographic"
+        miss = self.checkHitMatchesMiss(self.getLatLonData(), self.getLatLonData(1.), gm)
+        ghost = VN.vtk_to_numpy(miss["vtk_backend_grid"].GetPointGhostArray())
+        self.assertTrue((ghost & vtk.vtkDataSetAttributes.HIDDENPOINT).any())
+
+    def testGenGridPedigreeIds(self):
+        data = MV2.array(numpy.arange(12 * 18, dtype=numpy.float64).reshape((12, 18)))
+        gm = vcs.createboxfill()
+        for pedigreeIds in [True, False]:
+            miss = self.checkHitMatchesMiss(data, data + 1., gm, pedigreeIds)
+            grid = miss["vtk_backend_grid"]
+            self.assertTrue(grid.IsA("vtkStructuredGrid"))
+            self.assertEqual(grid.GetCellData().GetPedigreeIds() is not None, pedigreeIds)
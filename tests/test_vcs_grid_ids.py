@@ -0,0 +1,22 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import vcs.vcs2vtk
+
+
+class TestVCSGridIds(unittest.TestCase):
+    def testIdArrays(self):
+        # cells of a 0.25 degree global grid
+        n = 1440 * 720
+        pedigreeId = vcs.vcs2vtk.genIdArray(n, "PedigreeIds")
+        globalIds = vcs.vcs2vtk.genIdArray(n, "GlobalIds")
+        self.assertEqual(pedigreeId.GetName(), "PedigreeIds")
+        self.assertEqual(globalIds.GetName(), "GlobalIds")
+        self.assertEqual(pedigreeId.GetDataType(), vtk.VTK_ID_TYPE)
+        self.assertEqual(pedigreeId.GetNumberOfTuples(), n)
+        self.assertTrue(numpy.array_equal(VN.vtk_to_numpy(pedigreeId), numpy.arange(n)))
+        self.assertTrue(numpy.array_equal(VN.vtk_to_numpy(globalIds), numpy.arange(n)))
+        # a smaller array reuses the start of the shared buffer
+        ids = vcs.vcs2vtk.genIdArray(10, "GlobalIds")
+        self.assertTrue(numpy.array_equal(VN.vtk_to_numpy(ids), numpy.arange(10)))
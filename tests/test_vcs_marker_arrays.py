@@ -0,0 +1,82 @@
+import unittest
+import numpy
+from vtk.util import numpy_support as VN
+import vcs
+import vcs.vcs2vtk
+from vcs.coordinates import Coordinates
+
+
+class TestVCSMarkerArrays(unittest.TestCase):
+    def testValuesAndSizes(self):
+        m = vcs.createmarker()
+        m.type = "square_fill"
+        m.x = numpy.array([.1, .5, .9])
+        m.y = numpy.array([.1, .5, .9])
+        m.value = numpy.array([0., 5., 10.])
+        m.size = numpy.array([1., 2., 4.])
+        actors = vcs.vcs2vtk.prepMarker(m, [400, 400])
+        self.assertEqual(len(actors), 1)
+        glyphs = actors[0][0]
+        self.assertEqual(glyphs.GetNumberOfCells(), 3)
+        colors = VN.vtk_to_numpy(glyphs.GetCellData().GetArray("Colors"))
+        cmap = vcs.elements["colormap"][vcs._colorMap]
+        # first and last values are at the ends of the colormap
+        # (the lookup table rounds the colors)
+        self.assertTrue(numpy.allclose(colors[0], vcs.vcs2vtk.getMarkerColor(m, 0, cmap), atol=1))
+        self.assertTrue(numpy.allclose(colors[2], vcs.vcs2vtk.getMarkerColor(m, 255, cmap), atol=1))
+        # the last glyph is 4 times bigger than the first one
+        bounds = [glyphs.GetCell(i).GetBounds() for i in range(3)]
+        self.assertAlmostEqual((bounds[2][1] - bounds[2][0]) / (bounds[0][1] - bounds[0][0]), 4., 4)
+
+        m.valuerange = [0., 20.]
+        glyphs = vcs.vcs2vtk.prepMarker(m, [400, 400])[0][0]
+        colors = VN.vtk_to_numpy(glyphs.GetCellData().GetArray("Colors"))
+        self.assertFalse(numpy.allclose(colors[2], vcs.vcs2vtk.getMarkerColor(m, 255, cmap), atol=1))
+
+    def testSingleColor(self):
+        m = vcs.createmarker()
+        m.x = numpy.linspace(0., 1., 10)
+        m.y = numpy.linspace(0., 1., 10)
+        m.color = [242]
+        glyphs = vcs.vcs2vtk.prepMarker(m, [400, 400])[0][0]
+        colors = VN.vtk_to_numpy(glyphs.GetCellData().GetArray("Colors"))
+        self.assertEqual(len(colors), glyphs.GetNumberOfCells())
+        self.assertTrue((colors == vcs.vcs2vtk.getMarkerColor(m, 242)).all())
+
+    def testValidation(self):
+        m = vcs.createmarker()
+        with self.assertRaises(ValueError):
+            m.size = numpy.array([1., 400.])
+        with self.assertRaises(ValueError):
+            m.value = numpy.zeros((2, 2))
+
+    def testGroups(self):
+        m = vcs.createmarker()
+        m.x = numpy.array([[.1, .2, .3], [.6, .7, .8]])
+        m.y = numpy.array([[.1, .2, .3], [.6, .7, .8]])
+        m.type = ["dot", "cross"]
+        m.color = [16, 200]
+        actors = vcs.vcs2vtk.prepMarker(m, [400, 400])
+        # one glyph polydata per group, with the color of the group
+        self.assertEqual(len(actors), 2)
+        for (glyphs, _, _), color in zip(actors, m.color):
+            colors = VN.vtk_to_numpy(glyphs.GetCellData().GetArray("Colors"))
+            self.assertTrue((colors == vcs.vcs2vtk.getMarkerColor(m, color)).all())
+        self.assertNotEqual(actors[0][0].GetNumberOfCells(), actors[1][0].GetNumberOfCells())
+
+    def testGroupsSharingTypeAndColor(self):
+        m = vcs.createmarker()
+        offsets = [0, 2, 3, 6, 10]
+        m.x = Coordinates(numpy.linspace(.1, .9, 10), offsets)
+        m.y = Coordinates(numpy.linspace(.1, .9, 10), offsets)
+        m.type = ["dot", "cross", "dot", "dot"]
+        m.color = [16]
+        m.size = numpy.linspace(1., 4., 10)
+        actors = vcs.vcs2vtk.prepMarker(m, [400, 400])
+        # the dots of the groups 0, 2 and 3 are glyphed at once
+        self.assertEqual(len(actors), 2)
+        dots = actors[0][0]
+        self.assertEqual(dots.GetNumberOfCells(), 9)
+        # with the sizes of their points
+        bounds = [dots.GetCell(i).GetBounds() for i in [0, 8]]
+        self.assertAlmostEqual((bounds[1][1] - bounds[1][0]) / (bounds[0][1] - bounds[0][0]), 4., 4)
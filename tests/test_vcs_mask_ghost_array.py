@@ -0,0 +1,40 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import vcs.vcs2vtk
+
+
+class TestVCSMaskGhostArray(unittest.TestCase):
+    def structuredGrid(self):
+        grid = vtk.vtkStructuredGrid()
+        grid.SetDimensions(4, 3, 1)
+        pts = vtk.vtkPoints()
+        for j in range(3):
+            for i in range(4):
+                pts.InsertNextPoint(i, j, 0.)
+        grid.SetPoints(pts)
+        return grid
+
+    def testGhostArrayFromMask(self):
+        grid = self.structuredGrid()
+        data = numpy.ma.masked_greater(numpy.arange(6.).reshape((2, 3)), 3.)
+        vcs.vcs2vtk.putMaskOnVTKGrid(data, grid, None, True, deep=False)
+        ghost = VN.vtk_to_numpy(grid.GetCellGhostArray())
+        hidden = vtk.vtkDataSetAttributes.HIDDENCELL
+        self.assertEqual(ghost.tolist(), [0, 0, 0, 0, hidden, hidden])
+
+    def testSetArrayUsesPedigreeIds(self):
+        grid = self.structuredGrid()
+        attributes = grid.GetCellData()
+        ids = numpy.array([5, 0, 4, 1, 3, 2])
+        attributes.SetPedigreeIds(VN.numpy_to_vtk(ids, deep=True))
+        scalars = vtk.vtkDoubleArray()
+        scalars.SetName("scalar")
+        scalars.SetNumberOfTuples(6)
+        attributes.AddArray(scalars)
+        values = numpy.ma.array(numpy.arange(6.).reshape((2, 3)) * 10.)
+        vcs.vcs2vtk.setArray(grid, values.filled(0).flat, "scalar",
+                             isCellData=True, isScalars=True)
+        self.assertEqual(VN.vtk_to_numpy(attributes.GetScalars()).tolist(),
+                         (ids * 10.).tolist())
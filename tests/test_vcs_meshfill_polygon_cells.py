@@ -0,0 +1,32 @@
+import unittest
+import numpy
+import vtk
+import vcs.vcs2vtk
+
+
+class TestVCSMeshfillPolygonCells(unittest.TestCase):
+    def testPolygonCellsMatchPerCellInsertion(self):
+        numberOfCells, nVertices = 200, 6
+        m3 = numpy.random.random((numberOfCells * nVertices, 3))
+        m3[numpy.random.random(numberOfCells * nVertices) < .3, 0] = numpy.nan
+        m3[:nVertices, 0] = numpy.nan  # a cell with no valid vertex
+
+        expected = vtk.vtkUnstructuredGrid()
+        for i in range(numberOfCells):
+            pt_ids = [i * nVertices + j for j in range(nVertices)
+                      if not numpy.isnan(m3[i * nVertices + j][0])]
+            expected.InsertNextCell(vtk.VTK_POLYGON, len(pt_ids), pt_ids)
+
+        vg = vtk.vtkUnstructuredGrid()
+        vg.SetCells(vtk.VTK_POLYGON,
+                    vcs.vcs2vtk.genPolygonCells(m3, numberOfCells, nVertices))
+
+        self.assertEqual(vg.GetNumberOfCells(), expected.GetNumberOfCells())
+        for i in range(numberOfCells):
+            ids = vtk.vtkIdList()
+            expectedIds = vtk.vtkIdList()
+            vg.GetCellPoints(i, ids)
+            expected.GetCellPoints(i, expectedIds)
+            self.assertEqual(vg.GetCellType(i), vtk.VTK_POLYGON)
+            self.assertEqual([ids.GetId(k) for k in range(ids.GetNumberOfIds())],
+                             [expectedIds.GetId(k) for k in range(expectedIds.GetNumberOfIds())])
@@ -0,0 +1,46 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import vcs
+import vcs.vcs2vtk
+
+
+class TestVCSPrepLine(unittest.TestCase):
+    def testDensifyLine(self):
+        x = numpy.array([0., 10., 10., 40.])
+        y = numpy.array([0., 0., 5., 5.])
+        dx, dy = vcs.vcs2vtk.densifyLine(x, y, 4)
+        self.assertEqual(len(dx), 1 + 3 * 4)
+        expected = [0.]
+        for j in range(1, len(x)):
+            expected += [x[j - 1] + float(i) / 4 * (x[j] - x[j - 1]) for i in range(1, 5)]
+        self.assertTrue(numpy.array_equal(dx, expected))
+        self.assertEqual(dy[-1], 5.)
+        # one number of subdivisions per segment
+        dx, dy = vcs.vcs2vtk.densifyLine(x, y, [1, 2, 3])
+        self.assertTrue(numpy.array_equal(dx, [0., 10., 10., 10., 20., 30., 40.]))
+
+    def testPolyLines(self):
+        parts = [(numpy.array([0., 1., 2.]), numpy.array([0., 1., 0.]), [255, 0, 0, 255]),
+                 (numpy.array([5.]), numpy.array([5.]), [0, 255, 0, 255]),
+                 (numpy.array([3., 4.]), numpy.array([3., 4.]), [0, 0, 255, 255])]
+        poly, colors = vcs.vcs2vtk.genPolyLines(parts)
+        self.assertEqual(poly.GetNumberOfPoints(), 6)
+        # the single point line has no cell
+        self.assertEqual(poly.GetNumberOfLines(), 2)
+        self.assertEqual(VN.vtk_to_numpy(colors).tolist(), [[255, 0, 0, 255], [0, 0, 255, 255]])
+        ids = vtk.vtkIdList()
+        poly.GetCellPoints(1, ids)
+        self.assertEqual([ids.GetId(i) for i in range(ids.GetNumberOfIds())], [4, 5])
+
+    def testAdaptiveSubdivisions(self):
+        p = vcs.createprojection()
+        p.type = "mercator"
+        wc = [-180., 180., -80., 80.]
+        bounds = vcs.vcs2vtk.getProjectedBoundsForWorldCoords(wc, p)
+        # parallels and meridians are straight in mercator
+        x = numpy.array([-100., 100., 100., 0.])
+        y = numpy.array([40., 40., -40., 60.])
+        subdivisions = vcs.vcs2vtk.getLineSubdivisions(x, y, p, wc, 25, bounds)
+        self.assertEqual(subdivisions.tolist(), [1, 1, 25])
@@ -0,0 +1,33 @@
+import unittest
+import numpy
+from vtk.util import numpy_support as VN
+import vcs
+import vcs.vcs2vtk
+
+
+class TestVCSProjectArray(unittest.TestCase):
+    def testProjectArray(self):
+        n = 10 ** 4
+        p = vcs.createprojection()
+        p.type = "robinson"
+        wc = [-180., 180., -90., 90.]
+        geo = vcs.vcs2vtk.getGeoTransform(p, wc)
+        lonLat = numpy.zeros((n, 3))
+        lonLat[:, 0] = numpy.random.uniform(-180., 180., n)
+        lonLat[:, 1] = numpy.random.uniform(-90., 90., n)
+
+        # one point at a time
+        expected = VN.numpy_to_vtk(lonLat, deep=True)
+        for i in range(0, expected.GetNumberOfTuples()):
+            tuple = [0, 0, 0]
+            expected.GetTypedTuple(i, tuple)
+            geo.TransformPoint(tuple, tuple)
+            expected.SetTypedTuple(i, tuple)
+        expected = VN.vtk_to_numpy(expected)
+
+        w = VN.numpy_to_vtk(lonLat, deep=True)
+        vcs.vcs2vtk.projectArray(w, p, wc)
+        self.assertTrue(numpy.allclose(VN.vtk_to_numpy(w), expected))
+        x, y = vcs.vcs2vtk.project_numpy(lonLat[:, 0], lonLat[:, 1], p, wc)
+        self.assertTrue(numpy.allclose(x, expected[:, 0]))
+        self.assertTrue(numpy.allclose(y, expected[:, 1]))
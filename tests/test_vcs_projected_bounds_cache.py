@@ -0,0 +1,43 @@
+import unittest
+import vcs
+import vcs.vcs2vtk
+
+
+class TestVCSProjectedBoundsCache(unittest.TestCase):
+    def testBoundsAreMemorized(self):
+        p = vcs.createprojection()
+        p.type = "robinson"
+        wc = [-180., 180., -90., 90.]
+        cache = vcs.vcs2vtk.projectedBoundsCache
+        cache.clear()
+        bounds = vcs.vcs2vtk.getProjectedBoundsForWorldCoords(wc, p.name)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(vcs.vcs2vtk.getProjectedBoundsForWorldCoords(wc, p.name), bounds)
+        self.assertEqual(cache.hits, 1)
+        # a different subdivision or a modified projection is a miss
+        vcs.vcs2vtk.getProjectedBoundsForWorldCoords(wc, p.name, subdiv=10)
+        p.centralmeridian = 30.
+        vcs.vcs2vtk.getProjectedBoundsForWorldCoords(wc, p.name)
+        self.assertEqual(cache.misses, 3)
+        self.assertGreater(bounds[1], bounds[0])
+
+    def testLinear(self):
+        wc = [0., 10., 0., 5.]
+        self.assertEqual(vcs.vcs2vtk.getProjectedBoundsForWorldCoords(wc, "linear"), wc)
+
+    def testWorldCoordsExtentIsMemorized(self):
+        p = vcs.createprojection()
+        p.type = "robinson"
+        wc = [-180., 180., -90., 90.]
+        cache = vcs.vcs2vtk.projectedExtentCache
+        cache.clear()
+        extent = vcs.vcs2vtk.getProjectedWorldCoordsExtent(p, wc)
+        self.assertEqual(vcs.vcs2vtk.getProjectedWorldCoordsExtent(p, wc), extent)
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+        # the scan starts at the south west corner, the equator is wider
+        x, y = vcs.vcs2vtk.project_numpy([-180.], [-90.], p, wc)
+        self.assertLess(extent[0], x[0])
+        self.assertAlmostEqual(extent[2], y[0], delta=1.)
+        p.centralmeridian = 30.
+        vcs.vcs2vtk.getProjectedWorldCoordsExtent(p, wc)
+        self.assertEqual(cache.misses, 2)
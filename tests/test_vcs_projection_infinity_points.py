@@ -0,0 +1,39 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import vcs.vcs2vtk
+
+
+class TestVCSProjectionInfinityPoints(unittest.TestCase):
+    def testInfinityPointsAreHidden(self):
+        coords = [[numpy.inf, 1., 0.],
+                  [2., 3., 0.],
+                  [4., -numpy.inf, 0.],
+                  [5., 6., 0.]]
+        geopts = vtk.vtkPoints()
+        for c in coords:
+            geopts.InsertNextPoint(*c)
+        ghost = vtk.vtkUnsignedCharArray()
+        ghost.SetNumberOfTuples(len(coords))
+        ghost.Fill(0)
+
+        self.assertTrue(vcs.vcs2vtk.setInfToValid(geopts, ghost))
+        hidden = vtk.vtkDataSetAttributes.HIDDENPOINT
+        self.assertEqual(VN.vtk_to_numpy(ghost).tolist(), [hidden, 0, hidden, 0])
+        self.assertEqual(VN.vtk_to_numpy(geopts.GetData()).tolist(),
+                         [[2., 1., 0.], [2., 3., 0.], [4., 3., 0.], [5., 6., 0.]])
+
+        pts = vtk.vtkPoints()
+        for c in [[-10., -10., 0.], [1., 2., 0.], [10., 10., 0.], [3., 4., 0.]]:
+            pts.InsertNextPoint(*c)
+        self.assertEqual(vcs.vcs2vtk.getVisibleBounds(pts, ghost), [1., 3., 2., 4.])
+
+    def testNoInfinity(self):
+        geopts = vtk.vtkPoints()
+        geopts.InsertNextPoint(1., 2., 0.)
+        ghost = vtk.vtkUnsignedCharArray()
+        ghost.SetNumberOfTuples(1)
+        ghost.Fill(0)
+        self.assertFalse(vcs.vcs2vtk.setInfToValid(geopts, ghost))
+        self.assertEqual(ghost.GetValue(0), 0)
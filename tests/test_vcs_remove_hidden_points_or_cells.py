@@ -0,0 +1,52 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import vcs.vcs2vtk
+
+
+class TestVCSRemoveHiddenPointsOrCells(unittest.TestCase):
+    def twoQuads(self):
+        # 0 - 1 - 2
+        # |   |   |
+        # 3 - 4 - 5
+        pts = vtk.vtkPoints()
+        for y in [1., 0.]:
+            for x in [0., 1., 2.]:
+                pts.InsertNextPoint(x, y, 0.)
+        polys = vtk.vtkCellArray()
+        polys.InsertNextCell(4, [0, 1, 4, 3])
+        polys.InsertNextCell(4, [1, 2, 5, 4])
+        grid = vtk.vtkPolyData()
+        grid.SetPoints(pts)
+        grid.SetPolys(polys)
+        scalars = VN.numpy_to_vtk(numpy.array([5., 1., 3., 4., 6., 2.]), deep=True)
+        scalars.SetName("scalar")
+        grid.GetPointData().SetScalars(scalars)
+        globalIds = VN.numpy_to_vtk(numpy.array([10, 11]), deep=True, array_type=vtk.VTK_ID_TYPE)
+        globalIds.SetName("GlobalIds")
+        grid.GetCellData().SetGlobalIds(globalIds)
+        return grid
+
+    def testHiddenPoint(self):
+        grid = self.twoQuads()
+        ghost = grid.AllocatePointGhostArray()
+        ghost.SetValue(2, vtk.vtkDataSetAttributes.HIDDENPOINT)
+        vcs.vcs2vtk.removeHiddenPointsOrCells(grid, celldata=False)
+        self.assertEqual(grid.GetNumberOfCells(), 1)
+        self.assertEqual(grid.GetNumberOfPoints(), 6)
+        ids = vtk.vtkIdList()
+        grid.GetCellPoints(0, ids)
+        self.assertEqual([ids.GetId(i) for i in range(ids.GetNumberOfIds())], [0, 1, 4, 3])
+        self.assertEqual(grid.GetCellData().GetGlobalIds().GetValue(0), 10)
+        # the hidden point gets the minimum of the visible points
+        self.assertEqual(grid.GetPointData().GetScalars().GetValue(2), 1.)
+
+    def testHiddenCell(self):
+        grid = self.twoQuads()
+        ghost = grid.AllocateCellGhostArray()
+        ghost.SetValue(0, vtk.vtkDataSetAttributes.HIDDENCELL)
+        vcs.vcs2vtk.removeHiddenPointsOrCells(grid, celldata=True)
+        self.assertEqual(grid.GetNumberOfCells(), 1)
+        self.assertEqual(grid.GetCellData().GetGlobalIds().GetValue(0), 11)
+        self.assertEqual(grid.GetCellGhostArray().GetValue(0), 0)
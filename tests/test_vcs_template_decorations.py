@@ -0,0 +1,49 @@
+import unittest
+import vcs
+import vcs.template
+
+
+class TestVCSTemplateDecorations(unittest.TestCase):
+    def testLinesAreMerged(self):
+        decorations = vcs.template.TemplateDecorations()
+        ngeneration = vcs.elements["line"].generation()
+        ticks = decorations.createline("default")
+        ticks.projection = "linear"
+        ticks.priority = 1
+        ticks._x = [[.1, .1], [.2, .2]]
+        ticks._y = [[.1, .12], [.1, .12]]
+        decorations.addLine(ticks)
+        box = decorations.createline("default")
+        box.projection = "linear"
+        box._priority = 1
+        box._x = [.1, .9, .9, .1, .1]
+        box._y = [.1, .1, .9, .9, .1]
+        decorations.addLine(box)
+        hidden = decorations.createline("default")
+        hidden._priority = 0
+        hidden._x = [0., 1.]
+        hidden._y = [0., 1.]
+        decorations.addLine(hidden)
+
+        lines = decorations.lines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0].x, [[.1, .1], [.2, .2], [.1, .9, .9, .1, .1]])
+        self.assertEqual(len(lines[0].color), 3)
+        self.assertEqual(len(lines[0].type), 3)
+        # nothing went through vcs.elements
+        self.assertEqual(vcs.elements["line"].generation(), ngeneration)
+        self.assertIsNone(vcs.elements["line"]["default"]._x)
+
+    def testTexts(self):
+        decorations = vcs.template.TemplateDecorations()
+        source = vcs.elements["texttable"]["default"]
+        string = source.string
+        tt = decorations.createtext("default", "default")
+        tt.string = [10, 20]
+        tt.x = [.1, .2]
+        tt.y = [.1, .1]
+        tt.priority = 1
+        decorations.addText(tt)
+        self.assertEqual(decorations.texts[0].string, ["10", "20"])
+        self.assertIs(decorations.texts[0].textorientation, vcs.elements["textorientation"]["default"])
+        self.assertEqual(source.string, string)
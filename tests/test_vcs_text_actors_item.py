@@ -0,0 +1,47 @@
+import unittest
+import vtk
+import vcs
+import vcs.vcs2vtk
+
+
+class TestVCSTextActorsItem(unittest.TestCase):
+    def testOneItemForAllStrings(self):
+        view = vtk.vtkContextView()
+        view.GetRenderWindow().SetOffScreenRendering(True)
+        view.GetRenderWindow().SetSize(400, 300)
+        area = vtk.vtkContextArea()
+        view.GetScene().AddItem(area)
+
+        text = vcs.createtext()
+        text.string = ["10", "20", "30"]
+        text.x = [.1, .5, .9]
+        text.y = [.5, .5, .5]
+        labels = vcs.vcs2vtk.genTextActor(area, to=text.To_name, tt=text.Tt_name)
+
+        self.assertEqual([label.GetInput() for label in labels], ["10", "20", "30"])
+        self.assertFalse(any(isinstance(label, vtk.vtkTextActor) for label in labels))
+        self.assertEqual(area.GetDrawAreaItem().GetNumberOfItems(), 1)
+        item = labels[0].item
+        self.assertTrue(all(label.item is item for label in labels))
+        self.assertEqual(item.strings, ["10", "20", "30"])
+        self.assertEqual(len(item.runs), 1)
+        prop = labels[0].GetTextProperty()
+        self.assertTrue(all(label.GetTextProperty() is prop for label in labels))
+        view.GetRenderWindow().Render()
+
+    def testEditLabels(self):
+        prop = vtk.vtkTextProperty()
+        other = vtk.vtkTextProperty()
+        item = vcs.vcs2vtk.TextActorsWrapperItem([[10, 20], [30, 40], [50, 60]], ["a", "b", "c"], prop)
+        labels = [vcs.vcs2vtk.TextLabel(item, i) for i in range(3)]
+        labels[1].SetTextProperty(other)
+        self.assertEqual([run[0] for run in item.runs], [0, 1, 2])
+        self.assertEqual([label.GetTextProperty() for label in labels], [prop, other, prop])
+        labels[1].SetTextProperty(prop)
+        self.assertEqual(item.runs, [[0, prop]])
+        labels[2].SetInput("d")
+        labels[2].SetPosition(5, 6)
+        labels[0].SetVisibility(0)
+        self.assertEqual(item.strings, ["a", "b", "d"])
+        self.assertEqual(labels[2].GetPosition(), (5., 6.))
+        self.assertEqual([label.GetVisibility() for label in labels], [0, 1, 1])
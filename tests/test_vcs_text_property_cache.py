@@ -0,0 +1,49 @@
+import unittest
+import vtk
+import vcs
+import vcs.vcs2vtk
+
+
+class TestVCSTextPropertyCache(unittest.TestCase):
+    def testPropertyIsMemorized(self):
+        cache = vcs.vcs2vtk.textPropertyCache
+        cache.clear()
+        text = vcs.createtext()
+        first = vtk.vtkTextProperty()
+        vcs.vcs2vtk.prepTextProperty(first, (800, 600), to=text.To_name, tt=text.Tt_name)
+        second = vtk.vtkTextProperty()
+        vcs.vcs2vtk.prepTextProperty(second, (800, 600), to=text.To_name, tt=text.Tt_name)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(second.GetColor(), first.GetColor())
+        self.assertEqual(second.GetFontSize(), first.GetFontSize())
+        # the caller's property is a copy
+        second.SetFontSize(3)
+        vcs.vcs2vtk.prepTextProperty(second, (800, 600), to=text.To_name, tt=text.Tt_name)
+        self.assertEqual(second.GetFontSize(), first.GetFontSize())
+
+        # modified elements are not found in the cache
+        text.color = [0., 100., 0., 100.]
+        vcs.vcs2vtk.prepTextProperty(second, (800, 600), to=text.To_name, tt=text.Tt_name)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(second.GetColor(), (0., 1., 0.))
+        text.height = 2 * text.height
+        vcs.vcs2vtk.prepTextProperty(second, (800, 600), to=text.To_name, tt=text.Tt_name)
+        self.assertEqual(cache.misses, 3)
+        self.assertGreater(second.GetFontSize(), first.GetFontSize())
+
+    def testTextExtentIsMemorized(self):
+        cache = vcs.vcs2vtk.textExtentCache
+        cache.clear()
+        x = vcs.init(bg=True)
+        text = x.createtext()
+        text.string = ["vcs", "vcs"]
+        text.x = [.1, .5]
+        text.y = [.5, .5]
+        extents = x.gettextextent(text)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertAlmostEqual(extents[1][0] - extents[0][0], .4)
+        self.assertEqual(x.gettextextent(text), extents)
+        text.angle = 45
+        x.gettextextent(text)
+        self.assertEqual(cache.misses, 2)
@@ -0,0 +1,69 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import vcs.vcs2vtk
+
+
+class TestVCSThresholdPolyData(unittest.TestCase):
+    def quads(self, nx, ny):
+        grid = vtk.vtkPolyData()
+        x, y = numpy.meshgrid(numpy.arange(nx, dtype=numpy.float64),
+                              numpy.arange(ny, dtype=numpy.float64))
+        m3 = numpy.stack([x.ravel(), y.ravel(), numpy.zeros(x.size)], axis=1)
+        pts = vtk.vtkPoints()
+        pts.SetData(VN.numpy_to_vtk(m3, deep=True))
+        grid.SetPoints(pts)
+        grid.SetPolys(vcs.vcs2vtk.genQuadCells(nx, ny))
+        scalars = VN.numpy_to_vtk(numpy.linspace(0., 1., grid.GetNumberOfCells()), deep=True)
+        scalars.SetName("scalar")
+        grid.GetCellData().SetScalars(scalars)
+        return grid
+
+    def testQuadCells(self):
+        structured = vtk.vtkStructuredGrid()
+        structured.SetDimensions(4, 3, 1)
+        cells = vcs.vcs2vtk.genQuadCells(4, 3)
+        self.assertEqual(cells.GetNumberOfCells(), structured.GetNumberOfCells())
+        ids = vtk.vtkIdList()
+        structuredIds = vtk.vtkIdList()
+        cells.InitTraversal()
+        for cellId in range(cells.GetNumberOfCells()):
+            cells.GetNextCell(ids)
+            structured.GetCellPoints(cellId, structuredIds)
+            self.assertEqual([ids.GetId(i) for i in range(4)],
+                             [structuredIds.GetId(i) for i in range(4)])
+
+    def testThresholdBetween(self):
+        grid = self.quads(11, 6)
+        threshold = vcs.vcs2vtk.ThresholdPolyData()
+        threshold.ThresholdBetween(0.25, 0.5)
+        threshold.SetInputData(grid)
+        threshold.Update()
+        output = threshold.GetOutput()
+        values = VN.vtk_to_numpy(output.GetCellData().GetScalars())
+        allValues = VN.vtk_to_numpy(grid.GetCellData().GetScalars())
+        self.assertEqual(len(values), ((allValues >= 0.25) & (allValues <= 0.5)).sum())
+        self.assertTrue(((values >= 0.25) & (values <= 0.5)).all())
+        self.assertEqual(output.GetNumberOfPolys(), len(values))
+        # the output is updated when the input scalars change
+        VN.vtk_to_numpy(grid.GetCellData().GetScalars())[:] = 0.3
+        grid.GetCellData().GetScalars().Modified()
+        threshold.Update()
+        self.assertEqual(threshold.GetOutput().GetNumberOfCells(), grid.GetNumberOfCells())
+
+    def testHiddenCells(self):
+        grid = self.quads(4, 2)
+        grid.AllocateCellGhostArray()
+        ghosts = grid.GetCellData().GetArray(vtk.vtkDataSetAttributes.GhostArrayName())
+        ghosts.SetValue(1, vtk.vtkDataSetAttributes.HIDDENCELL)
+        threshold = vcs.vcs2vtk.ThresholdPolyData()
+        threshold.ThresholdBetween(0., 1.)
+        threshold.SetInputData(grid)
+        threshold.Update()
+        # the masked cell is dropped, like vtkThreshold does
+        reference = vtk.vtkThreshold()
+        reference.SetInputData(grid)
+        reference.Update()
+        self.assertEqual(threshold.GetOutput().GetNumberOfCells(), 2)
+        self.assertEqual(threshold.GetOutput().GetNumberOfCells(), reference.GetOutput().GetNumberOfCells())
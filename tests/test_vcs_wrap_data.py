@@ -0,0 +1,37 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import vcs.vcs2vtk
+
+
+class TestVCSWrapData(unittest.TestCase):
+    def lonLatGrid(self, nx, ny):
+        grid = vtk.vtkStructuredGrid()
+        grid.SetDimensions(nx + 1, ny + 1, 1)
+        x, y = numpy.meshgrid(numpy.linspace(0., 360., nx + 1),
+                              numpy.linspace(-90., 90., ny + 1))
+        m3 = numpy.stack([x.ravel(), y.ravel(), numpy.zeros(x.size)], axis=1)
+        pts = vtk.vtkPoints()
+        pts.SetData(VN.numpy_to_vtk(m3, deep=True))
+        grid.SetPoints(pts)
+        grid.GetCellData().SetPedigreeIds(vcs.vcs2vtk.genIdArray(nx * ny, "PedigreeIds"))
+        grid.GetCellData().SetGlobalIds(vcs.vcs2vtk.genIdArray(nx * ny, "GlobalIds"))
+        return grid
+
+    def testWrapKeepsIds(self):
+        nx, ny = 36, 18
+        wrapped = vcs.vcs2vtk.doWrapData(self.lonLatGrid(nx, ny), [-180., 540., -90., 90.])
+        cellData = wrapped.GetCellData()
+        pedigreeIds = VN.vtk_to_numpy(cellData.GetPedigreeIds())
+        self.assertIsNotNone(cellData.GetGlobalIds())
+        # the cells are copied twice, plus the boundary cells of the third copy
+        self.assertEqual(len(pedigreeIds), 2 * nx * ny + 2 * ny)
+        self.assertEqual(wrapped.GetNumberOfCells(), len(pedigreeIds))
+        # each cell is where its original cell is, modulo 360
+        pts = VN.vtk_to_numpy(wrapped.GetPoints().GetData())
+        ids = vtk.vtkIdList()
+        for cellId in range(0, wrapped.GetNumberOfCells(), 7):
+            wrapped.GetCellPoints(cellId, ids)
+            xmin = pts[[ids.GetId(i) for i in range(ids.GetNumberOfIds())], 0].min()
+            self.assertAlmostEqual(xmin % 360., (pedigreeIds[cellId] % nx) * 10.)
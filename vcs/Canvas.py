@@ -1179,7 +1179,9 @@ class Canvas(vcs.bestMatch):
         VCS created automatically in response to user actions but are
         no longer in use. This shouldn't be necessary most of the time,
         but if you're running into performance/memory issues, calling it
-        periodically may help.
+        periodically may help. Setting vcs.registry.autoGeneratedLimit
+        also removes the oldest objects generated while plotting once the
+        displays using them are gone.
 
         :Example:
 
@@ -1217,9 +1219,7 @@ class Canvas(vcs.bestMatch):
             for obj in self.listelements(objtype):
                 if obj[:2] == "__":
                     try:
-                        loc = locals()
-                        exec("o = self.get%s(obj)" % objtype)
-                        o = loc["o"]
+                        o = getattr(self, "get%s" % objtype)(obj)
                         destroy = True
                         if objtype == 'template':
                             # print o.name
@@ -2819,10 +2819,10 @@ class Canvas(vcs.bestMatch):
                                    plot_output)
 
     def __new_elts(self, original, new):
+        # original holds the generation of each element registry before
+        # plotting, the registries know which elements came after it
         for e in list(vcs.elements.keys()):
-            for k in list(vcs.elements[e].keys()):
-                if k not in original[e]:
-                    new[e].append(k)
+            new[e] += vcs.elements[e].createdSince(original[e])
         return new
 
     def __plot(self, arglist, keyargs):
@@ -2837,7 +2837,7 @@ class Canvas(vcs.bestMatch):
         original_elts = {}
         new_elts = {}
         for k in list(vcs.elements.keys()):
-            original_elts[k] = list(vcs.elements[k].keys())
+            original_elts[k] = vcs.elements[k].generation()
             new_elts[k] = []
         # First of all try some cleanup
         assert len(arglist) == 6
@@ -3783,6 +3783,8 @@ class Canvas(vcs.bestMatch):
                     setattr(arglist[0], p, tmp)
             dn.newelements = self.__new_elts(original_elts, new_elts)
             dn._parent = self
+            vcs.registry.trackAutoGenerated(vcs.elements, original_elts, dn,
+                                            remove=vcs.registry.removeElement)
 
             """
             try:
@@ -4110,11 +4112,16 @@ class Canvas(vcs.bestMatch):
                 setattr(arglist[0], p, tmp)
         if dn is not None and not isinstance(dn, (list, tuple)):
             self.display_names.append(result.name)
+            vcs.registry.trackAutoGenerated(vcs.elements, original_elts, dn,
+                                            remove=vcs.registry.removeElement)
             if result.g_type in (
                     "3d_scalar", "3d_vector") and self.configurator is not None:
                 self.endconfigure()
             if self.backend.bg is False and self.configurator is not None:
                 self.configurator.update()
+        else:
+            vcs.registry.trackAutoGenerated(vcs.elements, original_elts,
+                                            remove=vcs.registry.removeElement)
 
         return result
 
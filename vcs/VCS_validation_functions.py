@@ -3,6 +3,7 @@ import vcs
 import cdtime
 import numpy
 import genutil
+from .coordinates import Coordinates
 
 try:
     basestring
@@ -257,6 +258,67 @@ def checkListOfNumbers(self, name, value, minvalue=None,
     return list(value)
 
 
+def checkArrayOfNumbers(self, name, value, minvalue=None, maxvalue=None, ints=False):
+    """Returns value as a 1D numpy array of floats (of ints if ints is True).
+    The type, shape and range are checked once for the whole array."""
+    checkName(self, name, value)
+    value = numpy.asarray(value)
+    kinds = "iu" if ints else "iuf"
+    if value.ndim != 1 or value.dtype.kind not in kinds:
+        checkedRaise(
+            self,
+            value,
+            ValueError,
+            name +
+            ' must be a 1D array of ' +
+            ('integers' if ints else 'numbers'))
+    value = value.astype(numpy.int64 if ints else numpy.float64)
+    if minvalue is not None and (value < minvalue).any():
+        checkedRaise(
+            self,
+            value,
+            ValueError,
+            name +
+            ' values must be at least ' +
+            str(minvalue))
+    if maxvalue is not None and (value > maxvalue).any():
+        checkedRaise(
+            self,
+            value,
+            ValueError,
+            name +
+            ' values must be at most ' +
+            str(maxvalue))
+    return value
+
+
+def checkCoordinates(self, name, value):
+    """Returns value (a numpy array or Coordinates) as Coordinates: a 1D array
+    is one group of points, a 2D array has one group of points per row.
+    The type and shape are checked once for the whole array."""
+    checkName(self, name, value)
+    if isinstance(value, Coordinates):
+        offsets = value.offsets
+        if offsets.ndim != 1 or len(offsets) == 0 or offsets[0] != 0 or \
+                offsets[-1] != len(value.values) or (numpy.diff(offsets) < 0).any():
+            checkedRaise(
+                self,
+                value,
+                ValueError,
+                name +
+                ' offsets must increase from 0 to the number of values')
+        return value.copy()
+    value = numpy.asarray(value)
+    if value.ndim not in (1, 2) or value.dtype.kind not in "iuf":
+        checkedRaise(
+            self,
+            value,
+            ValueError,
+            name +
+            ' must be a 1D or 2D array of numbers')
+    return Coordinates.fromArray(value)
+
+
 def checkInStringList(self, name, value, options):
     checkName(self, name, value)
     if value not in options:
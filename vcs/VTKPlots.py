@@ -1029,15 +1029,8 @@ class VTKVCSBackend(object):
             return (None, 1, 1)
         xforward = vcs.utils.axisConvertFunctions[kargs.get('xaxisconvert', 'linear')]['forward']
         yforward = vcs.utils.axisConvertFunctions[kargs.get('yaxisconvert', 'linear')]['forward']
-        contData = vcs2vtk.prepContinents(continents_path, xforward, yforward)
-        contData = vcs2vtk.doWrapData(contData, wc, fastClip=False)
-
-        if projection.type != "linear":
-            cpts = contData.GetPoints()
-            # we use plotting coordinates for doing the projection so
-            # that parameters such that central meridian are set correctly.
-            _, gcpts = vcs2vtk.project(cpts, projection, wc)
-            contData.SetPoints(gcpts)
+        contData = vcs2vtk.prepProjectedContinents(continents_path, projection, wc,
+                                                   xforward, yforward)
 
         contLine = self.canvas.getcontinentsline()
 
@@ -1070,16 +1063,11 @@ class VTKVCSBackend(object):
 
         vcs2vtk.configureContextArea(area, contBounds, geom)
 
-        color_arr = vtk.vtkUnsignedCharArray()
-        color_arr.SetNumberOfComponents(4)
+        if len(color) != 4:
+            color = [color[0], color[1], color[2], 255]
+        color_arr = vcs2vtk.generateSolidColorArray(contData.GetNumberOfCells(), color)
         color_arr.SetName("Colors")
 
-        for i in range(contData.GetNumberOfCells()):
-            if len(color) == 4:
-                color_arr.InsertNextTypedTuple(color)
-            else:
-                color_arr.InsertNextTypedTuple([color[0], color[1], color[2], 255])
-
         contData.GetCellData().AddArray(color_arr)
 
         # Handle line drawing properties (line width + stipple)
@@ -1232,6 +1220,37 @@ class VTKVCSBackend(object):
                 pass
         return returned
 
+    def renderTemplateDecorations(self, decorations, **kargs):
+        """Draws the texts and lines collected by template.plot
+        (template.TemplateDecorations). All the texts go in one context area
+        and the lines are merged per viewport and world coordinates."""
+        if len(decorations.texts) > 0:
+            area = vtk.vtkContextArea()
+            self.contextView.GetScene().AddItem(area)
+
+            vp = self.canvas._viewport
+            [renWinWidth, renWinHeight] = self.renWin.GetSize()
+            geom = vtk.vtkRecti(int(round(vp[0] * renWinWidth)),
+                                int(round(vp[2] * renWinHeight)),
+                                int(round((vp[1] - vp[0]) * renWinWidth)),
+                                int(round((vp[3] - vp[2]) * renWinHeight)))
+            rect = vtk.vtkRectd(0.0, 0.0, float(renWinWidth), float(renWinHeight))
+            vcs2vtk.configureContextArea(area, rect, geom)
+
+            plotting_bounds = kargs.get("plotting_dataset_bounds", None)
+            for tt in decorations.texts:
+                bounds = kargs.get("vtk_dataset_bounds_no_mask", None)
+                if vcs.elements["projection"][tt.projection].type != "linear" and plotting_bounds:
+                    newbounds = vcs2vtk.getProjectedBoundsForWorldCoords(
+                        plotting_bounds, tt.projection)
+                    if all([not math.isinf(b) for b in newbounds]):
+                        bounds = newbounds
+                vcs2vtk.genTextActor(area, to=tt.textorientation, tt=tt,
+                                     cmap=self.canvas.colormap, geoBounds=bounds,
+                                     geo=kargs.get("vtk_backend_geo", None))
+        for line in decorations.lines():
+            vcs2vtk.prepLine(self, line, cmap=self.canvas.colormap)
+
     def renderColorBar(self, tmpl, levels, colors, legend, cmap,
                        style=['solid'], index=[1], opacity=[],
                        pixelspacing=[15, 15], pixelscale=12):
@@ -1583,8 +1602,6 @@ x.geometry(1200,800)
         if isinstance(texttable, str):
             texttable = vcs.gettexttable(texttable)
 
-        from .vtk_ui.text import text_box
-
         text_property = vtk.vtkTextProperty()
         info = self.canvasinfo()
         win_size = info["width"], info["height"]
@@ -1609,10 +1626,10 @@ x.geometry(1200,800)
 
         for s, x, y in labels:
             if angle is None:
-                coords = text_box(
+                coords = vcs2vtk.getTextBox(
                     s, text_property, dpi, -textorientation.angle)
             else:
-                coords = text_box(s, text_property, dpi, -angle)
+                coords = vcs2vtk.getTextBox(s, text_property, dpi, -angle)
             vp = texttable.viewport
             coords[0] = x +\
                 (texttable.worldcoordinate[1] - texttable.worldcoordinate[0]) *\
@@ -112,6 +112,7 @@ from . import install_vcs  # noqa
 import os  # noqa
 from .manageElements import *  # noqa
 import collections  # noqa
+from .registry import ElementsRegistry, DisplaysRegistry  # noqa
 
 _colorMap = "viridis"
 
@@ -132,35 +133,35 @@ install_vcs._files()
 #
 
 elements = collections.OrderedDict()
-elements["list"] = {}
-elements["projection"] = {}
-elements["texttable"] = {}
-elements["textorientation"] = {}
-elements["textcombined"] = {}
-elements["line"] = {}
-elements["marker"] = {}
-elements["fillarea"] = {}
-elements["font"] = {}
-elements["fontNumber"] = {}
-elements["boxfill"] = {}
-elements["isofill"] = {}
-elements["isoline"] = {}
-elements["meshfill"] = {}
-elements["3d_scalar"] = {}
-elements["3d_dual_scalar"] = {}
-elements["3d_vector"] = {}
-elements["template"] = {}
-elements["taylordiagram"] = {}
-elements["1d"] = {}
-elements["vector"] = {}
-elements["streamline"] = {}
-elements["yxvsx"] = {}
-elements["xyvsy"] = {}
-elements["xvsy"] = {}
-elements["scatter"] = {}
-elements["colormap"] = {}
-elements["display"] = {}
-elements["format"] = {}
+elements["list"] = ElementsRegistry()
+elements["projection"] = ElementsRegistry()
+elements["texttable"] = ElementsRegistry()
+elements["textorientation"] = ElementsRegistry()
+elements["textcombined"] = ElementsRegistry()
+elements["line"] = ElementsRegistry()
+elements["marker"] = ElementsRegistry()
+elements["fillarea"] = ElementsRegistry()
+elements["font"] = ElementsRegistry()
+elements["fontNumber"] = ElementsRegistry()
+elements["boxfill"] = ElementsRegistry()
+elements["isofill"] = ElementsRegistry()
+elements["isoline"] = ElementsRegistry()
+elements["meshfill"] = ElementsRegistry()
+elements["3d_scalar"] = ElementsRegistry()
+elements["3d_dual_scalar"] = ElementsRegistry()
+elements["3d_vector"] = ElementsRegistry()
+elements["template"] = ElementsRegistry()
+elements["taylordiagram"] = ElementsRegistry()
+elements["1d"] = ElementsRegistry()
+elements["vector"] = ElementsRegistry()
+elements["streamline"] = ElementsRegistry()
+elements["yxvsx"] = ElementsRegistry()
+elements["xyvsy"] = ElementsRegistry()
+elements["xvsy"] = ElementsRegistry()
+elements["scatter"] = ElementsRegistry()
+elements["colormap"] = ElementsRegistry()
+elements["display"] = DisplaysRegistry(elements)
+elements["format"] = ElementsRegistry()
 
 _protected_elements = {}
 for k in list(elements.keys()):
@@ -0,0 +1,149 @@
+"""
+Array storage for the x and y coordinates of the lines, markers and fillareas.
+"""
+import numpy
+
+
+class Coordinates(object):
+    """Coordinates of the groups of points of a primitive (one group per
+    line, marker group or polygon), stored as one flat array of values:
+    the values of group i are values[offsets[i]:offsets[i + 1]].
+
+    The list API of the primitives is kept on top of the arrays: len() is
+    the number of groups, indexing and iteration give CoordinatesGroup
+    lists, whose changes (e.g. x[i].append(v) or x[i][j] = v) are written
+    back to the group, and groups can be replaced, appended or deleted.
+    group() returns the values of a group as a view of the values.
+    """
+
+    def __init__(self, values, offsets=None):
+        self.values = numpy.ascontiguousarray(values, dtype=numpy.float64)
+        if offsets is None:
+            offsets = [0, len(self.values)]
+        self.offsets = numpy.asarray(offsets, dtype=numpy.int64)
+
+    @classmethod
+    def fromArray(cls, value):
+        """Coordinates of a 1D array (one group) or of a 2D array (one group per row)."""
+        value = numpy.asarray(value, dtype=numpy.float64)
+        if value.ndim == 1:
+            return cls(value)
+        rows, columns = value.shape
+        return cls(value.ravel(), numpy.arange(rows + 1) * columns)
+
+    @classmethod
+    def fromGroups(cls, groups):
+        """Coordinates of a list of groups (sequences of numbers)."""
+        sizes = [len(group) for group in groups]
+        offsets = numpy.zeros(len(sizes) + 1, dtype=numpy.int64)
+        numpy.cumsum(sizes, out=offsets[1:])
+        if len(groups) == 0:
+            return cls(numpy.zeros(0), offsets)
+        return cls(numpy.concatenate([numpy.asarray(group, dtype=numpy.float64)
+                                      for group in groups]), offsets)
+
+    def copy(self):
+        return Coordinates(self.values.copy(), self.offsets.copy())
+
+    def group(self, i):
+        """Values of group i, a view of the values."""
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def sizes(self):
+        return numpy.diff(self.offsets)
+
+    def tolist(self):
+        return [self.group(i).tolist() for i in range(len(self))]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _index(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("coordinates index out of range")
+        return i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return CoordinatesGroup(self, self._index(i))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield CoordinatesGroup(self, i)
+
+    def _replace(self, start, stop, groups):
+        groups = [numpy.asarray(group, dtype=numpy.float64) for group in groups]
+        first, last = self.offsets[start], self.offsets[stop]
+        self.values = numpy.concatenate([self.values[:first]] + groups + [self.values[last:]])
+        sizes = numpy.concatenate([self.sizes()[:start], [len(group) for group in groups],
+                                   self.sizes()[stop:]]).astype(numpy.int64)
+        self.offsets = numpy.zeros(len(sizes) + 1, dtype=numpy.int64)
+        numpy.cumsum(sizes, out=self.offsets[1:])
+
+    def __setitem__(self, i, group):
+        i = self._index(i)
+        self._replace(i, i + 1, [group])
+
+    def __delitem__(self, i):
+        i = self._index(i)
+        self._replace(i, i + 1, [])
+
+    def append(self, group):
+        self._replace(len(self), len(self), [group])
+
+    def __eq__(self, other):
+        if isinstance(other, Coordinates):
+            return (numpy.array_equal(self.offsets, other.offsets) and
+                    numpy.array_equal(self.values, other.values))
+        return self.tolist() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+
+class CoordinatesGroup(list):
+    """List of the values of group index of coordinates (a Coordinates).
+    Changing the list writes it back to the group, so that the primitives
+    edited in place as lists of lists keep working on Coordinates.
+    Copies of the list are plain lists.
+    """
+
+    def __init__(self, coordinates, index):
+        list.__init__(self, coordinates.group(index).tolist())
+        self._coordinates = coordinates
+        self._index = index
+
+    def _write(self):
+        if self._index < len(self._coordinates):
+            self._coordinates._replace(self._index, self._index + 1, [self])
+
+    def __reduce_ex__(self, protocol):
+        return (list, (list(self), ))
+
+
+def _writeBack(name):
+    method = getattr(list, name)
+
+    def write(self, *args, **kargs):
+        result = method(self, *args, **kargs)
+        self._write()
+        return result
+    write.__name__ = name
+    write.__doc__ = method.__doc__
+    return write
+
+
+for _name in ["__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+              "insert", "pop", "remove", "reverse", "sort", "clear",
+              "__setslice__", "__delslice__"]:
+    # list.clear is python 3 only, the slice methods python 2 only
+    if hasattr(list, _name):
+        setattr(CoordinatesGroup, _name, _writeBack(_name))
@@ -25,6 +25,8 @@
 from __future__ import print_function
 from . import VCS_validation_functions
 import vcs
+import numpy
+from .coordinates import Coordinates
 import genutil
 from .xmldocs import scriptdocs, listdoc
 
@@ -33,6 +35,13 @@ def getmember(self, name):
     return getattr(self, "_%s" % name)
 
 
+def tolist(value):
+    """Returns the arrays (coordinates, colors) as lists."""
+    if isinstance(value, (numpy.ndarray, Coordinates)):
+        return value.tolist()
+    return value
+
+
 def process_src(nm, code):
     try:
         f = Tf(nm)
@@ -191,6 +200,22 @@ class Tf(vcs.bestMatch):
                 # List of FloatTypes
                 fa.y=[[.5,.4,.3], [.2,.1,0]]
 
+        * Setting many polygons at once, from flat coordinate arrays:
+
+            .. code-block:: python
+
+                # One polygon per row of 2D arrays
+                fa.x=numpy.array([[0,.1,.2], [.3,.4,.5]])
+                fa.y=numpy.array([[.5,.4,.3], [.2,.1,0]])
+                # Or the coordinates of all the polygons, one after the
+                # other: polygon i is made of the points offsets[i] to
+                # offsets[i + 1] (excluded)
+                from vcs.coordinates import Coordinates
+                fa.x=Coordinates(numpy.array([0,.1,.2,.3,.4,.5,.6]), [0,3,7])
+                fa.y=Coordinates(numpy.array([.5,.4,.3,.2,.1,0,.1]), [0,3,7])
+                # One color index per polygon
+                fa.color=numpy.array([16,200])
+
         .. pragma: skip-doctest
         """
     __slots__ = [
@@ -230,7 +255,16 @@ class Tf(vcs.bestMatch):
             value = value.color
         if isinstance(value, (str, int)):
             value = [value, ]
-        if value is not None:
+        if isinstance(value, numpy.ndarray):
+            # one color index per polygon, checked at once
+            value = VCS_validation_functions.checkArrayOfNumbers(
+                self,
+                'color',
+                value,
+                minvalue=0,
+                maxvalue=255,
+                ints=True)
+        elif value is not None:
             value = VCS_validation_functions.checkColorList(
                 self,
                 'color',
@@ -338,6 +372,10 @@ class Tf(vcs.bestMatch):
         if value is None:
             self._x = value
             return
+        if isinstance(value, (numpy.ndarray, Coordinates)):
+            # one polygon per row or per group of the Coordinates
+            self._x = VCS_validation_functions.checkCoordinates(self, 'x', value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError('x must be a tuple or list of values.')
         try:
@@ -363,6 +401,10 @@ class Tf(vcs.bestMatch):
         if value is None:
             self._y = None
             return
+        if isinstance(value, (numpy.ndarray, Coordinates)):
+            # one polygon per row or per group of the Coordinates
+            self._y = VCS_validation_functions.checkCoordinates(self, 'y', value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError('y must be a tuple or list of values.')
         try:
@@ -522,15 +564,15 @@ class Tf(vcs.bestMatch):
             fp.write("   %s = v.createfillarea('%s')\n" % (unique_name, self.name))
             fp.write("%s.style = %s\n" % (unique_name, self.style))
             fp.write("%s.index = %s\n" % (unique_name, self.index))
-            fp.write("%s.color = %s\n\n" % (unique_name, self.color))
+            fp.write("%s.color = %s\n\n" % (unique_name, tolist(self.color)))
             fp.write("%s.opacity = %s\n\n" % (unique_name, self.opacity))
             fp.write("%s.pixelspacing = %s\n\n" % (unique_name, self.pixelspacing))
             fp.write("%s.pixelscale = %s\n\n" % (unique_name, self.pixelscale))
             fp.write("%s.priority = %d\n" % (unique_name, self.priority))
             fp.write("%s.viewport = %s\n" % (unique_name, self.viewport))
             fp.write("%s.worldcoordinate = %s\n" % (unique_name, self.worldcoordinate))
-            fp.write("%s.x = %s\n" % (unique_name, self.x))
-            fp.write("%s.y = %s\n\n" % (unique_name, self.y))
+            fp.write("%s.x = %s\n" % (unique_name, tolist(self.x)))
+            fp.write("%s.y = %s\n\n" % (unique_name, tolist(self.y)))
             fp.write("%s.projection = '%s'\n\n" % (unique_name, self.projection))
             if self.colormap is not None:
                 fp.write("%s.colormap = %s\n\n" % (unique_name, repr(self.colormap)))
@@ -25,6 +25,8 @@
 from __future__ import print_function
 from . import VCS_validation_functions
 import vcs
+import numpy
+from .coordinates import Coordinates
 import genutil
 from .xmldocs import scriptdocs, listdoc
 
@@ -145,6 +147,9 @@ class Tl(vcs.bestMatch):
 
                 >>> ln.x=[[0,.1,.2], [.3,.4,.5]] # List of floats
                 >>> ln.y=[[.5,.4,.3], [.2,.1,0]] # List of floats
+                >>> import numpy
+                >>> ln.x=numpy.array([[0,.1,.2], [.3,.4,.5]]) # Arrays, one line per row
+                >>> ln.y=numpy.array([[.5,.4,.3], [.2,.1,0]])
 
     .. ln.x and ln.y above cause ln to be unplottable. Need a better example.
     .. Use doctests in this class as a model for converting other class docstrings to use doctests.
@@ -264,6 +269,9 @@ class Tl(vcs.bestMatch):
         if value is None:
             self._x = None
             return
+        if isinstance(value, (numpy.ndarray, Coordinates)):
+            self._x = VCS_validation_functions.checkCoordinates(self, 'x', value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError('%s must be a tuple or list of values.')
         try:
@@ -290,6 +298,9 @@ class Tl(vcs.bestMatch):
         if value is None:
             self._y = None
             return
+        if isinstance(value, (numpy.ndarray, Coordinates)):
+            self._y = VCS_validation_functions.checkCoordinates(self, 'y', value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError('%s must be a tuple or list of values.')
         try:
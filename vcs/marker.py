@@ -24,10 +24,19 @@
 from __future__ import print_function
 from . import VCS_validation_functions
 import vcs
+import numpy
+from .coordinates import Coordinates
 import genutil
 from .xmldocs import scriptdocs, listdoc
 
 
+def tolist(value):
+    """Returns the arrays (coordinates, sizes, values) as lists."""
+    if isinstance(value, (numpy.ndarray, Coordinates)):
+        return value.tolist()
+    return value
+
+
 def process_src(nm, code):
 
     # Takes VCS script code (string) as input and generates oneD gm from it
@@ -217,6 +226,26 @@ class Tm(vcs.bestMatch):
                 # List of FloatTypes
                 mk.y=[[.5,.4,.3], [.2,.1,0]]
 
+        * Plotting many points at once, from numpy arrays:
+
+            .. code-block:: python
+
+                # One marker per point, all of the first type
+                mk.x=numpy.array([0,.1,.2,.3])
+                mk.y=numpy.array([.5,.4,.3,.2])
+                # Colors the points through the colormap
+                mk.value=numpy.array([1.,2.,3.,4.])
+                # Values at the first and last colors, the values
+                # range when None
+                mk.valuerange=[0.,5.]
+                # One size per point
+                mk.size=numpy.array([1.,2.,3.,4.])
+                # 2D arrays have one group of markers per row, each
+                # group with its own type, color and size
+                mk.x=numpy.array([[0,.1], [.2,.3]])
+                mk.y=numpy.array([[.5,.4], [.3,.2]])
+                mk.type=["dot", "cross"]
+
         .. pragma: skip-doctest
         """
     __slots__ = [
@@ -232,6 +261,8 @@ class Tm(vcs.bestMatch):
         '_y',
         '_projection',
         '_colormap',
+        '_value',
+        '_valuerange',
     ]
     colormap = VCS_validation_functions.colormap
 
@@ -278,7 +309,15 @@ class Tm(vcs.bestMatch):
     def _setsize(self, value):
         if VCS_validation_functions.isNumber(value):
             value = [value, ]
-        if value is not None:
+        if isinstance(value, numpy.ndarray):
+            # one size per point, see x
+            value = VCS_validation_functions.checkArrayOfNumbers(
+                self,
+                'size',
+                value,
+                minvalue=0,
+                maxvalue=300)
+        elif value is not None:
             value = VCS_validation_functions.checkListOfNumbers(
                 self,
                 'size',
@@ -344,6 +383,10 @@ class Tm(vcs.bestMatch):
         if value is None:
             self._x = None
             return
+        if isinstance(value, (numpy.ndarray, Coordinates)):
+            # coordinates of the points, drawn with a single marker type
+            self._x = VCS_validation_functions.checkCoordinates(self, 'x', value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError(
                 'x must be a tuple or list of values. You sent: %s' %
@@ -372,6 +415,10 @@ class Tm(vcs.bestMatch):
         if value is None:
             self._y = None
             return
+        if isinstance(value, (numpy.ndarray, Coordinates)):
+            # coordinates of the points, drawn with a single marker type
+            self._y = VCS_validation_functions.checkCoordinates(self, 'y', value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError(
                 'y must be a tuple or list of values. You sent: %s' %
@@ -393,6 +440,32 @@ class Tm(vcs.bestMatch):
         self._y = value
     y = property(_gety, _sety)
 
+    def _getvalue(self):
+        return self._value
+
+    def _setvalue(self, value):
+        if value is not None:
+            value = VCS_validation_functions.checkArrayOfNumbers(
+                self,
+                'value',
+                value)
+        self._value = value
+    value = property(_getvalue, _setvalue)
+
+    def _getvaluerange(self):
+        return self._valuerange
+
+    def _setvaluerange(self, value):
+        if value is not None:
+            value = VCS_validation_functions.checkListOfNumbers(
+                self,
+                'valuerange',
+                value,
+                minelements=2,
+                maxelements=2)
+        self._valuerange = value
+    valuerange = property(_getvaluerange, _setvaluerange)
+
     def __init__(self, Tm_name, Tm_name_src='default'):
         if (Tm_name is None):
             raise ValueError('Must provide a marker name.')
@@ -409,6 +482,8 @@ class Tm(vcs.bestMatch):
             self._y = None
             self._projection = "default"
             self._colormap = None
+            self._value = None
+            self._valuerange = None
         else:
             if isinstance(Tm_name_src, Tm):
                 Tm_name_src = Tm_name_src.name
@@ -418,7 +493,8 @@ class Tm(vcs.bestMatch):
                     Tm_name_src)
             src = vcs.elements["marker"][Tm_name_src]
             for att in ['colormap', 'projection', 'color', 'size',
-                        'type', 'viewport', 'worldcoordinate', 'priority', 'x', 'y']:
+                        'type', 'viewport', 'worldcoordinate', 'priority', 'x', 'y',
+                        'value', 'valuerange']:
                 setattr(self, att, getattr(src, att))
         # Ok now we need to stick in the elements
         vcs.elements["marker"][Tm_name] = self
@@ -437,6 +513,8 @@ class Tm(vcs.bestMatch):
         print("worldcoordinate =", self.worldcoordinate)
         print("x =", self.x)
         print("y =", self.y)
+        print("value =", self.value)
+        print("valuerange =", self.valuerange)
         print("projection =", self.projection)
         print("colormap =", self.colormap)
     list.__doc__ = listdoc.format(name="marker", parent="")
@@ -489,13 +567,15 @@ class Tm(vcs.bestMatch):
             fp.write("else:\n")
             fp.write("   %s = v.createmarker('%s')\n" % (unique_name, self.name))
             fp.write("%s.type = %s\n" % (unique_name, self.type))
-            fp.write("%s.size = %s\n" % (unique_name, self.size))
+            fp.write("%s.size = %s\n" % (unique_name, tolist(self.size)))
             fp.write("%s.color = %s\n\n" % (unique_name, self.color))
             fp.write("%s.priority = %d\n" % (unique_name, self.priority))
             fp.write("%s.viewport = %s\n" % (unique_name, self.viewport))
             fp.write("%s.worldcoordinate = %s\n" % (unique_name, self.worldcoordinate))
-            fp.write("%s.x = %s\n" % (unique_name, self.x))
-            fp.write("%s.y = %s\n" % (unique_name, self.y))
+            fp.write("%s.x = %s\n" % (unique_name, tolist(self.x)))
+            fp.write("%s.y = %s\n" % (unique_name, tolist(self.y)))
+            fp.write("%s.value = %s\n" % (unique_name, tolist(self.value)))
+            fp.write("%s.valuerange = %s\n" % (unique_name, self.valuerange))
             fp.write("%s.projection = '%s'\n" % (unique_name, self.projection))
             if self.colormap is not None:
                 fp.write("%s.colormap = %s\n\n" % (unique_name, repr(self.colormap)))
@@ -0,0 +1,199 @@
+"""
+Containers for the vcs elements (vcs.elements[type]).
+"""
+import collections
+import functools
+from .error import vcsError
+
+# Maximum number of automatically generated elements ("__" names created
+# while plotting) kept per type once the displays using them are gone.
+# None keeps all of them until clean_auto_generated_objects is called.
+autoGeneratedLimit = None
+
+
+class ElementsRegistry(dict):
+    """Dictionary of the vcs elements of one type (name -> element).
+
+    It records the order in which names are added, so that the
+    names added after a given generation (see generation() and
+    createdSince()) are found without going through all the elements.
+
+    Elements generated while plotting can be tracked (see track()), they
+    are then counted as referenced by the displays using them and the
+    unreferenced ones can be evicted (see evict()).
+    """
+
+    def __init__(self, *args, **kargs):
+        dict.__init__(self)
+        self._generation = 0
+        # name -> generation at which the name was added, in generation order
+        self._created = collections.OrderedDict()
+        # tracked name -> number of displays referencing it, in generation order
+        self._references = collections.OrderedDict()
+        self.update(*args, **kargs)
+
+    def _added(self, key):
+        self._generation += 1
+        self._created[key] = self._generation
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._added(key)
+        dict.__setitem__(self, key, value)
+
+    def _removed(self, key):
+        del self._created[key]
+        self._references.pop(key, None)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._removed(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kargs):
+        for key, value in dict(*args, **kargs).items():
+            self[key] = value
+
+    def pop(self, key, *args):
+        if key in self:
+            self._removed(key)
+        return dict.pop(self, key, *args)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._removed(key)
+        return key, value
+
+    def clear(self):
+        dict.clear(self)
+        self._created.clear()
+        self._references.clear()
+
+    def generation(self):
+        """Returns the current generation, it is incremented for each new name."""
+        return self._generation
+
+    def createdSince(self, generation):
+        """Returns the names added after 'generation' that are still
+        in the registry, in the order they were added."""
+        names = []
+        # names are in generation order, only the new ones are visited
+        for key in reversed(self._created):
+            if self._created[key] <= generation:
+                break
+            names.append(key)
+        names.reverse()
+        return names
+
+    def track(self, names):
+        """Tracks the automatically generated elements ("__" names) in names,
+        they are evicted by evict() when no display references them."""
+        for key in names:
+            if key[:2] == "__" and key in self and key not in self._references:
+                self._references[key] = 0
+
+    def tracked(self):
+        """Returns the tracked names, in the order they were added."""
+        return list(self._references.keys())
+
+    def reference(self, key):
+        if key in self._references:
+            self._references[key] += 1
+
+    def release(self, key):
+        if self._references.get(key, 0) > 0:
+            self._references[key] -= 1
+
+    def evict(self, limit, remove=None):
+        """Removes the oldest unreferenced tracked elements until at most
+        'limit' tracked elements are left, with remove(name) when given
+        (see removeElement). Returns the removed names."""
+        excess = len(self._references) - limit
+        evicted = []
+        if excess <= 0:
+            return evicted
+        for key, count in self._references.items():
+            if count == 0:
+                evicted.append(key)
+                if len(evicted) == excess:
+                    break
+        for key in evicted:
+            # removing an element can remove the ones depending on it
+            if key not in self:
+                continue
+            if remove is None:
+                del self[key]
+            else:
+                remove(key)
+        return evicted
+
+
+class DisplaysRegistry(ElementsRegistry):
+    """Registry of the displays, the displays reference the elements they use
+    in the other registries of 'elements' until they are removed."""
+
+    def __init__(self, elements, *args, **kargs):
+        self._elements = elements
+        # display name -> [(element type, name), ...] referenced by the display
+        self._uses = {}
+        ElementsRegistry.__init__(self, *args, **kargs)
+
+    def _removed(self, key):
+        ElementsRegistry._removed(self, key)
+        for typ, name in self._uses.pop(key, []):
+            self._elements[typ].release(name)
+
+    def clear(self):
+        for key in list(self._uses.keys()):
+            self._removed(key)
+        ElementsRegistry.clear(self)
+
+    def referenceElements(self, display):
+        """References the elements used by display: the elements created
+        while plotting it, its template and its graphics method."""
+        uses = []
+        for typ, names in getattr(display, "newelements", {}).items():
+            uses += [(typ, name) for name in names]
+        uses.append(("template", display.template))
+        uses.append(("template", getattr(display, "_template_origin", None)))
+        uses.append((display.g_type, display.g_name))
+        uses = [(typ, name) for typ, name in uses
+                if typ in self._elements and typ != "display" and isinstance(name, str)]
+        for typ, name in self._uses.get(display.name, []):
+            self._elements[typ].release(name)
+        for typ, name in uses:
+            self._elements[typ].reference(name)
+        self._uses[display.name] = uses
+
+
+def removeElement(typ, name):
+    """Removes vcs.elements[typ][name] with vcs.removeobject, which also
+    removes the elements depending on it (e.g. the texttable and
+    textorientation of a textcombined). The elements it does not handle
+    are simply deleted."""
+    import vcs
+    try:
+        vcs.removeobject(vcs.elements[typ][name])
+    except vcsError:
+        del vcs.elements[typ][name]
+
+
+def trackAutoGenerated(elements, generations, display=None, remove=None):
+    """Tracks the elements added to 'elements' since 'generations'
+    (type -> generation), referencing the ones used by display, then
+    evicts the unreferenced ones above autoGeneratedLimit with
+    remove(type, name) (del by default)."""
+    for typ, registry in elements.items():
+        if typ != "display":
+            registry.track(registry.createdSince(generations.get(typ, 0)))
+    if display is not None:
+        elements["display"].referenceElements(display)
+    if autoGeneratedLimit is not None:
+        for typ, registry in elements.items():
+            if typ != "display":
+                registry.evict(autoGeneratedLimit,
+                               None if remove is None else functools.partial(remove, typ))
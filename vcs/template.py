@@ -34,6 +34,7 @@
 #
 #
 from __future__ import print_function
+import collections
 import copy
 import vcs
 import numpy
@@ -181,6 +182,144 @@ def process_src(nm, code):
     t.orientation = int(code[i + 12])
 
 
+class _Decoration(object):
+    """Copy of a vcs primitive that is not stored in vcs.elements.
+
+    Attributes set on the copy override the ones of the source primitive,
+    'x' is found as '_x' when it is the one that was set.
+    """
+
+    def __init__(self, source, **attributes):
+        self._source = source
+        self.__dict__.update(attributes)
+
+    def __getattr__(self, name):
+        if "_" + name in self.__dict__:
+            return self.__dict__["_" + name]
+        return getattr(self._source, name)
+
+
+class TemplateDecorations(object):
+    """Texts and lines drawn by a template, collected so that the backend
+    draws them all at once (see VTKPlots.renderTemplateDecorations)
+    instead of plotting a temporary primitive for each of them."""
+
+    def __init__(self):
+        self.texts = []
+        # (viewport, worldcoordinate, projection, colormap) -> lines
+        self._lines = collections.OrderedDict()
+
+    def createtext(self, Tt_source, To_source):
+        if isinstance(Tt_source, str):
+            Tt_source = vcs.elements["texttable"][Tt_source]
+        if isinstance(To_source, str):
+            To_source = vcs.elements["textorientation"][To_source]
+        return _Decoration(Tt_source, textorientation=To_source)
+
+    def createline(self, source):
+        if isinstance(source, str):
+            source = vcs.elements["line"][source]
+        return _Decoration(source)
+
+    def addText(self, tt):
+        if tt.priority == 0:
+            return
+        if isinstance(tt.string, str):
+            tt.string = [tt.string, ]
+        else:
+            tt.string = [str(s) for s in tt.string]
+        self.texts.append(tt)
+
+    def addLine(self, line):
+        if line.priority == 0 or line.x is None or line.y is None:
+            return
+        xs = line.x
+        ys = line.y
+        if not isinstance(xs[0], (list, tuple)):
+            xs = [xs, ]
+        if not isinstance(ys[0], (list, tuple)):
+            ys = [ys, ]
+        key = (tuple(line.viewport), tuple(line.worldcoordinate),
+               line.projection, line.colormap)
+        if key not in self._lines:
+            self._lines[key] = _Decoration(line, x=[], y=[], color=[], width=[], type=[])
+        lines = self._lines[key]
+        values = {"x": xs, "y": ys, "color": line.color,
+                  "width": line.width, "type": line.type}
+        # as in prepPrimitive, the shorter attributes repeat their last value
+        n = max([len(v) for v in values.values()])
+        for a, v in values.items():
+            getattr(lines, a).extend([copy.copy(v[min(i, len(v) - 1)]) for i in range(n)])
+
+    def lines(self):
+        """Returns one line primitive for all the lines sharing a viewport,
+        world coordinates, projection and colormap."""
+        return list(self._lines.values())
+
+
+def _createDecorations(x, gm, kargs):
+    """Returns the TemplateDecorations collecting the texts and lines of
+    a template plotted on x, or None if they have to be plotted one by one."""
+    # a ratio has to be applied to each of them
+    doratio = str(kargs.get("ratio", x.ratio)).strip().lower()
+    if hasattr(x.backend, "renderTemplateDecorations") and \
+            not isinstance(gm, vcs.taylor.Gtd) and \
+            vcs.elements["projection"][gm.projection].type == "linear" and \
+            doratio in ["0", "0t", "off", "none"]:
+        return TemplateDecorations()
+    return None
+
+
+def _createtext(x, decorations, Tt_source, To_source):
+    if decorations is None:
+        return x.createtext(Tt_source=Tt_source, To_source=To_source)
+    return decorations.createtext(Tt_source, To_source)
+
+
+def _createline(x, decorations, source):
+    if decorations is None:
+        return x.createline(source=source)
+    return decorations.createline(source)
+
+
+def _drawText(decorations, plot, tt, **kargs):
+    """Plots tt with plot (a canvas method) or adds it to decorations,
+    returns the list of new displays."""
+    if decorations is None:
+        return [plot(tt, **kargs)]
+    decorations.addText(tt)
+    return []
+
+
+def _drawLine(decorations, plot, line, **kargs):
+    """Plots line with plot (a canvas method) or adds it to decorations,
+    returns the list of new displays."""
+    if decorations is None:
+        return [plot(line, **kargs)]
+    decorations.addLine(line)
+    return []
+
+
+def _renderDecorations(x, decorations, **kargs):
+    if decorations is not None:
+        x.backend.renderTemplateDecorations(decorations, **kargs)
+
+
+def _removeTemporary(primitive):
+    """Removes a line or text created by _createline or _createtext
+    from vcs.elements once it is plotted."""
+    if isinstance(primitive, _Decoration):
+        # never stored
+        return
+    if vcs.isline(primitive):
+        del(vcs.elements["line"][primitive.name])
+    else:
+        sp = primitive.name.split(":::")
+        del(vcs.elements["texttable"][sp[0]])
+        del(vcs.elements["textorientation"][sp[1]])
+        del(vcs.elements["textcombined"][primitive.name])
+
+
 #############################################################################
 #                                                                           #
 # Template (P) graphics method Class.                                       #
@@ -1053,11 +1192,14 @@ class P(vcs.bestMatch):
     # Adding the drawing functionnality to plot all these attributes on the
     # Canvas
     def drawTicks(self, slab, gm, x, axis, number,
-                  vp, wc, bg=False, X=None, Y=None, mintic=False, **kargs):
+                  vp, wc, bg=False, X=None, Y=None, mintic=False,
+                  decorations=None, **kargs):
         """Draws the ticks for the axis x number number
         using the label passed by the graphic  method
         vp and wc are from the actual canvas, they have
         been reset when they get here...
+        If decorations (TemplateDecorations) is passed the ticks
+        and labels are added to it instead of being plotted.
 
         .. pragma: skip-doctest TODO add example/doctest
         """
@@ -1115,15 +1257,13 @@ class P(vcs.bestMatch):
             obj = getattr(self, axis + 'mintic' + number)
         # the following to make sure we have a unique name,
         # i put them together assuming it would be faster
-        ticks = x.createline(source=obj.line)
+        ticks = _createline(x, decorations, obj.line)
         ticks.projection = gm.projection
         ticks.priority = obj.priority
         if mintic is False:
             # the labels
             objlabl = getattr(self, axis + 'label' + number)
-            tt = x.createtext(
-                Tt_source=objlabl.texttable,
-                To_source=objlabl.textorientation)
+            tt = _createtext(x, decorations, objlabl.texttable, objlabl.textorientation)
             tt.projection = gm.projection
             tt.priority = objlabl.priority
         if vcs.elements["projection"][gm.projection].type != "linear":
@@ -1238,18 +1378,15 @@ class P(vcs.bestMatch):
             tt.string = tstring
             tt.x = txs
             tt.y = tys
-            displays.append(x.text(tt, bg=bg, ratio="none", **kargs))
+            displays += _drawText(decorations, x.text, tt, bg=bg, ratio="none", **kargs)
         if xs != []:
             ticks._x = xs
             ticks._y = ys
-            displays.append(x.line(ticks, bg=bg, **kargs))
+            displays += _drawLine(decorations, x.line, ticks, bg=bg, **kargs)
 
-        del(vcs.elements["line"][ticks.name])
+        _removeTemporary(ticks)
         if mintic is False:
-            sp = tt.name.split(":::")
-            del(vcs.elements["texttable"][sp[0]])
-            del(vcs.elements["textorientation"][sp[1]])
-            del(vcs.elements["textcombined"][tt.name])
+            _removeTemporary(tt)
         return displays
 
     def blank(self, attribute=None):
@@ -1749,6 +1886,8 @@ class P(vcs.bestMatch):
         displays += self.drawAttributes(x, slab, gm, bg=bg, **kargs)
 
         kargs["donotstoredisplay"] = True
+        # When possible the backend draws the texts and lines below at once
+        decorations = _createDecorations(x, gm, kargs)
         if not isinstance(gm, vcs.taylor.Gtd):
             nms = ["x", "y", "z", "t"]
             for i, ax in enumerate(slab.getAxisList()[-2:][::-1] +
@@ -1760,11 +1899,7 @@ class P(vcs.bestMatch):
                 for att in ["name", "units", "value"]:
                     nm = nms[i] + att
                     sub = getattr(self, nm)
-                    tt = x.createtext(
-                        None,
-                        sub.texttable,
-                        None,
-                        sub.textorientation)
+                    tt = _createtext(x, decorations, sub.texttable, sub.textorientation)
                     if att == "name":
                         if i == 0 and gm.g_name == "G1d":
                             if gm.flip or hasattr(slab, "_yname"):
@@ -1785,11 +1920,8 @@ class P(vcs.bestMatch):
                     tt.priority = sub._priority
                     # This is the name of the axis. It should be transformed
                     # through geographic projection but it is not at the moment
-                    displays.append(x.text(tt, bg=bg, **kargs))
-                    sp = tt.name.split(":::")
-                    del(vcs.elements["texttable"][sp[0]])
-                    del(vcs.elements["textorientation"][sp[1]])
-                    del(vcs.elements["textcombined"][tt.name])
+                    displays += _drawText(decorations, x.text, tt, bg=bg, **kargs)
+                    _removeTemporary(tt)
 
         if X is None:
             X = slab.getAxis(-1)
@@ -1816,6 +1948,7 @@ class P(vcs.bestMatch):
                                                    X=X,
                                                    Y=Y,
                                                    mintic=mintic,
+                                                   decorations=decorations,
                                                    **kargs)
 
         if X is None:
@@ -1831,7 +1964,7 @@ class P(vcs.bestMatch):
             for num in ["1", "2"]:
                 e = getattr(self, tp + num)
                 if e.priority != 0:
-                    ln_tmp = x.createline(source=e.line)
+                    ln_tmp = _createline(x, decorations, e.line)
                     if hasattr(gm, "projection"):
                         ln_tmp.projection = gm.projection
                     if vcs.elements["projection"][
@@ -1865,8 +1998,10 @@ class P(vcs.bestMatch):
                         ln_tmp._x = [e._x1, e._x2, e._x2, e._x1, e._x1]
                         ln_tmp._y = [e._y1, e._y1, e._y2, e._y2, e._y1]
                     ln_tmp._priority = e._priority
-                    displays.append(x.plot(ln_tmp, bg=bg, ratio="none", **kargs))
-                    del(vcs.elements["line"][ln_tmp.name])
+                    displays += _drawLine(decorations, x.plot, ln_tmp, bg=bg, ratio="none", **kargs)
+                    _removeTemporary(ln_tmp)
+
+        _renderDecorations(x, decorations, **kargs)
 
         # x.mode=m
         # I think i have to use dict here because it's a valid value
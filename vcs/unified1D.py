@@ -359,6 +359,8 @@ class G1d(vcs.bestMatch):
         '_datawc_calendar',
         '_flip',
         '_smooth',
+        '_decimate',
+        '_spaghetti',
     ]
 
     def _getname(self):
@@ -643,6 +645,30 @@ class G1d(vcs.bestMatch):
         None,
         "beta parameter for kaiser smoothing")
 
+    def _getdecimate(self):
+        return self._decimate
+
+    def _setdecimate(self, value):
+        value = VCS_validation_functions.checkTrueFalse(self, 'decimate', value)
+        self._decimate = value
+    decimate = property(
+        _getdecimate,
+        _setdecimate,
+        None,
+        "draw only the first, last, min and max points of each pixel column of the line")
+
+    def _getspaghetti(self):
+        return self._spaghetti
+
+    def _setspaghetti(self, value):
+        value = VCS_validation_functions.checkTrueFalse(self, 'spaghetti', value)
+        self._spaghetti = value
+    spaghetti = property(
+        _getspaghetti,
+        _setspaghetti,
+        None,
+        "draw all the curves of the data along its last axis, one colormap color per curve")
+
     def _gtype(self):
         if self.flip:
             return "xyvsy"
@@ -667,6 +693,8 @@ class G1d(vcs.bestMatch):
         self._name = name
         if name == 'default':
             self._smooth = None
+            self._decimate = False
+            self._spaghetti = False
             self._flip = False
             self._projection = "linear"
             self._xticlabels1 = "*"
@@ -703,7 +731,8 @@ class G1d(vcs.bestMatch):
             for att in ['projection', 'colormap', 'xticlabels1', 'xticlabels2', 'xmtics1', 'xmtics2',
                         'yticlabels1', 'yticlabels2', 'ymtics1', 'ymtics2', 'datawc_y1', 'datawc_y2', 'datawc_x1',
                         'datawc_x2', 'xaxisconvert', 'yaxisconvert', 'linetype', 'linecolor', 'linewidth', 'marker',
-                        'markercolor', 'markersize', 'datawc_timeunits', 'datawc_calendar', 'smooth', 'flip']:
+                        'markercolor', 'markersize', 'datawc_timeunits', 'datawc_calendar', 'smooth', 'flip',
+                        'decimate', 'spaghetti']:
                 setattr(self, att, getattr(src, att))
         # Ok now we need to stick in the elements
         vcs.elements["1d"][name] = self
@@ -776,6 +805,8 @@ class G1d(vcs.bestMatch):
         print("markercolor = ", self.markercolor)
         print("markersize = ", self.markersize)
         print("flip = ", self.flip)
+        print("decimate = ", self.decimate)
+        print("spaghetti = ", self.spaghetti)
     list.__doc__ = xmldocs.listdoc.format(name="1d", parent="'default'")
 
     ###########################################################################
@@ -893,6 +924,8 @@ class G1d(vcs.bestMatch):
             fp.write("%s.markercolor = %s\n" % (unique_name, self.markercolor))
             fp.write("%s.markersize = %s\n\n" % (unique_name, self.markersize))
             fp.write("%s.flip = %s\n\n" % (unique_name, repr(self.flip)))
+            fp.write("%s.decimate = %s\n\n" % (unique_name, repr(self.decimate)))
+            fp.write("%s.spaghetti = %s\n\n" % (unique_name, repr(self.spaghetti)))
             if self.colormap is not None:
                 fp.write("%s.colormap = %s\n\n" % (unique_name, repr(self.colormap)))
             else:
@@ -19,6 +19,7 @@ import warnings
 import vcs
 import json
 from . import boxfill
+from .coordinates import Coordinates
 from . import isofill
 from . import isoline
 from . import taylor
@@ -346,6 +347,8 @@ def dumpToDict(obj, skipped=[], must=[]):
                         obj, (vcs.isoline.Gi, vcs.unified1D.G1d)):
                     continue
                 associated[a].add(val)
+            if isinstance(val, (numpy.ndarray, Coordinates)):
+                val = val.tolist()
             if not isinstance(val,
                               (basestring, tuple, list, long, int, float, dict)) and \
                     val is not None:
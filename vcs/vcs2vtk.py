@@ -5,18 +5,24 @@ import vtk
 import numpy
 import json
 import os
-import math
 from . import meshfill
 from vtk.util import numpy_support as VN
+from vtk.util.vtkAlgorithm import VTKPythonAlgorithmBase
 import cdms2
 import warnings
 from .projection import round_projections, no_over_proj4_parameter_projections
 from .vcsvtk import fillareautils
+from .coordinates import Coordinates
 import sys
 import numbers
+import collections
+import hashlib
+import bisect
 
 
 DEBUG_MODE = False
+# numpy dtype matching vtkIdType, used to build cell connectivity arrays
+vtkIdTypeCode = VN.get_vtk_to_numpy_typemap()[vtk.VTK_ID_TYPE]
 
 
 def debugWriteGrid(grid, name):
@@ -205,6 +211,26 @@ def numpy_to_vtk_wrapper(numpyArray, deep=False, array_type=None):
     return result
 
 
+# Shared 0, 1, 2, ... buffer. PedigreeIds and GlobalIds arrays are
+# shallow views into it, so they cost neither a copy nor a python loop.
+_idsBuffer = numpy.arange(0, dtype=vtkIdTypeCode)
+
+
+def genIdArray(numberOfIds, name):
+    '''
+    Returns a vtkIdTypeArray called name with values 0 .. numberOfIds - 1.
+    The array does not own its memory: it wraps a view of a shared
+    buffer, which is grown when needed and must not be modified.
+    '''
+    global _idsBuffer
+    if len(_idsBuffer) < numberOfIds:
+        _idsBuffer = numpy.arange(0, numberOfIds, dtype=vtkIdTypeCode)
+    ids = numpy_to_vtk_wrapper(_idsBuffer[:numberOfIds], deep=False,
+                               array_type=vtk.VTK_ID_TYPE)
+    ids.SetName(name)
+    return ids
+
+
 # Adds 'array' to 'grid' as cell or point attribute based on 'isCellData'
 # It also sets it as the active scalar if 'isScalars'.
 # If the grid has pedigree ids (it was wrapped) we use them to set the array.
@@ -213,8 +239,8 @@ def setArray(grid, array, arrayName, isCellData, isScalars):
     pedigreeId = attributes.GetPedigreeIds()
     if (pedigreeId):
         vtkarray = attributes.GetArray(arrayName)
-        for i in range(0, vtkarray.GetNumberOfTuples()):
-            vtkarray.SetValue(i, array[pedigreeId.GetValue(i)])
+        VN.vtk_to_numpy(vtkarray)[:] = array[VN.vtk_to_numpy(pedigreeId)]
+        vtkarray.Modified()
     else:
         vtkarray = numpy_to_vtk_wrapper(array, deep=False)
         vtkarray.SetName(arrayName)
@@ -242,11 +268,9 @@ def putMaskOnVTKGrid(data, grid, actorColor=None, cellData=True, deep=True):
                     attributes = grid.GetPointData()
                 if (attributes.GetPedigreeIds()):
                     attributes2.SetPedigreeIds(attributes.GetPedigreeIds())
-                    pedigreeId = attributes2.GetPedigreeIds()
-                    vtkmask = vtk.vtkDoubleArray()
-                    vtkmask.SetNumberOfTuples(attributes2.GetPedigreeIds().GetNumberOfTuples())
-                    for i in range(0, vtkmask.GetNumberOfTuples()):
-                        vtkmask.SetValue(i, flatIMask[pedigreeId.GetValue(i)])
+                    pedigreeId = VN.vtk_to_numpy(attributes2.GetPedigreeIds())
+                    vtkmask = numpy_to_vtk_wrapper(flatIMask[pedigreeId], deep=False,
+                                                   array_type=vtk.VTK_DOUBLE)
                 else:
                     # the unstructured grid is not wrapped
                     vtkmask = numpy_to_vtk_wrapper(flatIMask, deep=deep, array_type=vtk.VTK_DOUBLE)
@@ -281,13 +305,9 @@ def putMaskOnVTKGrid(data, grid, actorColor=None, cellData=True, deep=True):
         # The ghost array now stores information about hidden (blanked)
         # points/cells. Setting an array entry to the bitwise value
         # `vtkDataSetAttributes.HIDDEN(CELL|POINT)` will blank the cell/point.
-        flatMask = msk.flat
-        ghost = numpy.zeros(len(flatMask), dtype=numpy.uint8)
         invalidMaskValue = vtk.vtkDataSetAttributes.HIDDENCELL if cellData else \
             vtk.vtkDataSetAttributes.HIDDENPOINT
-        for i, isInvalid in enumerate(flatMask):
-            if isInvalid:
-                ghost[i] = invalidMaskValue
+        ghost = numpy.where(numpy.ravel(msk), invalidMaskValue, 0).astype(numpy.uint8)
         attributes = grid.GetCellData() if cellData else grid.GetPointData()
         pedigreeIds = attributes.GetPedigreeIds()
         if (pedigreeIds):
@@ -346,30 +366,152 @@ def getBoundsList(axis, hasCellData, dualGrid):
 
 def setInfToValid(geoPoints, ghost):
     '''
-    Set infinity points to a point that already exists in the list.
+    Set infinity (or NaN) points to a point that already exists in the list.
     We also hide infinity points in the ghost array.
     We return true if any points are infinity
     '''
-    anyInfinity = False
-    validPoint = [0, 0, 0]
-    for i in range(geoPoints.GetNumberOfPoints()):
-        point = geoPoints.GetPoint(i)
-        if (not math.isinf(point[0]) and not math.isinf(point[1])):
-            validPoint[0] = point[0]
-            validPoint[1] = point[1]
-            break
-    for i in range(geoPoints.GetNumberOfPoints()):
-        point = geoPoints.GetPoint(i)
-        if (math.isinf(point[0]) or math.isinf(point[1])):
-            anyInfinity = True
-            newPoint = list(point)
-            if (math.isinf(point[0])):
-                newPoint[0] = validPoint[0]
-            if (math.isinf(point[1])):
-                newPoint[1] = validPoint[1]
-            geoPoints.SetPoint(i, newPoint)
-            ghost.SetValue(i, vtk.vtkDataSetAttributes.HIDDENPOINT)
-    return anyInfinity
+    points = VN.vtk_to_numpy(geoPoints.GetData())
+    isInfX = ~numpy.isfinite(points[:, 0])
+    isInfY = ~numpy.isfinite(points[:, 1])
+    isInf = isInfX | isInfY
+    if not isInf.any():
+        return False
+    validIndices = numpy.nonzero(~isInf)[0]
+    if len(validIndices):
+        validPoint = points[validIndices[0]]
+    else:
+        validPoint = [0, 0, 0]
+    points[isInfX, 0] = validPoint[0]
+    points[isInfY, 1] = validPoint[1]
+    geoPoints.Modified()
+    VN.vtk_to_numpy(ghost)[isInf] = vtk.vtkDataSetAttributes.HIDDENPOINT
+    ghost.Modified()
+    return True
+
+
+def getVisibleBounds(pts, ghost):
+    '''
+    Returns [xm, xM, ym, yM] for the points in 'pts' that are not
+    hidden in the point 'ghost' array.
+    '''
+    points = VN.vtk_to_numpy(pts.GetData())
+    visible = (VN.vtk_to_numpy(ghost) & vtk.vtkDataSetAttributes.HIDDENPOINT) == 0
+    if not visible.any():
+        return [sys.float_info.max, - sys.float_info.max,
+                sys.float_info.max, - sys.float_info.max]
+    x = points[visible, 0]
+    y = points[visible, 1]
+    return [float(x.min()), float(x.max()), float(y.min()), float(y.max())]
+
+
+def extractCells(data, keepCell):
+    '''
+    Returns a polydata with the cells of the polydata 'data' selected by the
+    boolean array keepCell and the points they use. Point and cell arrays
+    are selected accordingly.
+    '''
+    result = vtk.vtkPolyData()
+    if data.GetNumberOfPoints() == 0:
+        result.ShallowCopy(data)
+        return result
+    pts = VN.vtk_to_numpy(data.GetPoints().GetData())
+    cellArrays = [getCellArrayOffsets(cells) for cells in
+                  [data.GetVerts(), data.GetLines(), data.GetPolys(), data.GetStrips()]]
+    usedPoint = numpy.zeros(len(pts), dtype=bool)
+    selection = []
+    first = 0
+    for offsets, connectivity in cellArrays:
+        numberOfCells = len(offsets) - 1
+        keep = keepCell[first:first + numberOfCells]
+        first += numberOfCells
+        keepPoint = numpy.repeat(keep, numpy.diff(offsets))
+        usedPoint[connectivity[keepPoint]] = True
+        selection.append((keep, keepPoint))
+    used = numpy.nonzero(usedPoint)[0]
+    newId = numpy.zeros(len(pts), dtype=numpy.int64)
+    newId[used] = numpy.arange(len(used))
+    points = vtk.vtkPoints()
+    points.SetData(numpy_to_vtk_wrapper(pts[used], deep=True))
+    result.SetPoints(points)
+    newCellArrays = []
+    for (offsets, connectivity), (keep, keepPoint) in zip(cellArrays, selection):
+        counts = numpy.diff(offsets)[keep]
+        keptOffsets = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+        numpy.cumsum(counts, out=keptOffsets[1:])
+        newCellArrays.append(genCellArray(keptOffsets, newId[connectivity[keepPoint]]))
+    result.SetVerts(newCellArrays[0])
+    result.SetLines(newCellArrays[1])
+    result.SetPolys(newCellArrays[2])
+    result.SetStrips(newCellArrays[3])
+    result.GetPointData().ShallowCopy(data.GetPointData())
+    extractTuples(result.GetPointData(), used)
+    result.GetCellData().ShallowCopy(data.GetCellData())
+    extractTuples(result.GetCellData(), keepCell)
+    result.GetFieldData().ShallowCopy(data.GetFieldData())
+    return result
+
+
+class ThresholdPolyData(VTKPythonAlgorithmBase):
+    '''
+    Polydata to polydata replacement for vtkThreshold followed by
+    vtkDataSetSurfaceFilter: keeps the cells whose scalar is in the
+    threshold range (all of their points' scalars for point scalars)
+    and are not hidden. The cells are selected with numpy from the
+    input polydata.
+    '''
+
+    def __init__(self):
+        VTKPythonAlgorithmBase.__init__(self, nInputPorts=1, inputType='vtkPolyData',
+                                        nOutputPorts=1, outputType='vtkPolyData')
+        self._lower = -numpy.inf
+        self._upper = numpy.inf
+
+    def SetInputData(self, data):
+        self.SetInputDataObject(0, data)
+
+    def GetOutput(self):
+        return self.GetOutputDataObject(0)
+
+    def ThresholdBetween(self, lower, upper):
+        self._lower = lower
+        self._upper = upper
+        self.Modified()
+
+    def ThresholdByLower(self, upper):
+        self.ThresholdBetween(-numpy.inf, upper)
+
+    def ThresholdByUpper(self, lower):
+        self.ThresholdBetween(lower, numpy.inf)
+
+    def RequestData(self, request, inInfo, outInfo):
+        data = vtk.vtkPolyData.GetData(inInfo[0])
+        output = vtk.vtkPolyData.GetData(outInfo)
+        # like vtkThreshold, point scalars are used first
+        scalars = data.GetPointData().GetScalars()
+        isPointScalars = scalars is not None
+        if not isPointScalars:
+            scalars = data.GetCellData().GetScalars()
+        if scalars is None:
+            output.ShallowCopy(data)
+            return 1
+        values = VN.vtk_to_numpy(scalars)
+        if values.ndim > 1:
+            values = values[:, 0]
+        inRange = (values >= self._lower) & (values <= self._upper)
+        if isPointScalars:
+            keepCell = []
+            for cells in [data.GetVerts(), data.GetLines(), data.GetPolys(), data.GetStrips()]:
+                offsets, connectivity = getCellArrayOffsets(cells)
+                outOfRange = numpy.zeros(len(connectivity) + 1, dtype=numpy.int64)
+                numpy.cumsum(~inRange[connectivity], out=outOfRange[1:])
+                keepCell.append(outOfRange[offsets[1:]] == outOfRange[offsets[:-1]])
+            inRange = numpy.concatenate(keepCell)
+        # like vtkThreshold, the hidden (masked) cells are dropped
+        ghosts = data.GetCellData().GetArray(vtk.vtkDataSetAttributes.GhostArrayName())
+        if ghosts is not None:
+            inRange &= (VN.vtk_to_numpy(ghosts) & vtk.vtkDataSetAttributes.HIDDENCELL) == 0
+        output.ShallowCopy(extractCells(data, inRange))
+        return 1
 
 
 def removeHiddenPointsOrCells(grid, celldata=False):
@@ -379,81 +521,318 @@ def removeHiddenPointsOrCells(grid, celldata=False):
     points or cells from the input dataset. To remove both, hidden points and
     cells, call the function twice, toggling the celldata flag for each call.
 
+    The cells to remove are found with numpy (for hidden points, every cell
+    that uses a hidden point is removed) and the cell arrays and cell
+    attributes are rebuilt once, keeping all the points.
+
     Keyword arguments:
     grid     -- The input dataset
     celldata -- If True, this method will remove cells, else points
     """
-
-    # Since this method involves deleting points or cells from the polydata, the
-    # first step is to build "upward" links from points to cells.
-    grid.BuildLinks()
-
     ghost = grid.GetCellGhostArray() if celldata else grid.GetPointGhostArray()
     if (not ghost):
         return
-    minScalar = sys.float_info.max
-    minVector = [0, 0, 0]
-    minVectorNorm = sys.float_info.max
-    num = grid.GetNumberOfCells() if celldata else grid.GetNumberOfPoints()
     hidden = vtk.vtkDataSetAttributes.HIDDENCELL if celldata else vtk.vtkDataSetAttributes.HIDDENPOINT
-    if not celldata:
+    isHidden = (VN.vtk_to_numpy(ghost) & hidden) != 0
+    if not isHidden.any():
+        return
+    cellArrays = [grid.GetVerts(), grid.GetLines(), grid.GetPolys(), grid.GetStrips()]
+    cellArrays = [getCellArrayOffsets(cells) for cells in cellArrays]
+    if celldata:
+        removeCell = isHidden
+    else:
+        # a cell is removed if any of its points is hidden
+        removeCell = []
+        for offsets, connectivity in cellArrays:
+            hiddenCount = numpy.zeros(len(connectivity) + 1, dtype=numpy.int64)
+            numpy.cumsum(isHidden[connectivity], out=hiddenCount[1:])
+            removeCell.append(hiddenCount[offsets[1:]] > hiddenCount[offsets[:-1]])
+        removeCell = numpy.concatenate(removeCell)
+
+        # hidden points are not removed. This causes problems
+        # because it changes the scalar range, so we set them
+        # to the minimum value (and minimum norm vector) of the visible points.
+        visible = ~isHidden
         scalars = grid.GetPointData().GetScalars()
         vectors = grid.GetPointData().GetVectors()
+        if (scalars and isHidden.any()):
+            scalarValues = VN.vtk_to_numpy(scalars)
+            minScalar = sys.float_info.max
+            if visible.any():
+                minScalar = scalarValues[visible].min()
+            scalarValues[isHidden] = minScalar
+            scalars.Modified()
+        if (vectors and isHidden.any()):
+            vectorValues = VN.vtk_to_numpy(vectors)
+            minVector = [0, 0, 0]
+            if visible.any():
+                visibleVectors = vectorValues[visible]
+                minVector = visibleVectors[numpy.argmin(numpy.linalg.norm(visibleVectors, axis=1))]
+            vectorValues[isHidden] = minVector
+            vectors.Modified()
+
+    if not removeCell.any():
+        return
+    keepCell = ~removeCell
+    first = 0
+    newCellArrays = []
+    for offsets, connectivity in cellArrays:
+        numberOfCells = len(offsets) - 1
+        keep = keepCell[first:first + numberOfCells]
+        first += numberOfCells
+        counts = numpy.diff(offsets)[keep]
+        keptOffsets = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+        numpy.cumsum(counts, out=keptOffsets[1:])
+        keepPoint = numpy.repeat(keep, numpy.diff(offsets))
+        newCellArrays.append(genCellArray(keptOffsets, connectivity[keepPoint]))
+    # GLOBALIDS and PedigreeIds are kept with the other cell arrays
+    extractTuples(grid.GetCellData(), keepCell)
+    grid.SetVerts(newCellArrays[0])
+    grid.SetLines(newCellArrays[1])
+    grid.SetPolys(newCellArrays[2])
+    grid.SetStrips(newCellArrays[3])
+    # the cells and links structures refer to the old cells
+    grid.DeleteCells()
+
+
+def getCellArrayOffsets(cells):
+    '''
+    Returns (offsets, connectivity) numpy arrays for a vtkCellArray:
+    the point ids of cell i are connectivity[offsets[i]:offsets[i + 1]].
+    With VTK < 9 and cells of different sizes, each cell header must be
+    read to find the next one, so that case is intentionally a loop.
+    '''
+    if hasattr(cells, "GetOffsetsArray"):
+        # VTK >= 9 stores offsets and connectivity
+        return (VN.vtk_to_numpy(cells.GetOffsetsArray()).astype(numpy.int64),
+                VN.vtk_to_numpy(cells.GetConnectivityArray()))
+    # legacy [n, id0, id1, ...] layout
+    legacy = VN.vtk_to_numpy(cells.GetData())
+    numberOfCells = cells.GetNumberOfCells()
+    headers = numpy.zeros(numberOfCells + 1, dtype=numpy.int64)
+    if numberOfCells == 0:
+        return headers, legacy[:0]
+    n = legacy[0]
+    if len(legacy) == numberOfCells * (n + 1) and (legacy[::n + 1] == n).all():
+        # all cells have the same number of points
+        headers = numpy.arange(numberOfCells + 1, dtype=numpy.int64) * (n + 1)
     else:
-        scalars = grid.GetCellData().GetScalars()
-        vectors = grid.GetCellData().GetVectors()
-    if (scalars or vectors):
-        vector = [0, 0, 0]
-        for i in range(num):
-            if (not (ghost.GetValue(i) & hidden)):
-                if (scalars):
-                    scalar = scalars.GetValue(i)
-                    if (scalar < minScalar):
-                        minScalar = scalar
-                if (vectors):
-                    vectors.GetTypedTuple(i, vector)
-                    vectorNorm = numpy.linalg.norm(vector)
-                    if (vectorNorm < minVectorNorm):
-                        minVector = vector
-                        minVectorNorm = vectorNorm
-    hiddenScalars = False
-    hiddenVectors = False
-    for i in range(num):
-        if (ghost.GetValue(i) & hidden):
-            if not celldata:
-                cells = vtk.vtkIdList()
-                # point hidden, remove all cells used by this point
-                grid.GetPointCells(i, cells)
-                for j in range(cells.GetNumberOfIds()):
-                    grid.DeleteCell(cells.GetId(j))
-                # hidden points are not removed. This causes problems
-                # because it changes the scalar range.
-                if(scalars):
-                    hiddenScalars = True
-                    scalars.SetValue(i, minScalar)
-                if(vectors):
-                    hiddenVectors = True
-                    vectors.SetTypedTuple(i, minVector)
-            else:
-                grid.DeleteCell(i)
-    # SetValue does not call modified - we'll have to call it after all calls.
-    if (hiddenScalars):
-        scalars.Modified()
-    if (hiddenVectors):
-        vectors.Modified()
-    # ensure that GLOBALIDS are copied
-    attributes = grid.GetCellData()
-    attributes.SetActiveAttribute(-1, attributes.GLOBALIDS)
-    grid.RemoveDeletedCells()
-    # set GLOBALIDS attribute
-    attributes = grid.GetCellData()
-    globalIdsIndex = vtk.mutable(-1)
-    attributes.GetArray("GlobalIds", globalIdsIndex)
-    attributes.SetActiveAttribute(globalIdsIndex, attributes.GLOBALIDS)
+        # headers can only be found one after the other
+        values = legacy.tolist()
+        position = 0
+        for i in range(numberOfCells):
+            headers[i] = position
+            position += values[position] + 1
+        headers[numberOfCells] = position
+    isPointId = numpy.ones(len(legacy), dtype=bool)
+    isPointId[headers[:-1]] = False
+    return headers - numpy.arange(numberOfCells + 1), legacy[isPointId]
+
+
+def genCellArray(offsets, pointIds):
+    '''
+    Returns a vtkCellArray where cell i uses pointIds[offsets[i]:offsets[i + 1]].
+    The connectivity is built with numpy and handed to VTK in one call.
+    '''
+    cells = vtk.vtkCellArray()
+    if hasattr(cells, "GetOffsetsArray"):
+        # VTK >= 9 takes offsets and connectivity directly
+        cells.SetData(VN.numpy_to_vtk(numpy.asarray(offsets, dtype=numpy.int64), deep=True),
+                      VN.numpy_to_vtk(numpy.asarray(pointIds, dtype=numpy.int64), deep=True))
+        return cells
+    # legacy [n, id0, id1, ...] layout
+    counts = numpy.diff(offsets)
+    numberOfCells = len(counts)
+    # position of each cell's point count in the connectivity array
+    countPositions = offsets[:-1] + numpy.arange(numberOfCells)
+    connectivity = numpy.empty(numberOfCells + len(pointIds), dtype=vtkIdTypeCode)
+    isPointId = numpy.ones(len(connectivity), dtype=bool)
+    isPointId[countPositions] = False
+    connectivity[countPositions] = counts
+    connectivity[isPointId] = pointIds
+    cells.SetCells(numberOfCells,
+                   VN.numpy_to_vtkIdTypeArray(connectivity, deep=True))
+    return cells
+
+
+def extractTuples(attributes, keep):
+    '''
+    Keeps only the tuples selected by 'keep' (a boolean array or an array
+    of tuple ids) in all arrays of 'attributes' (vtkCellData or vtkPointData).
+    Data arrays are subset with numpy, other arrays (vtkStringArray, ...)
+    through a vtkIdList. Active attributes (scalars, vectors, ghost, global
+    and pedigree ids, ...) are preserved.
+    '''
+    active = {}
+    for attributeType in range(vtk.vtkDataSetAttributes.NUM_ATTRIBUTES):
+        array = attributes.GetAbstractAttribute(attributeType)
+        if array:
+            active[attributeType] = array.GetName()
+    keep = numpy.asarray(keep)
+    if keep.dtype == bool:
+        keep = numpy.nonzero(keep)[0]
+    ids = None
+    arrays = [attributes.GetAbstractArray(i) for i in range(attributes.GetNumberOfArrays())]
+    for array in arrays:
+        if array is None:
+            continue
+        if array.IsA("vtkDataArray"):
+            newArray = VN.numpy_to_vtk(VN.vtk_to_numpy(array)[keep], deep=True,
+                                       array_type=array.GetDataType())
+        else:
+            if ids is None:
+                ids = vtk.vtkIdList()
+                ids.SetNumberOfIds(len(keep))
+                for i, tupleId in enumerate(keep.tolist()):
+                    ids.SetId(i, tupleId)
+            newArray = array.__class__()
+            newArray.SetNumberOfComponents(array.GetNumberOfComponents())
+            newArray.SetNumberOfTuples(len(keep))
+            array.GetTuples(ids, newArray)
+        newArray.SetName(array.GetName())
+        attributes.RemoveArray(array.GetName())
+        attributes.AddArray(newArray)
+    for attributeType, name in active.items():
+        index = vtk.mutable(-1)
+        attributes.GetAbstractArray(name, index)
+        attributes.SetActiveAttribute(index, attributeType)
+
+
+def genPolygonCells(m3, numberOfCells, nVertices):
+    '''
+    Returns a vtkCellArray with one polygon per mesh cell.
+    m3 holds nVertices consecutive points for each cell; vertices
+    with a missing (NaN) x coordinate are skipped.
+    '''
+    valid = ~numpy.isnan(m3[:numberOfCells * nVertices, 0])
+    valid = valid.reshape((numberOfCells, nVertices))
+    offsets = numpy.zeros(numberOfCells + 1, dtype=numpy.int64)
+    numpy.cumsum(valid.sum(axis=1), out=offsets[1:])
+    return genCellArray(offsets, numpy.nonzero(valid.ravel())[0])
+
+
+class LRUCache(object):
+    '''
+    Least recently used cache. Entries are evicted when the sum of
+    sizeFunction(value) over all entries exceeds maxSize (sizeFunction
+    defaults to counting entries). Setting enabled to False or maxSize
+    to 0 turns the cache off.
+    '''
+
+    def __init__(self, maxSize, sizeFunction=None):
+        self.enabled = True
+        self.maxSize = maxSize
+        self.sizeFunction = sizeFunction if sizeFunction else lambda value: 1
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        if not self.enabled or key not in self._entries:
+            self.misses += 1
+            return default
+        self.hits += 1
+        # move the entry at the end, it is the most recently used
+        value, size = self._entries.pop(key)
+        self._entries[key] = (value, size)
+        return value
+
+    def put(self, key, value):
+        if not self.enabled or self.maxSize <= 0:
+            return
+        size = self.sizeFunction(value)
+        if size > self.maxSize:
+            return
+        if key in self._entries:
+            self._size -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self._size += size
+        while self._size > self.maxSize:
+            self._size -= self._entries.popitem(last=False)[1][1]
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+# Projected (and wrapped) grid geometry built by genGrid, so that plotting
+# new data on the same grid only swaps the attribute arrays.
+# The size is in kibibytes, use gridCache.enabled = False to turn it off.
+gridCache = LRUCache(256 * 1024, sizeFunction=lambda entry: entry[0].GetActualMemorySize())
+
+
+def getProjectionKey(projection):
+    '''
+    Returns a hashable key describing the state of the projection.
+    '''
+    parameters = projection.parameters
+    if isinstance(parameters, dict):
+        # proj4 parameters
+        parameters = tuple(sorted(parameters.items()))
+    else:
+        parameters = tuple(numpy.ravel(parameters).tolist())
+    return (projection.type, parameters)
+
+
+def getGridCacheKey(m3, vg, g, cellData, projection, wrap, wc, dualGrid, pedigreeIds):
+    '''
+    Returns the gridCache key for the grid points m3 and the structure of vg
+    plotted with projection, wrap and wc.
+    '''
+    points = numpy.ascontiguousarray(numpy.ma.getdata(m3), dtype=numpy.float64)
+    if vg.IsA("vtkStructuredGrid"):
+        structure = vg.GetExtent()
+    else:
+        structure = vg.GetNumberOfCells()
+    return (hashlib.sha1(points).hexdigest(), points.shape, vg.GetClassName(),
+            structure, type(g).__name__, cellData, getProjectionKey(projection),
+            tuple(wrap) if wrap is not None else None,
+            tuple(wc), dualGrid, pedigreeIds)
+
+
+def copyGridGeometry(grid):
+    '''
+    Returns a shallow copy of grid without its scalars and vectors.
+    '''
+    copy = grid.NewInstance()
+    copy.ShallowCopy(grid)
+    for attributes in [copy.GetCellData(), copy.GetPointData()]:
+        for array in [attributes.GetScalars(), attributes.GetVectors()]:
+            if array:
+                attributes.RemoveArray(array.GetName())
+    return copy
+
+
+def genQuadCells(nx, ny):
+    '''
+    Returns a vtkCellArray with the (nx - 1) * (ny - 1) quads of a
+    nx * ny lattice of points (x varies fastest), in vtkStructuredGrid
+    cell order.
+    '''
+    corner = numpy.arange(nx * (ny - 1)).reshape((ny - 1, nx))[:, :-1].ravel()
+    pointIds = numpy.stack([corner, corner + 1, corner + nx + 1, corner + nx], axis=1)
+    offsets = numpy.arange(len(corner) + 1, dtype=numpy.int64) * 4
+    return genCellArray(offsets, pointIds.ravel())
 
 
 def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
-            dualGrid=False):
+            dualGrid=False, pedigreeIds=True):
+    '''
+    Creates the vtk grid for data1 (and data2 for meshfill meshes or vectors).
+    If pedigreeIds is False, PedigreeIds are only added when the
+    grid is wrapped or is not a structured grid, as setArray and
+    putMaskOnVTKGrid need them only when the grid was modified.
+    Wrapped rectilinear grids are built as quads polydata directly.
+    '''
     continents = False
     wrap = None
     m3 = None
@@ -477,6 +856,7 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
                 numberOfCells = m.shape[0]
                 # For vtk we need to reorder things
                 m2 = numpy.ascontiguousarray(numpy.transpose(m, (0, 2, 1)))
+                nVertices = m2.shape[-2]
                 m2.resize((m2.shape[0] * m2.shape[1], m2.shape[2]))
                 m2 = m2[..., ::-1]
                 # here we add dummy levels, might want to reconsider converting
@@ -511,15 +891,8 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
     if m3 is not None:
         # Create unstructured grid points
         vg = vtk.vtkUnstructuredGrid()
-        for i in range(numberOfCells):
-            pt_ids = []
-            for j in range(nVertices):
-                indx = i * nVertices + j
-                if not numpy.isnan(m3[indx][0]):  # missing value means skip vertex
-                    pt_ids.append(indx)
-            vg.InsertNextCell(vtk.VTK_POLYGON,
-                              len(pt_ids),
-                              pt_ids)
+        vg.SetCells(vtk.VTK_POLYGON,
+                    genPolygonCells(m3, numberOfCells, nVertices))
     else:
         # Ok a simple structured grid is enough
         if grid is None:
@@ -587,7 +960,14 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
             lon = lon3[numpy.newaxis, :] * \
                 numpy.ones(lat3.shape)[:, numpy.newaxis]
         if grid is None:
-            vg.SetDimensions(lat.shape[1], lat.shape[0], 1)
+            if (wrap is not None and lat.shape[0] > 1 and lat.shape[1] > 1 and
+                    not isinstance(g, cdms2.hgrid.AbstractCurveGrid)):
+                # rectilinear grid that is wrapped: doWrapData needs polydata,
+                # so we build the quads directly.
+                vg = vtk.vtkPolyData()
+                vg.SetPolys(genQuadCells(lat.shape[1], lat.shape[0]))
+            else:
+                vg.SetDimensions(lat.shape[1], lat.shape[0], 1)
             lon = numpy.ma.ravel(lon)
             lat = numpy.ma.ravel(lat)
             sh = list(lat.shape)
@@ -609,6 +989,28 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
                     ym = lat.min()
                     yM = lat.max()
 
+    cachedGrid = None
+    if grid is None:
+        # We use the zooming feature for linear and polar projections
+        # We use plotting coordinates for doing the projection
+        # such that parameters such that central meridian are set correctly
+        if (gm.g_name == 'Gfm'):
+            # axes are not lon/lat for meshfill
+            wc = [gm.datawc_x1, gm.datawc_x2, gm.datawc_y1, gm.datawc_y2]
+        else:
+            wc = vcs.utils.getworldcoordinates(gm,
+                                               data1.getAxis(-1),
+                                               data1.getAxis(-2))
+        if gridCache.enabled:
+            cacheKey = getGridCacheKey(m3, vg, g, cellData, projection, wrap, wc,
+                                       dualGrid, pedigreeIds)
+            cachedGrid = gridCache.get(cacheKey)
+        if cachedGrid is not None:
+            # same grid, wrapping and projection: reuse the geometry
+            # and only set the new attribute on it.
+            cachedVg, xm, xM, ym, yM, geo = cachedGrid
+            vg = copyGridGeometry(cachedVg)
+
     # attribute data
     gridForAttribute = grid if grid else vg
     if genVectors:
@@ -621,12 +1023,23 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
         attributes = gridForAttribute.GetCellData()
     else:
         attributes = gridForAttribute.GetPointData()
+    if cachedGrid is not None:
+        pedigreeId = attributes.GetPedigreeIds()
+        if pedigreeId:
+            name = attribute.GetName()
+            attribute = numpy_to_vtk_wrapper(
+                VN.vtk_to_numpy(attribute)[VN.vtk_to_numpy(pedigreeId)], deep=False)
+            attribute.SetName(name)
     if genVectors:
         attributes.SetVectors(attribute)
     else:
         attributes.SetScalars(attribute)
 
-    if grid is None:
+    if cachedGrid is not None:
+        # hidden (not projectable) points get the minimum visible value
+        if (vg.GetExtentType() == vtk.VTK_PIECES_EXTENT):
+            removeHiddenPointsOrCells(vg, celldata=False)
+    elif grid is None:
         # First create the points/vertices (in vcs terms)
         pts = vtk.vtkPoints()
         # Convert nupmy array to vtk ones
@@ -636,32 +1049,21 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
         xRange = ptsBounds[1] - ptsBounds[0]
         xm, xM, ym, yM, tmp, tmp2 = pts.GetBounds()
 
-        # We use the zooming feature for linear and polar projections
-        # We use plotting coordinates for doing the projection
-        # such that parameters such that central meridian are set correctly
-        if (gm.g_name == 'Gfm'):
-            # axes are not lon/lat for meshfill
-            wc = [gm.datawc_x1, gm.datawc_x2, gm.datawc_y1, gm.datawc_y2]
-        else:
-            wc = vcs.utils.getworldcoordinates(gm,
-                                               data1.getAxis(-1),
-                                               data1.getAxis(-2))
-
         vg.SetPoints(pts)
         # index into the scalar array. Used for upgrading
         # the scalar after wrapping. Note this will work
         # correctly only for cell data. For point data
         # the indexes for points on the border will be incorrect after
         # wrapping
-        pedigreeId = vtk.vtkIntArray()
-        pedigreeId.SetName("PedigreeIds")
-        pedigreeId.SetNumberOfTuples(attribute.GetNumberOfTuples())
-        for i in range(0, attribute.GetNumberOfTuples()):
-            pedigreeId.SetValue(i, i)
-        if cellData:
-            vg.GetCellData().SetPedigreeIds(pedigreeId)
-        else:
-            vg.GetPointData().SetPedigreeIds(pedigreeId)
+        # A structured grid that is not wrapped keeps its points and
+        # cells, so the ids are only needed if the caller asks for them.
+        if (pedigreeIds or wrap is not None or
+                not vg.IsA("vtkStructuredGrid")):
+            pedigreeId = genIdArray(attribute.GetNumberOfTuples(), "PedigreeIds")
+            if cellData:
+                vg.GetCellData().SetPedigreeIds(pedigreeId)
+            else:
+                vg.GetPointData().SetPedigreeIds(pedigreeId)
 
         if (isinstance(g, cdms2.hgrid.TransientCurveGrid) and
                 xRange > 360 and not numpy.isclose(xRange, 360)):
@@ -683,20 +1085,7 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
         ghost = vg.AllocatePointGhostArray()
         if (setInfToValid(geopts, ghost)):
             # if there are hidden points, we recompute the bounds
-            xm = ym = sys.float_info.max
-            xM = yM = - sys.float_info.max
-            for i in range(pts.GetNumberOfPoints()):
-                if (ghost.GetValue(i) & vtk.vtkDataSetAttributes.HIDDENPOINT == 0):
-                    # point not hidden
-                    p = pts.GetPoint(i)
-                    if (p[0] < xm):
-                        xm = p[0]
-                    if (p[0] > xM):
-                        xM = p[0]
-                    if (p[1] < ym):
-                        ym = p[1]
-                    if (p[1] > yM):
-                        yM = p[1]
+            xm, xM, ym, yM = getVisibleBounds(pts, ghost)
             debugMsg('bounds after removing infs = [xm, xM, ym, yM] = [{0}, {1}, {2}, {3}]'.format(xm, xM, ym, yM))
             # hidden point don't work for polys or unstructured grids.
             # We remove the cells in this case.
@@ -705,12 +1094,13 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
 
         # Sets the vertics into the grid
         vg.SetPoints(geopts)
+        if gridCache.enabled:
+            gridCache.put(cacheKey, (copyGridGeometry(vg), xm, xM, ym, yM, geo))
     else:
         xm, xM, ym, yM, tmp, tmp2 = grid.GetPoints().GetBounds()
         vg = grid
     # Add a GlobalIds array to keep track of cell ids throughout the pipeline
-    globalIds = numpy_to_vtk_wrapper(numpy.arange(0, vg.GetNumberOfCells()), deep=True)
-    globalIds.SetName('GlobalIds')
+    globalIds = genIdArray(vg.GetNumberOfCells(), 'GlobalIds')
     vg.GetCellData().SetGlobalIds(globalIds)
 
     out = {"vtk_backend_grid": vg,
@@ -730,60 +1120,152 @@ def genGrid(data1, data2, gm, deep=True, grid=None, geo=None, genVectors=False,
 
 # Continents first
 # Try to save time and memorize these continents
+# Parsed continents per (file, modification time, axis convert functions)
 vcsContinents = {}
+# Wrapped and projected continents, see prepProjectedContinents
+continentsCache = LRUCache(32)
+
+
+def getContinentsKey(fnm, xConvertFunction, yConvertFunction):
+    return (fnm, os.path.getmtime(fnm), xConvertFunction, yConvertFunction)
 
 
 def prepContinents(fnm, xConvertFunction=lambda x: x, yConvertFunction=lambda y: y):
     """ This converts vcs continents files to vtkpolydata
     Author: Charles Doutriaux
     Input: vcs continent file name
+    The file is parsed once, later calls return a shallow copy
+    of the memorized polydata.
     """
+    key = getContinentsKey(fnm, xConvertFunction, yConvertFunction)
+    if key not in vcsContinents:
+        vcsContinents[key] = readContinents(fnm, xConvertFunction, yConvertFunction)
     poly = vtk.vtkPolyData()
-    cells = vtk.vtkCellArray()
-    pts = vtk.vtkPoints()
+    poly.ShallowCopy(vcsContinents[key])
+    return poly
+
+
+def prepProjectedContinents(fnm, projection, wc, xConvertFunction=lambda x: x,
+                            yConvertFunction=lambda y: y):
+    """ Returns the continents in fnm wrapped and clipped to wc and projected.
+    The result is memorized per (file, axis convert functions, projection, wc),
+    the caller gets a shallow copy it can add arrays to.
+    """
+    if isinstance(projection, str):
+        projection = vcs.elements["projection"][projection]
+    key = (getContinentsKey(fnm, xConvertFunction, yConvertFunction),
+           getProjectionKey(projection), tuple(wc))
+    contData = continentsCache.get(key)
+    if contData is None:
+        contData = prepContinents(fnm, xConvertFunction, yConvertFunction)
+        contData = doWrapData(contData, wc, fastClip=False)
+        if projection.type != "linear":
+            # we use plotting coordinates for doing the projection so
+            # that parameters such that central meridian are set correctly.
+            _, gcpts = project(contData.GetPoints(), projection, wc)
+            contData.SetPoints(gcpts)
+        continentsCache.put(key, contData)
+    poly = vtk.vtkPolyData()
+    poly.ShallowCopy(contData)
+    return poly
+
+
+def readContinentsText(fnm):
+    """ Parses a vcs continents text file.
+    Returns (points, offsets) numpy arrays: the (latitude, longitude)
+    pairs of line i are points[offsets[i]:offsets[i + 1]]
+    """
+    values = []
+    offsets = [0]
     f = open(fnm)
     ln = f.readline()
     while ln.strip().split() != ["-99", "-99"]:
         # Many lines, need to know number of points
         N = int(ln.split()[0])
-        # Now create and store these points
-        n = 0
-        npts = pts.GetNumberOfPoints()
-        while n < N:
+        # Now read these points
+        lineValues = []
+        while len(lineValues) < N:
             ln = str(f.readline())
             sp = ln.split()
-            sn = len(sp)
             didIt = False
-            if sn % 2 == 0:
+            if len(sp) % 2 == 0:
                 try:
-                    spts = []
-                    for i in range(sn // 2):
-                        l, L = float(sp[i * 2]), float(sp[i * 2 + 1])
-                        spts.append([l, L])
-                    for p in spts:
-                        x = xConvertFunction(p[1])
-                        y = yConvertFunction(p[0])
-                        pts.InsertNextPoint(x, y, 0.)
-                    n += sn
+                    lineValues += [float(v) for v in sp]
                     didIt = True
                 except Exception:
                     didIt = False
             if didIt is False:
                 while len(ln) > 2:
-                    l, L = float(ln[:8]), float(ln[8:16])
-                    x = xConvertFunction(L)
-                    y = yConvertFunction(l)
-                    pts.InsertNextPoint(x, y, 0.)
+                    lineValues += [float(ln[:8]), float(ln[8:16])]
                     ln = ln[16:]
-                    n += 2
-        ln = vtk.vtkPolyLine()
-        ln.GetPointIds().SetNumberOfIds(N // 2)
-        for i in range(N // 2):
-            ln.GetPointIds().SetId(i, i + npts)
-        cells.InsertNextCell(ln)
+        # the line uses its first N // 2 points
+        values += lineValues[:N // 2 * 2]
+        offsets.append(len(values) // 2)
         ln = f.readline()
+    f.close()
+    points = numpy.array(values, dtype=numpy.float64).reshape((-1, 2))
+    return points, numpy.array(offsets, dtype=numpy.int64)
+
+
+def getContinentsFingerprint(fnm):
+    """ Returns the fingerprint (size and sha1 of the content) of the vcs
+    continents text file fnm, it is stored in the binary sidecar.
+    """
+    with open(fnm, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return "%d:%s" % (os.path.getsize(fnm), digest)
+
+
+def readContinentsBinary(fnm, fingerprint=None):
+    """ Reads the (points, offsets) arrays of a continents sidecar
+    file written by writeContinentsBinary.
+    If fingerprint is given, returns None when the sidecar was written
+    from a different text file (see getContinentsFingerprint).
+    """
+    # members are stored uncompressed, so they are read in one go
+    sidecar = numpy.load(fnm)
+    try:
+        if fingerprint is not None and (
+                "fingerprint" not in sidecar.files or str(sidecar["fingerprint"]) != fingerprint):
+            return None
+        return sidecar["points"], sidecar["offsets"]
+    finally:
+        sidecar.close()
+
+
+def writeContinentsBinary(fnm, sidecar=None):
+    """ Writes the binary sidecar (fnm + '.npz' by default) of the vcs
+    continents text file fnm. readContinents reads the sidecar instead
+    of the text file when it exists and was written from the same content.
+    """
+    if sidecar is None:
+        sidecar = fnm + ".npz"
+    points, offsets = readContinentsText(fnm)
+    with open(sidecar, "wb") as f:
+        numpy.savez(f, points=points, offsets=offsets,
+                    fingerprint=numpy.array(getContinentsFingerprint(fnm)))
+    return sidecar
+
+
+def readContinents(fnm, xConvertFunction=lambda x: x, yConvertFunction=lambda y: y):
+    """ Reads a vcs continents file (or its binary sidecar) into a vtkpolydata
+    The sidecar is ignored if it was not written from the current text file.
+    """
+    sidecar = fnm + ".npz"
+    arrays = None
+    if os.path.exists(sidecar):
+        arrays = readContinentsBinary(sidecar, getContinentsFingerprint(fnm))
+    if arrays is None:
+        arrays = readContinentsText(fnm)
+    points, offsets = arrays
+    xyz = numpy.zeros((len(points), 3))
+    xyz[:, 0] = xConvertFunction(points[:, 1])
+    xyz[:, 1] = yConvertFunction(points[:, 0])
+    pts = vtk.vtkPoints()
+    pts.SetData(numpy_to_vtk_wrapper(xyz, deep=False))
+    poly = vtk.vtkPolyData()
     poly.SetPoints(pts)
-    poly.SetLines(cells)
+    poly.SetLines(genCellArray(offsets, numpy.arange(len(points))))
 
     # The dataset has some duplicate lines that extend
     # outside of x=[-180, 180],
@@ -858,13 +1340,22 @@ def apply_proj_parameters(pd, projection, x1, x2, y1, y2):
             pd.SetOptionalParameter('lat_2', str(standardparallel2))
 
 
-def projectArray(w, projection, wc, geo=None):
-    x1, x2, y1, y2 = wc
+# vtkGeoTransform per (projection type and parameters, world coordinates)
+geoTransformCache = LRUCache(64)
+
+
+def getGeoTransform(projection, wc):
+    '''
+    Returns the vtkGeoTransform from lon/lat to projection for the
+    world coordinates wc. Transforms are shared between calls: they are
+    cached on the projection type and parameters, so a modified projection
+    gets a new transform.
+    '''
     if isinstance(projection, str):
         projection = vcs.elements["projection"][projection]
-    if projection.type == "linear":
-        return None, w
-
+    x1, x2, y1, y2 = [float(v) for v in wc]
+    key = (getProjectionKey(projection), (x1, x2, y1, y2))
+    geo = geoTransformCache.get(key)
     if geo is None:
         geo = vtk.vtkGeoTransform()
         ps = vtk.vtkGeoProjection()
@@ -874,30 +1365,68 @@ def projectArray(w, projection, wc, geo=None):
 
         geo.SetSourceProjection(ps)
         geo.SetDestinationProjection(pd)
+        geoTransformCache.put(key, geo)
+    return geo
+
 
-    for i in range(0, w.GetNumberOfTuples()):
-        tuple = [0, 0, 0]
-        w.GetTypedTuple(i, tuple)
-        geo.TransformPoint(tuple, tuple)
-        w.SetTypedTuple(i, tuple)
+def projectArray(w, projection, wc, geo=None):
+    if isinstance(projection, str):
+        projection = vcs.elements["projection"][projection]
+    if projection.type == "linear":
+        return None, w
+
+    if geo is None:
+        geo = getGeoTransform(projection, wc)
+
+    # transform all the tuples at once
+    values = VN.vtk_to_numpy(w).reshape((w.GetNumberOfTuples(), -1))
+    numberOfComponents = min(values.shape[1], 3)
+    xyz = numpy.zeros((len(values), 3))
+    xyz[:, :numberOfComponents] = values[:, :numberOfComponents]
+    pts = vtk.vtkPoints()
+    pts.SetData(numpy_to_vtk_wrapper(xyz, deep=False))
+    geopts = vtk.vtkPoints()
+    geo.TransformPoints(pts, geopts)
+    geoxyz = VN.vtk_to_numpy(geopts.GetData())
+    values[:, :numberOfComponents] = geoxyz[:, :numberOfComponents]
+    w.Modified()
+    return geo, w
+
+
+def project_numpy(x, y, projection, wc, geo=None):
+    '''
+    Projects the lon/lat numpy arrays (or sequences) x and y with projection
+    for the world coordinates wc. Returns the projected (x, y) arrays, with
+    the shape of x. Points that cannot be projected are returned as inf.
+    '''
+    x = numpy.asarray(x, dtype=numpy.float64)
+    y = numpy.asarray(y, dtype=numpy.float64)
+    if isinstance(projection, str):
+        projection = vcs.elements["projection"][projection]
+    if projection.type == "linear":
+        return x.copy(), y.copy()
+    if geo is None:
+        geo = getGeoTransform(projection, wc)
+    xyz = numpy.zeros((x.size, 3))
+    xyz[:, 0] = x.ravel()
+    xyz[:, 1] = y.ravel()
+    pts = vtk.vtkPoints()
+    pts.SetData(numpy_to_vtk_wrapper(xyz, deep=False))
+    geopts = vtk.vtkPoints()
+    geo.TransformPoints(pts, geopts)
+    geoxyz = VN.vtk_to_numpy(geopts.GetData())
+    return (geoxyz[:, 0].reshape(x.shape).astype(numpy.float64),
+            geoxyz[:, 1].reshape(x.shape).astype(numpy.float64))
 
 
 # Geo projection
 def project(pts, projection, wc, geo=None):
-    x1, x2, y1, y2 = wc
     if isinstance(projection, str):
         projection = vcs.elements["projection"][projection]
     if projection.type == "linear":
         return None, pts
     if geo is None:
-        geo = vtk.vtkGeoTransform()
-        ps = vtk.vtkGeoProjection()
-        pd = vtk.vtkGeoProjection()
-
-        apply_proj_parameters(pd, projection, x1, x2, y1, y2)
-
-        geo.SetSourceProjection(ps)
-        geo.SetDestinationProjection(pd)
+        geo = getGeoTransform(projection, wc)
     geopts = vtk.vtkPoints()
     geo.TransformPoints(pts, geopts)
     return geo, geopts
@@ -1099,10 +1628,16 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
     debugMsg('  wrap = {0}'.format(wrap))
 
     # convert to poly data
-    surface = vtk.vtkDataSetSurfaceFilter()
-    surface.SetInputData(data)
-    surface.Update()
-    data = surface.GetOutput()
+    if data.IsA("vtkPolyData"):
+        # the active attributes are changed below, don't change data's
+        polyData = vtk.vtkPolyData()
+        polyData.ShallowCopy(data)
+        data = polyData
+    else:
+        surface = vtk.vtkDataSetSurfaceFilter()
+        surface.SetInputData(data)
+        surface.Update()
+        data = surface.GetOutput()
     bounds = data.GetBounds()
     # insure that GLOBALIDS are not removed by the append filter
     attributes = data.GetCellData()
@@ -1135,9 +1670,6 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
         else:
             ymx = bounds[3]
 
-    appendFilter = vtk.vtkAppendPolyData()
-    appendFilter.AddInputData(data)
-    appendFilter.Update()
     # X axis wrappping
     Amn, Amx = bounds[0], bounds[1]
     nX = [0, 0]  # number of translations needed (neg and pos)
@@ -1160,6 +1692,51 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
 
     nNeg = -max(nX[0], nY[0])  # Number of negative translation needed
     nPos = max(nX[1], nY[1]) + 1  # Number of negative translation needed
+    bounds = [xmn, xmx, ymn, ymx, -1.0, 1.0]
+    if fastClip:
+        result = extractWrappedData(data, wrap, nNeg, nPos, bounds)
+    else:
+        result = appendAndClipWrappedData(data, wrap, nNeg, nPos, bounds)
+    if (globalIdsName):
+        attributes = result.GetCellData()
+        index = vtk.mutable(-1)
+        attributes.GetArray(globalIdsName, index)
+        attributes.SetActiveAttribute(index, vtk.vtkDataSetAttributes.GLOBALIDS)
+    if (vectorsName):
+        index = vtk.mutable(-1)
+        pointAttributes = result.GetPointData()
+        pointAttributes.GetArray(vectorsName, index)
+        pointAttributes.SetActiveAttribute(index, vtk.vtkDataSetAttributes.VECTORS)
+    debugMsg('  bounds after wrap = {0}'.format(result.GetBounds()))
+    return result
+
+
+def extractWrappedData(data, wrap, nNeg, nPos, bounds):
+    '''
+    doWrapData fast path: extracts the cells with a point in the final
+    window (bounds) for all the translations by the wrap modulos from nNeg
+    to nPos - 1 at once, without copying the whole mesh.
+    '''
+    # A 0 wrap modulo gives the same translation several times,
+    # it is used only once.
+    translations = [(0., 0.)]
+    for i in range(nNeg, nPos):
+        for j in range(nNeg, nPos):
+            translation = (i * wrap[1], j * wrap[0])
+            if translation not in translations:
+                translations.append(translation)
+    return extractWrappedCells(data, translations, bounds)
+
+
+def appendAndClipWrappedData(data, wrap, nNeg, nPos, bounds):
+    '''
+    doWrapData legacy path: appends the copies of data translated by the
+    wrap modulos from nNeg to nPos - 1 and clips them to the final window
+    (bounds).
+    '''
+    appendFilter = vtk.vtkAppendPolyData()
+    appendFilter.AddInputData(data)
+    appendFilter.Update()
     # Negative translation
     for i in range(nNeg, nPos):
         for j in range(nNeg, nPos):
@@ -1176,32 +1753,85 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
 
     # Clip the data to the final window:
     clipBox = vtk.vtkBox()
-    clipBox.SetXMin(xmn, ymn, -1.0)
-    clipBox.SetXMax(xmx, ymx, 1.0)
-    if fastClip:
-        clipper = vtk.vtkExtractPolyDataGeometry()
-        clipper.ExtractInsideOn()
-        clipper.SetImplicitFunction(clipBox)
-        clipper.ExtractBoundaryCellsOn()
-        clipper.PassPointsOff()
-    else:
-        clipper = vtk.vtkClipPolyData()
-        clipper.InsideOutOn()
-        clipper.SetClipFunction(clipBox)
+    clipBox.SetXMin(bounds[0], bounds[2], bounds[4])
+    clipBox.SetXMax(bounds[1], bounds[3], bounds[5])
+    clipper = vtk.vtkClipPolyData()
+    clipper.InsideOutOn()
+    clipper.SetClipFunction(clipBox)
     clipper.SetInputConnection(appendFilter.GetOutputPort())
     clipper.Update()
-    result = clipper.GetOutput()
-    if (globalIdsName):
-        attributes = result.GetCellData()
-        index = vtk.mutable(-1)
-        attributes.GetArray(globalIdsName, index)
-        attributes.SetActiveAttribute(index, vtk.vtkDataSetAttributes.GLOBALIDS)
-    if (vectorsName):
-        index = vtk.mutable(-1)
-        pointAttributes = result.GetPointData()
-        pointAttributes.GetArray(vectorsName, index)
-        pointAttributes.SetActiveAttribute(index, vtk.vtkDataSetAttributes.VECTORS)
-    debugMsg('  bounds after wrap = {0}'.format(result.GetBounds()))
+    return clipper.GetOutput()
+
+
+def extractWrappedCells(data, translations, bounds):
+    '''
+    Returns the cells of the polydata 'data' translated by each (dx, dy)
+    in translations that have at least one point inside
+    bounds = [xmin, xmax, ymin, ymax, zmin, zmax]. This is what
+    vtkExtractPolyDataGeometry (with ExtractBoundaryCells on and PassPoints off)
+    returns for the append of the translated copies, but only the selected
+    cells and their points are copied. Point and cell arrays (GlobalIds and
+    PedigreeIds included) follow the points and cells.
+    '''
+    if data.GetNumberOfPoints() == 0:
+        return data
+    xmn, xmx, ymn, ymx, zmn, zmx = bounds
+    pts = VN.vtk_to_numpy(data.GetPoints().GetData())
+    cellArrays = [getCellArrayOffsets(cells) for cells in
+                  [data.GetVerts(), data.GetLines(), data.GetPolys(), data.GetStrips()]]
+    # cell ids of the first cell of each type
+    firstCellId = numpy.cumsum([0] + [len(offsets) - 1 for offsets, _ in cellArrays])
+    insideZ = (pts[:, 2] >= zmn) & (pts[:, 2] <= zmx)
+    newPoints = []
+    pointIds = []
+    numberOfPoints = 0
+    counts = [[] for _ in cellArrays]
+    connectivities = [[] for _ in cellArrays]
+    cellIds = [[] for _ in cellArrays]
+    for dx, dy in translations:
+        x = pts[:, 0] + dx
+        y = pts[:, 1] + dy
+        inside = insideZ & (x >= xmn) & (x <= xmx) & (y >= ymn) & (y <= ymx)
+        keepCells = []
+        usedPoint = numpy.zeros(len(pts), dtype=bool)
+        for offsets, connectivity in cellArrays:
+            insideCount = numpy.zeros(len(connectivity) + 1, dtype=numpy.int64)
+            numpy.cumsum(inside[connectivity], out=insideCount[1:])
+            keep = insideCount[offsets[1:]] > insideCount[offsets[:-1]]
+            keepPoint = numpy.repeat(keep, numpy.diff(offsets))
+            usedPoint[connectivity[keepPoint]] = True
+            keepCells.append((keep, keepPoint))
+        used = numpy.nonzero(usedPoint)[0]
+        newId = numpy.zeros(len(pts), dtype=numpy.int64)
+        newId[used] = numpy.arange(numberOfPoints, numberOfPoints + len(used))
+        numberOfPoints += len(used)
+        newPoints.append(pts[used] + numpy.array([dx, dy, 0.]))
+        pointIds.append(used)
+        for k, (offsets, connectivity) in enumerate(cellArrays):
+            keep, keepPoint = keepCells[k]
+            counts[k].append(numpy.diff(offsets)[keep])
+            connectivities[k].append(newId[connectivity[keepPoint]])
+            cellIds[k].append(numpy.nonzero(keep)[0] + firstCellId[k])
+
+    result = vtk.vtkPolyData()
+    points = vtk.vtkPoints()
+    points.SetData(numpy_to_vtk_wrapper(numpy.concatenate(newPoints).astype(pts.dtype),
+                                        deep=True))
+    result.SetPoints(points)
+    newCellArrays = []
+    for k in range(len(cellArrays)):
+        count = numpy.concatenate(counts[k])
+        offsets = numpy.zeros(len(count) + 1, dtype=numpy.int64)
+        numpy.cumsum(count, out=offsets[1:])
+        newCellArrays.append(genCellArray(offsets, numpy.concatenate(connectivities[k])))
+    result.SetVerts(newCellArrays[0])
+    result.SetLines(newCellArrays[1])
+    result.SetPolys(newCellArrays[2])
+    result.SetStrips(newCellArrays[3])
+    result.GetPointData().ShallowCopy(data.GetPointData())
+    extractTuples(result.GetPointData(), numpy.concatenate(pointIds))
+    result.GetCellData().ShallowCopy(data.GetCellData())
+    extractTuples(result.GetCellData(), numpy.concatenate([numpy.concatenate(ids) for ids in cellIds]))
     return result
 
 
@@ -1312,6 +1942,13 @@ def setClipPlanes(mapper, xmin, xmax, ymin, ymax):
 #     return clp.GetOutput()
 
 
+# Prepared text properties, keyed on the resolved state of the texttable,
+# textorientation, colormap and window size (see prepTextProperty).
+# Modifying one of these elements changes the key, so a stale property
+# is never used.
+textPropertyCache = LRUCache(256)
+
+
 def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
                      overrideColorIndex=None):
     if isinstance(to, str):
@@ -1330,63 +1967,154 @@ def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
         c = cmap.index[colorIndex]
     else:
         c = colorIndex
-    p.SetColor([C / 100. for C in c[:3]])
-    p.SetOpacity(c[-1] / 100.)
     bcolorIndex = tt.backgroundcolor if tt.backgroundcolor else 255
     if isinstance(bcolorIndex, int):
         bc = cmap.index[bcolorIndex]
     else:
         bc = bcolorIndex
-    p.SetBackgroundColor([C / 100. for C in bc[:3]])
     bopacity = (tt.backgroundopacity / 100.) if tt.backgroundopacity else 0
-    p.SetBackgroundOpacity(bopacity)
-    if to.halign in [0, 'left']:
-        p.SetJustificationToLeft()
-    elif to.halign in [2, 'right']:
-        p.SetJustificationToRight()
-    elif to.halign in [1, 'center']:
-        p.SetJustificationToCentered()
-
-    p.SetOrientation(-to.angle)
-
-    if to.valign in [0, 'top']:
-        p.SetVerticalJustificationToTop()
-    elif to.valign in [2, 'half']:
-        p.SetVerticalJustificationToCentered()
-    elif to.valign in [4, 'bottom']:
-        p.SetVerticalJustificationToBottom()
-    elif to.valign in [1, 'cap']:
-        warnings.warn("VTK does not support 'cap' align, using 'top'")
-        p.SetVerticalJustificationToTop()
-    elif to.valign in [3, 'base']:
-        warnings.warn("VTK does not support 'base' align, using 'bottom'")
-        p.SetVerticalJustificationToBottom()
-    p.SetFontFamily(vtk.VTK_FONT_FILE)
-    p.SetFontFile(vcs.elements["font"][vcs.elements["fontNumber"][tt.font]])
-    p.SetFontSize(int(to.height * winSize[1] / 800.))
-
-
-class TextActorWrapperItem(object):
-    def __init__(self, textActor):
-        self.textActor = textActor
+    fontFile = vcs.elements["font"][vcs.elements["fontNumber"][tt.font]]
+    fontSize = int(to.height * winSize[1] / 800.)
+
+    key = (tuple(c), tuple(bc[:3]), bopacity, to.halign, to.valign, to.angle,
+           fontFile, fontSize)
+    prepared = textPropertyCache.get(key)
+    if prepared is None:
+        prepared = vtk.vtkTextProperty()
+        prepared.SetColor([C / 100. for C in c[:3]])
+        prepared.SetOpacity(c[-1] / 100.)
+        prepared.SetBackgroundColor([C / 100. for C in bc[:3]])
+        prepared.SetBackgroundOpacity(bopacity)
+        if to.halign in [0, 'left']:
+            prepared.SetJustificationToLeft()
+        elif to.halign in [2, 'right']:
+            prepared.SetJustificationToRight()
+        elif to.halign in [1, 'center']:
+            prepared.SetJustificationToCentered()
+
+        prepared.SetOrientation(-to.angle)
+
+        if to.valign in [0, 'top']:
+            prepared.SetVerticalJustificationToTop()
+        elif to.valign in [2, 'half']:
+            prepared.SetVerticalJustificationToCentered()
+        elif to.valign in [4, 'bottom']:
+            prepared.SetVerticalJustificationToBottom()
+        elif to.valign in [1, 'cap']:
+            warnings.warn("VTK does not support 'cap' align, using 'top'")
+            prepared.SetVerticalJustificationToTop()
+        elif to.valign in [3, 'base']:
+            warnings.warn("VTK does not support 'base' align, using 'bottom'")
+            prepared.SetVerticalJustificationToBottom()
+        prepared.SetFontFamily(vtk.VTK_FONT_FILE)
+        prepared.SetFontFile(fontFile)
+        prepared.SetFontSize(fontSize)
+        textPropertyCache.put(key, prepared)
+    # callers own p and may modify it, the cached property stays untouched
+    p.ShallowCopy(prepared)
+
+
+# Text bounding boxes measured by getTextBox
+textExtentCache = LRUCache(4096)
+
+
+def getTextBox(string, textProperty, dpi, angle):
+    '''
+    Same as vtk_ui.text.text_box, memorized on the string, the font file,
+    size and justifications of textProperty, the angle and the dpi.
+    '''
+    key = (string, textProperty.GetFontFamily(), textProperty.GetFontFile(), textProperty.GetFontSize(),
+           textProperty.GetJustification(), textProperty.GetVerticalJustification(),
+           angle, dpi)
+    bounds = textExtentCache.get(key)
+    if bounds is None:
+        from .vtk_ui.text import text_box
+        bounds = tuple(text_box(string, textProperty, dpi, angle))
+        textExtentCache.put(key, bounds)
+    return list(bounds)
+
+
+class TextActorsWrapperItem(object):
+    """Paints the strings of a text in a single Paint call.
+
+    Positions, strings and visibilities are stored per string, the text
+    properties as runs: runs[k] = [start, textProperty] applies from string
+    start to the start of the next run (genTextActor gives the same property
+    to all the strings of a text). TextLabel edits one string.
+    """
+
+    def __init__(self, positions, strings, textProperty):
+        self.positions = numpy.array(positions, dtype=numpy.float64).reshape((-1, 2))
+        self.strings = list(strings)
+        self.visible = numpy.ones(len(self.strings), dtype=bool)
+        self.runs = [[0, textProperty]]
+
+    def GetTextProperty(self, index):
+        starts = [run[0] for run in self.runs]
+        return self.runs[bisect.bisect_right(starts, index) - 1][1]
+
+    def SetTextProperty(self, index, textProperty):
+        properties = [self.GetTextProperty(i) for i in range(len(self.strings))]
+        properties[index] = textProperty
+        self.runs = []
+        for i, prop in enumerate(properties):
+            if not self.runs or self.runs[-1][1] is not prop:
+                self.runs.append([i, prop])
 
     def Initialize(self, vtkSelf):
         return True
 
     def Paint(self, vtkSelf, context2D):
-        pos = self.textActor.GetPosition()
-        text = self.textActor.GetInput()
-        textProp = self.textActor.GetTextProperty()
-
-        context2D.ApplyTextProp(textProp)
-        context2D.DrawString(pos[0], pos[1], text)
+        stops = [run[0] for run in self.runs[1:]] + [len(self.strings)]
+        for (start, prop), stop in zip(self.runs, stops):
+            context2D.ApplyTextProp(prop)
+            for i in range(start, stop):
+                if self.visible[i]:
+                    context2D.DrawString(self.positions[i, 0], self.positions[i, 1], self.strings[i])
 
         return False
 
 
+class TextLabel(object):
+    """One string of a TextActorsWrapperItem, with the vtkTextActor
+    accessors the editors use (input, position, text property, visibility).
+    """
+
+    def __init__(self, item, index):
+        self.item = item
+        self.index = index
+
+    def GetInput(self):
+        return self.item.strings[self.index]
+
+    def SetInput(self, string):
+        self.item.strings[self.index] = string
+
+    def GetPosition(self):
+        return tuple(self.item.positions[self.index].tolist())
+
+    def SetPosition(self, x, y):
+        self.item.positions[self.index] = x, y
+
+    def GetTextProperty(self):
+        return self.item.GetTextProperty(self.index)
+
+    def SetTextProperty(self, textProperty):
+        self.item.SetTextProperty(self.index, textProperty)
+
+    def GetVisibility(self):
+        return int(self.item.visible[self.index])
+
+    def SetVisibility(self, visibility):
+        self.item.visible[self.index] = bool(visibility)
+
+
 # def genTextActor(renderer, string=None, x=None, y=None,
 def genTextActor(contextArea, string=None, x=None, y=None,
                  to='default', tt='default', cmap=None, geoBounds=None, geo=None):
+    """Paints the strings of tt with a single TextActorsWrapperItem added
+    to contextArea. Returns one TextLabel per string.
+    """
 
     renderer = contextArea.GetDrawAreaItem().GetScene().GetRenderer()
 
@@ -1411,73 +2139,89 @@ def genTextActor(contextArea, string=None, x=None, y=None,
             a.append(a[-1])
 
     sz = renderer.GetRenderWindow().GetSize()
-    actors = []
-    pts = vtk.vtkPoints()
+    # all the strings share the same text property
+    p = vtk.vtkTextProperty()
+    prepTextProperty(p, sz, to, tt, cmap)
     if vcs.elements["projection"][tt.projection].type != "linear":
+        # all the positions are projected at once
+        x, y = project_numpy(x[:n], y[:n], tt.projection,
+                             tt.worldcoordinate, geo=geo)
         if geoBounds is not None:
             wc = geoBounds[:4]
         else:
-            wc = None
+            wc = getProjectedWorldCoordsExtent(tt.projection, tt.worldcoordinate, geo=geo)
+    else:
+        wc = tt.worldcoordinate
 
-    for i in range(n):
-        t = vtk.vtkTextActor()
-        p = t.GetTextProperty()
-        prepTextProperty(p, sz, to, tt, cmap)
-        pts = vtk.vtkPoints()
-        pts.InsertNextPoint(x[i], y[i], 0.)
-        if vcs.elements["projection"][tt.projection].type != "linear":
-            _, pts = project(pts, tt.projection, tt.worldcoordinate, geo=geo)
-            X, Y, tz = pts.GetPoint(0)
-            if wc is None:
-                wc = tt.worldcoordinate
-                pts_wc = vtk.vtkPoints()
-                # Scan a bunch of points within wc
-                # In case the proj deformation bring origin close
-                # from each others
-                for wx in numpy.arange(wc[0], wc[1], (wc[1] - wc[0]) / 25.):
-                    for wy in numpy.arange(wc[2], wc[3], (wc[3] - wc[2]) / 25.):
-                        pts_wc.InsertNextPoint(wx, wy, 0.)
-                _, pts_wc = project(pts_wc, tt.projection, tt.worldcoordinate, geo=geo)
-                as_numpy = VN.vtk_to_numpy(pts_wc.GetData())
-                wx = as_numpy[:, 0]
-                wy = as_numpy[:, 1]
-                wc = [wx.min(), wx.max(), wy.min(), wy.max()]
-            X, Y = world2Renderer(renderer, X, Y, tt.viewport, wc)
-        else:
-            X, Y = world2Renderer(
-                renderer, x[i], y[i], tt.viewport, tt.worldcoordinate)
-        t.SetPosition(X, Y)
-        t.SetInput(string[i])
+    X, Y = world2Renderer(renderer, numpy.asarray(x[:n], dtype=numpy.float64),
+                          numpy.asarray(y[:n], dtype=numpy.float64), tt.viewport, wc)
+    wrapper = TextActorsWrapperItem(numpy.column_stack((X, Y)), string[:n], p)
+    item = vtk.vtkPythonItem()
+    item.SetPythonObject(wrapper)
+    contextArea.GetDrawAreaItem().AddItem(item)
 
-        item = vtk.vtkPythonItem()
-        item.SetPythonObject(TextActorWrapperItem(t))
-        contextArea.GetDrawAreaItem().AddItem(item)
+    return [TextLabel(wrapper, i) for i in range(n)]
 
-        actors.append(t)
 
-    return actors
+def isFlatFillarea(prim):
+    """Is prim a fillarea with Coordinates (set from arrays) x and y?"""
+    return vcs.isfillarea(prim) and isinstance(prim.x, Coordinates)
+
+
+def getCoordinatesGroup(coordinates, i):
+    """Returns the values of group i of coordinates (Coordinates or lists)
+    as a numpy array, Coordinates values are not copied."""
+    if isinstance(coordinates, Coordinates):
+        return coordinates.group(i)
+    return numpy.array(coordinates[i], dtype=numpy.float64)
+
+
+def getCoordinatesValues(coordinates):
+    """Returns all the values of coordinates (Coordinates, a list of
+    lists or a list of numbers) as one flat numpy array."""
+    if isinstance(coordinates, Coordinates):
+        return coordinates.values
+    if len(coordinates) and isinstance(coordinates[0], (list, tuple)):
+        return numpy.array([v for group in coordinates for v in group], dtype=numpy.float64)
+    return numpy.array(coordinates, dtype=numpy.float64)
 
 
 def prepPrimitive(prim):
-    if prim.x is None or prim.y is None:
+    if prim.x is None or prim.y is None or len(prim.x) == 0:
         return 0
-    if not isinstance(prim.x[0], (list, tuple)):
-        prim.x = [prim.x, ]
-    if not isinstance(prim.y[0], (list, tuple)):
-        prim.y = [prim.y, ]
-    if vcs.isfillarea(prim):
-        atts = ["x", "y", "color", "style", "index"]
-    elif vcs.ismarker(prim):
-        atts = ["x", "y", "color", "size", "type"]
-    elif vcs.isline(prim):
-        atts = ["x", "y", "color", "width", "type"]
-    n = 0
-    for a in atts:
-        n = max(n, len(getattr(prim, a)))
+    if isFlatFillarea(prim):
+        # one polygon per group, the coordinates are left as they are
+        n = len(prim.x)
+        atts = ["color", "style", "index"]
+    else:
+        if not isinstance(prim.x, Coordinates) and not isinstance(prim.x[0], (list, tuple)):
+            prim.x = [prim.x, ]
+        if not isinstance(prim.y, Coordinates) and not isinstance(prim.y[0], (list, tuple)):
+            prim.y = [prim.y, ]
+        if vcs.isfillarea(prim):
+            atts = ["x", "y", "color", "style", "index"]
+        elif vcs.ismarker(prim):
+            atts = ["x", "y", "color", "size", "type"]
+        else:  # line, or a copy of one (see template.TemplateDecorations)
+            atts = ["x", "y", "color", "width", "type"]
+        n = 0
+        for a in atts:
+            n = max(n, len(getattr(prim, a)))
     for a in atts:
         v = getattr(prim, a)
-        while len(v) < n:
-            v.append(v[-1])
+        if isinstance(v, numpy.ndarray):
+            if len(v) < n:
+                v = numpy.concatenate([v, numpy.repeat(v[-1:], n - len(v))])
+        elif isinstance(v, Coordinates):
+            if len(v) == n:
+                continue
+            # the coordinates are shared with the other primitives using them
+            v = v.copy()
+            while len(v) < n:
+                v.append(v.group(len(v) - 1))
+        else:
+            while len(v) < n:
+                v.append(v[-1])
         setattr(prim, a, v)
 
     # Handle fillarea opacity case, where the default will depend on the style
@@ -1496,13 +2240,73 @@ def prepPrimitive(prim):
     return n
 
 
-def __build_pd__():
+def getPolygonArrays(farea, n):
+    '''
+    Returns the flat numpy arrays x, y of the coordinates of the n polygons
+    of farea and their offsets: polygon i is made of the points
+    offsets[i]:offsets[i + 1].
+    '''
+    if isFlatFillarea(farea):
+        x = getCoordinatesValues(farea.x)
+        y = getCoordinatesValues(farea.y)
+        offsets = farea.x.offsets
+        if not isinstance(farea.y, Coordinates) or \
+                not numpy.array_equal(farea.y.offsets, offsets):
+            raise ValueError("fillarea x and y must have the same polygons")
+    else:
+        for i in range(n):
+            if len(farea.x[i]) != len(farea.y[i]):
+                raise ValueError("fillarea polygon %d has %d x and %d y values" %
+                                 (i, len(farea.x[i]), len(farea.y[i])))
+        sizes = [len(farea.x[i]) for i in range(n)]
+        offsets = numpy.concatenate([[0], numpy.cumsum(sizes, dtype=numpy.int64)])
+        x = numpy.array([v for i in range(n) for v in farea.x[i]], dtype=numpy.float64)
+        y = numpy.array([v for i in range(n) for v in farea.y[i]], dtype=numpy.float64)
+    if len(x) != len(y):
+        raise ValueError("fillarea x and y must have the same number of values")
+    return x, y, offsets
+
+
+def getFillareaColors(farea, cmap, n):
+    '''
+    Returns the (n, 4) unsigned char colors of the n polygons of farea.
+    Patterns are black, the fillarea opacities replace the colors alpha.
+    '''
+    if isinstance(farea.color, numpy.ndarray):
+        # color indices, looked up at once
+        lut = numpy.array([(list(cmap.index[i]) + [100.])[:4] for i in range(256)],
+                          dtype=numpy.float64)
+        rgba = lut[farea.color[:n]]
+    else:
+        rgba = numpy.array([list(cmap.index[c]) if isinstance(c, int) else list(c)
+                            for c in farea.color[:n]], dtype=numpy.float64)
+    rgba[numpy.array(farea.style[:n]) == "pattern"] = (0., 0., 0., 100.)
+    opacities = list(farea.opacity or [])[:n]
+    opacities += [None] * (n - len(opacities))
+    opacities = numpy.array([numpy.nan if o is None else o for o in opacities],
+                            dtype=numpy.float64)
+    rgba[:, 3] = numpy.where(numpy.isnan(opacities), rgba[:, 3], opacities)
+    return (rgba / 100. * 255).astype(numpy.int64).astype(numpy.uint8)
+
+
+def genPolygons(x, y, offsets, keep):
+    '''
+    Returns a polydata with the polygons i selected by keep (a boolean array)
+    made of the points offsets[i]:offsets[i + 1] of x, y.
+    '''
+    sizes = numpy.diff(offsets)
+    keepPoint = numpy.repeat(keep, sizes)
+    # float points, as vtkPoints defaults to
+    xyz = numpy.zeros((keepPoint.sum(), 3), dtype=numpy.float32)
+    xyz[:, 0] = x[keepPoint]
+    xyz[:, 1] = y[keepPoint]
     pts = vtk.vtkPoints()
-    polygons = vtk.vtkCellArray()
+    pts.SetData(numpy_to_vtk_wrapper(xyz, deep=False))
     polygonPolyData = vtk.vtkPolyData()
     polygonPolyData.SetPoints(pts)
-    polygonPolyData.SetPolys(polygons)
-    return pts, polygons, polygonPolyData
+    polygonPolyData.SetPolys(genCellArray(numpy.concatenate([[0], numpy.cumsum(sizes[keep])]),
+                                          numpy.arange(len(xyz))))
+    return polygonPolyData
 
 
 def prepFillarea(context, renWin, farea, cmap=None):
@@ -1554,81 +2358,19 @@ def prepFillarea(context, renWin, farea, cmap=None):
     if isinstance(cmap, str):
         cmap = vcs.elements["colormap"][cmap]
 
-    # Create data structures
-    pts, polygons, polygonPolyData = __build_pd__()
-    colors = vtk.vtkUnsignedCharArray()
-    colors.SetNumberOfComponents(4)
-    colors.SetNumberOfTuples(n)
+    x, y, offsets = getPolygonArrays(farea, n)
+    styles = numpy.array(farea.style[:n])
+    rgba = getFillareaColors(farea, cmap, n)
+
+    # All the "solid" polygons are drawn at once
+    solid = styles == "solid"
+    polygonPolyData = genPolygons(x, y, offsets, solid)
+    colors = VN.numpy_to_vtk(rgba[solid], deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
     colors.SetName("Colors")
     polygonPolyData.GetCellData().SetScalars(colors)
 
-    pattern_polydatas = []
-
-    # Iterate through polygons:
-    for i in range(n):
-        x = farea.x[i]
-        y = farea.y[i]
-        st = farea.style[i]
-        if st == "pattern":
-            c = (0., 0., 0., 100.)
-        else:
-            c = farea.color[i]
-
-        if st == "solid":
-            points, polys, pd, color_arr = pts, polygons, polygonPolyData, colors
-        else:
-            points, polys, pd = __build_pd__()
-            color_arr = vtk.vtkUnsignedCharArray()
-            color_arr.SetNumberOfComponents(4)
-            color_arr.SetNumberOfTuples(1)
-            color_arr.SetName("BackgroundColors")
-            pd.GetCellData().SetScalars(color_arr)
-            pattern_polydatas.append([i, pd])
-
-        N = max(len(x), len(y))
-
-        for a in [x, y]:
-            assert(len(a) == N)
-
-        polygon = vtk.vtkPolygon()
-        # Add current polygon
-        pid = polygon.GetPointIds()
-        pid.SetNumberOfIds(N)
-
-        for j in range(N):
-            pid.SetId(j, points.InsertNextPoint(x[j], y[j], 0.))
-        cellId = polys.InsertNextCell(polygon)
-
-        if isinstance(c, int):
-            color = [C for C in cmap.index[c]]
-        else:
-            color = [C for C in c]
-        if len(farea.opacity) > i:
-            opacity = farea.opacity[i]
-            if opacity is not None:
-                opacity = farea.opacity[i]
-        else:
-            opacity = None
-        # Draw colored background for solid
-        # transparent/white background for hatches/patterns
-        # Add the color to the color array:
-        if opacity is not None:
-            color[-1] = opacity
-        color = [int(C / 100. * 255) for C in color]
-        if st == 'solid':
-            # In this case, colors is our scalar array
-            # so, add the color at the cell index
-            color_arr.SetTypedTuple(cellId, color)
-        else:
-            # In this case, colors is a backup array that represents colors
-            # for the pattern in each polygon. Each tuple in the colors array
-            # should represent the pattern color for the indexed polygon
-            colors.SetTypedTuple(i, color)
-            # color_arr is our scalar array
-            color_arr.SetTypedTuple(cellId, [255, 255, 255, 0])
-
     # Transform points
-    geo, pts = project(pts, farea.projection, farea.worldcoordinate)
+    geo, pts = project(polygonPolyData.GetPoints(), farea.projection, farea.worldcoordinate)
     polygonPolyData.SetPoints(pts)
 
     # for concave polygons
@@ -1649,50 +2391,79 @@ def prepFillarea(context, renWin, farea, cmap=None):
         area.GetDrawAreaItem().AddItem(item)
 
     # Patterns/hatches support
-    for i, pd in pattern_polydatas:
+    patterned = numpy.nonzero(~solid)[0]
+    if len(patterned) == 0:
+        return actors
+    # The polygons with the same style, index and color are patterned
+    # together, lists of polygons are patterned one polygon at a time.
+    keys = [numpy.unique(numpy.array(v[:n]).astype(str)[patterned], return_inverse=True)[1].ravel()
+            for v in (farea.style, farea.index)]
+    keys.append(numpy.ascontiguousarray(rgba[patterned]).view(numpy.uint32).ravel())
+    flat = isFlatFillarea(farea)
+    if not flat:
+        keys.append(patterned)
+    _, firsts, groups = numpy.unique(numpy.column_stack(keys), axis=0,
+                                     return_index=True, return_inverse=True)
+    groups = groups.ravel()
+    # in the order of the polygons
+    for g in numpy.argsort(firsts):
+        i = patterned[firsts[g]]
         st = farea.style[i]
-        if st != "solid":
-            geo, proj_points = project(
-                pd.GetPoints(), farea.projection, farea.worldcoordinate)
-            pd.SetPoints(proj_points)
-
-            cellcolor = [0, 0, 0, 0]
-            colors.GetTypedTuple(i, cellcolor)
-            pcolor = [indC * 100. / 255.0 for indC in cellcolor]
-
-            if len(farea.x[i]) >= 3:
-                screenGeom = [
-                    (farea.x[i][1] - farea.x[i][0]) * renWinWidth,
-                    (farea.y[i][2] - farea.y[i][1]) * renWinHeight
-                ]
-            else:
-                screenGeom = [
-                    (farea.viewport[1] - farea.viewport[0]) * renWinWidth,
-                    (farea.viewport[3] - farea.viewport[2]) * renWinHeight
-                ]
-
-            act = fillareautils.make_patterned_polydata(pd,
-                                                        st,
-                                                        fillareaindex=farea.index[i],
-                                                        fillareacolors=pcolor,
-                                                        fillareaopacity=pcolor[3],
-                                                        fillareapixelspacing=farea.pixelspacing,
-                                                        fillareapixelscale=farea.pixelscale,
-                                                        size=[renWinWidth, renWinHeight],
-                                                        screenGeom=screenGeom)
-            if act is not None:
-                patMapper = act.GetMapper()
-                patMapper.Update()
-                patPoly = patMapper.GetInput()
-
-                item = vtk.vtkPolyDataItem()
-                item.SetPolyData(patPoly)
-
-                item.SetScalarMode(vtk.VTK_SCALAR_MODE_USE_CELL_DATA)
-                colorArray = patPoly.GetCellData().GetArray('Colors')
-
-                item.SetMappedColors(colorArray)
-                area.GetDrawAreaItem().AddItem(item)
+        keep = numpy.zeros(n, dtype=bool)
+        keep[patterned[groups == g]] = True
+        pd = genPolygons(x, y, offsets, keep)
+        backgroundColors = VN.numpy_to_vtk(
+            numpy.tile(numpy.array([255, 255, 255, 0], dtype=numpy.uint8),
+                       (pd.GetNumberOfCells(), 1)),
+            deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
+        backgroundColors.SetName("BackgroundColors")
+        pd.GetCellData().SetScalars(backgroundColors)
+        geo, proj_points = project(
+            pd.GetPoints(), farea.projection, farea.worldcoordinate)
+        pd.SetPoints(proj_points)
+
+        pcolor = [int(indC) * 100. / 255.0 for indC in rgba[i]]
+
+        if flat:
+            # size of the group on screen
+            bounds = pd.GetBounds()
+            screenGeom = [
+                abs((bounds[1] - bounds[0]) / (wc[1] - wc[0])) * geom.GetWidth(),
+                abs((bounds[3] - bounds[2]) / (wc[3] - wc[2])) * geom.GetHeight()
+            ]
+        elif len(farea.x[i]) >= 3:
+            screenGeom = [
+                (farea.x[i][1] - farea.x[i][0]) * renWinWidth,
+                (farea.y[i][2] - farea.y[i][1]) * renWinHeight
+            ]
+        else:
+            screenGeom = [
+                (farea.viewport[1] - farea.viewport[0]) * renWinWidth,
+                (farea.viewport[3] - farea.viewport[2]) * renWinHeight
+            ]
+
+        act = fillareautils.make_patterned_polydata(pd,
+                                                    st,
+                                                    fillareaindex=farea.index[i],
+                                                    fillareacolors=pcolor,
+                                                    fillareaopacity=pcolor[3],
+                                                    fillareapixelspacing=farea.pixelspacing,
+                                                    fillareapixelscale=farea.pixelscale,
+                                                    size=[renWinWidth, renWinHeight],
+                                                    screenGeom=screenGeom)
+        if act is not None:
+            patMapper = act.GetMapper()
+            patMapper.Update()
+            patPoly = patMapper.GetInput()
+
+            item = vtk.vtkPolyDataItem()
+            item.SetPolyData(patPoly)
+
+            item.SetScalarMode(vtk.VTK_SCALAR_MODE_USE_CELL_DATA)
+            colorArray = patPoly.GetCellData().GetArray('Colors')
+
+            item.SetMappedColors(colorArray)
+            area.GetDrawAreaItem().AddItem(item)
 
     return actors
 
@@ -1718,8 +2489,9 @@ def genPoly(coords, pts, filled=True, scale=1.):
     return poly
 
 
-def prepGlyph(g, marker, screenGeom, index=0):
-    t, s = marker.type[index], marker.size[index]
+def prepGlyph(g, marker, screenGeom, index=0, size=None):
+    t = marker.type[index]
+    s = marker.size[index] if size is None else size
     gs = vtk.vtkGlyphSource2D()
     pd = None
 
@@ -1895,14 +2667,19 @@ def prepGlyph(g, marker, screenGeom, index=0):
     return gs, pd
 
 
-def getMarkerColor(marker, c, cmap=None):
-    # Color
+def getMarkerColormap(marker, cmap=None):
     if marker.colormap is not None:
         cmap = marker.colormap
     elif cmap is None:
         cmap = vcs._colorMap
     if isinstance(cmap, str):
         cmap = vcs.elements["colormap"][cmap]
+    return cmap
+
+
+def getMarkerColor(marker, c, cmap=None):
+    # Color
+    cmap = getMarkerColormap(marker, cmap)
     if isinstance(c, int):
         color = cmap.index[c]
     else:
@@ -1913,7 +2690,151 @@ def getMarkerColor(marker, c, cmap=None):
     return retval
 
 
+def getFirstPointIds(polydata):
+    '''
+    Returns the id of the first point of each cell of polydata,
+    in the order of the cells (verts, lines, polys then strips).
+    '''
+    firsts = []
+    for cells in (polydata.GetVerts(), polydata.GetLines(),
+                  polydata.GetPolys(), polydata.GetStrips()):
+        if cells is None or cells.GetNumberOfCells() == 0:
+            continue
+        offsets, connectivity = getCellArrayOffsets(cells)
+        # empty cells use the point of the next one
+        starts = numpy.minimum(offsets[:-1], len(connectivity) - 1)
+        firsts.append(connectivity[starts])
+    if not firsts:
+        return numpy.zeros(0, dtype=numpy.int64)
+    return numpy.concatenate(firsts)
+
+
+def getMarkerGroups(marker):
+    '''
+    Returns the lists of the (non empty) groups of marker.x and marker.y
+    Coordinates that share a type, size and color, so that each list is
+    glyphed at once by prepMarkerArrays. The size (color) is not compared
+    when the points have their own sizes (values).
+    '''
+    groups = collections.OrderedDict()
+    sizes = marker.x.sizes()
+    for i in range(len(marker.x)):
+        if sizes[i] == 0:
+            continue
+        key = (marker.type[i],
+               None if isinstance(marker.size, numpy.ndarray) else marker.size[i],
+               None if marker.value is not None else str(marker.color[i]))
+        groups.setdefault(key, []).append(i)
+    return list(groups.values())
+
+
+def prepMarkerArrays(marker, screenGeom, scale=None, cmap=None, indices=[0]):
+    '''
+    Glyphs the points of the groups indices of a marker whose x and y are
+    Coordinates (set from numpy arrays), with the type, color and size of
+    the first of these groups (see getMarkerGroups). The points are colored
+    by marker.value through a lookup table of the colormap (by the color of
+    the group otherwise) and sized by marker.size when it is an array.
+    marker.value and array sizes have one value per point of all the groups.
+    Returns (glyphs, glyph source polydata, geo) like prepMarker.
+    '''
+    index = indices[0]
+    offsets = marker.x.offsets
+    if not numpy.array_equal(marker.x.sizes(), marker.y.sizes()):
+        raise ValueError("marker x and y must have the same number of values")
+    if len(indices) == 1:
+        # points of the group in the per point arrays
+        points = slice(offsets[index], offsets[index + 1])
+    else:
+        pointGroups = numpy.repeat(numpy.arange(len(offsets) - 1), marker.x.sizes())
+        points = numpy.isin(pointGroups, indices)
+    x = marker.x.values[points]
+    y = marker.y.values[points]
+    # float points, as vtkPoints defaults to
+    xyz = numpy.zeros((len(x), 3), dtype=numpy.float32)
+    xyz[:, 0] = x
+    xyz[:, 1] = y
+    pts = vtk.vtkPoints()
+    pts.SetData(numpy_to_vtk_wrapper(xyz, deep=False))
+    geo, pts = project(pts, marker.projection, marker.worldcoordinate)
+    markers = vtk.vtkPolyData()
+    markers.SetPoints(pts)
+
+    g = vtk.vtkGlyph2D()
+    if isinstance(marker.size, numpy.ndarray):
+        sizes = numpy.asarray(marker.size, dtype=numpy.float64)
+        if len(sizes) != offsets[-1]:
+            raise ValueError("marker size must have one value per point")
+        sizes = numpy_to_vtk_wrapper(sizes[points], deep=True)
+        sizes.SetName("Sizes")
+        markers.GetPointData().SetScalars(sizes)
+        # the source has the size 1, scaled for each point
+        gs, pd = prepGlyph(g, marker, screenGeom=screenGeom, index=index, size=1.)
+        g.SetScaleModeToScaleByScalar()
+        g.SetScaleFactor(1.)
+    else:
+        gs, pd = prepGlyph(g, marker, screenGeom=screenGeom, index=index)
+        g.SetScaleModeToDataScalingOff()
+
+    if scale:
+        T = vtk.vtkTransform()
+        T.Scale(scale[0], scale[1], 1.)
+        markers = applyTransformationToDataset(T, markers)
+
+    g.SetInputData(markers)
+    g.Update()
+    glyphs = g.GetOutput()
+
+    if marker.value is not None:
+        values = numpy.asarray(marker.value, dtype=numpy.float64)
+        if len(values) != offsets[-1]:
+            raise ValueError("marker value must have one value per point")
+        cmap = getMarkerColormap(marker, cmap)
+        lut = vtk.vtkLookupTable()
+        lut.SetNumberOfTableValues(256)
+        for i in range(256):
+            color = (list(cmap.index[i]) + [100.])[:4]
+            lut.SetTableValue(i, *[C / 100. for C in color])
+        lut.SetNanColor(0., 0., 0., 0.)
+        if marker.valuerange is not None:
+            vmin, vmax = marker.valuerange
+        elif numpy.isfinite(values).any():
+            vmin, vmax = numpy.nanmin(values), numpy.nanmax(values)
+        else:
+            vmin, vmax = 0., 1.
+        lut.SetRange(vmin, vmax)
+        # all the points of the groups are mapped at once
+        mapped = lut.MapScalars(numpy_to_vtk_wrapper(values[points], deep=True),
+                                vtk.VTK_COLOR_MODE_MAP_SCALARS, -1)
+        rgba = VN.vtk_to_numpy(mapped).reshape((-1, 4))
+    else:
+        rgba = numpy.array([getMarkerColor(marker, marker.color[index], cmap)],
+                           dtype=numpy.uint8)
+        rgba = numpy.broadcast_to(rgba, (len(x), 4))
+
+    # each glyph cell has the color of its point, the glyphs
+    # of the points follow each other with the points of the source
+    cellColors = rgba[getFirstPointIds(glyphs) // g.GetSource().GetNumberOfPoints()]
+    colors = VN.numpy_to_vtk(numpy.ascontiguousarray(cellColors), deep=True,
+                             array_type=vtk.VTK_UNSIGNED_CHAR)
+    colors.SetName('Colors')
+    glyphs.GetCellData().AddArray(colors)
+    return glyphs, pd, geo
+
+
 def prepMarker(marker, screenGeom, scale=None, cmap=None):
+    if isinstance(marker.x, Coordinates) and isinstance(marker.y, Coordinates):
+        # points arrays, one glyph polydata per type, size and color,
+        # see prepMarkerArrays
+        n = len(marker.x)
+        for a in ["color", "size", "type"]:
+            v = getattr(marker, a)
+            # per point arrays are not extended
+            if not isinstance(v, numpy.ndarray):
+                while len(v) < n:
+                    v.append(v[-1])
+        return [prepMarkerArrays(marker, screenGeom, scale, cmap, indices)
+                for indices in getMarkerGroups(marker)]
     n = prepPrimitive(marker)
     if n == 0:
         return []
@@ -1968,18 +2889,6 @@ def prepMarker(marker, screenGeom, scale=None, cmap=None):
     return actors
 
 
-def __build_ld__():
-    pts = vtk.vtkPoints()
-    lines = vtk.vtkCellArray()
-    linePolyData = vtk.vtkPolyData()
-    linePolyData.SetPoints(pts)
-    linePolyData.SetLines(lines)
-    colors = vtk.vtkUnsignedCharArray()
-    colors.SetNumberOfComponents(4)
-    colors.SetName("Colors")
-    return pts, lines, linePolyData, colors
-
-
 def stippleLine(prop, line_type):
     if line_type == 'long-dash':
         prop.SetLineStipplePattern(int('0000111111111111', 2))
@@ -2025,40 +2934,140 @@ def getStipple(line_type):
         raise Exception("Unknown line type: '%s'" % line_type)
 
 
+# Projected bounds per (world coordinates, projection state, subdiv).
+# projectedBoundsCache.hits and projectedBoundsCache.misses count the lookups.
+projectedBoundsCache = LRUCache(256)
+
+
 def getProjectedBoundsForWorldCoords(wc, proj, subdiv=50):
-    if vcs.elements['projection'][proj].type == 'linear':
+    if isinstance(proj, str):
+        proj = vcs.elements['projection'][proj]
+    if proj.type == 'linear':
         return wc
 
-    xs = numpy.linspace(wc[0], wc[1], subdiv).tolist()
-    xs += [wc[1], ] * subdiv
-    xs += numpy.linspace(wc[1], wc[0], subdiv).tolist()
-    xs += [wc[0], ] * subdiv
+    key = (tuple(float(v) for v in wc), getProjectionKey(proj), subdiv)
+    bounds = projectedBoundsCache.get(key)
+    if bounds is not None:
+        return bounds
 
-    ys = [wc[2], ] * subdiv
-    ys += numpy.linspace(wc[2], wc[3], subdiv).tolist()
-    ys += [wc[3], ] * subdiv
-    ys += numpy.linspace(wc[3], wc[2], subdiv).tolist()
+    # the boundary of the world coordinates rectangle, subdiv points per side
+    xs = numpy.concatenate([numpy.linspace(wc[0], wc[1], subdiv),
+                            numpy.full(subdiv, float(wc[1])),
+                            numpy.linspace(wc[1], wc[0], subdiv),
+                            numpy.full(subdiv, float(wc[0]))])
+    ys = numpy.concatenate([numpy.full(subdiv, float(wc[2])),
+                            numpy.linspace(wc[2], wc[3], subdiv),
+                            numpy.full(subdiv, float(wc[3])),
+                            numpy.linspace(wc[3], wc[2], subdiv)])
 
     pts = vtk.vtkPoints()
-
-    for idx in range(len(xs)):
-        pts.InsertNextPoint(xs[idx], ys[idx], 0.0)
+    pts.SetData(numpy_to_vtk_wrapper(
+        numpy.column_stack([xs, ys, numpy.zeros(len(xs))]), deep=True))
 
     geoTransform, xformPts = project(pts, proj, wc)
+    bounds = xformPts.GetBounds()
+    projectedBoundsCache.put(key, bounds)
+    return bounds
+
+
+# When True, prepLine only densifies the segments that are visibly curved
+# once projected (see getLineSubdivisions) instead of all of them.
+adaptiveLineDensification = False
+
+
+def densifyLine(x, y, subdivisions):
+    '''
+    Returns the numpy arrays x, y with each segment divided in subdivisions
+    (an int, or an int per segment) by linear interpolation. The points of
+    the segment from point j - 1 to point j are
+    p[j - 1] + i / subdivisions * (p[j] - p[j - 1]) for i = 1 .. subdivisions.
+    '''
+    if len(x) < 2:
+        return x, y
+    numberOfSegments = len(x) - 1
+    subdivisions = numpy.broadcast_to(numpy.asarray(subdivisions, dtype=numpy.int64),
+                                      (numberOfSegments,))
+    segments = numpy.repeat(numpy.arange(numberOfSegments), subdivisions)
+    firsts = numpy.cumsum(subdivisions) - subdivisions
+    i = numpy.arange(len(segments)) - firsts[segments] + 1
+    t = i / subdivisions[segments].astype(numpy.float64)
+    dx = numpy.diff(x)
+    dy = numpy.diff(y)
+    return (numpy.concatenate([x[:1], x[segments] + t * dx[segments]]),
+            numpy.concatenate([y[:1], y[segments] + t * dy[segments]]))
+
+
+def getLineSubdivisions(x, y, proj, wc, maxSubdivisions, projBounds, tolerance=1.e-4):
+    '''
+    Returns the number of subdivisions for each segment of x, y:
+    1 when the projected middle of the segment is within tolerance (relative
+    to the projected bounds) of the middle of the projected segment,
+    maxSubdivisions otherwise.
+    '''
+    px, py = project_numpy(numpy.concatenate([x, (x[:-1] + x[1:]) / 2.]),
+                           numpy.concatenate([y, (y[:-1] + y[1:]) / 2.]), proj, wc)
+    n = len(x)
+    deviation = numpy.hypot(px[n:] - (px[:n - 1] + px[1:n]) / 2.,
+                            py[n:] - (py[:n - 1] + py[1:n]) / 2.)
+    size = numpy.hypot(projBounds[1] - projBounds[0], projBounds[3] - projBounds[2])
+    # non finite deviations (points that cannot be projected) stay densified
+    straight = deviation <= tolerance * size
+    return numpy.where(straight, 1, maxSubdivisions)
+
+
+def genPolyLines(parts):
+    '''
+    Returns (polydata, colors) with one polyline per (x, y, color) of parts,
+    the colors are an unsigned char cell array named "Colors".
+    Lines with less than two points have no cell.
+    '''
+    sizes = numpy.array([len(x) for x, _, _ in parts], dtype=numpy.int64)
+    # float points, as vtkPoints defaults to
+    xyz = numpy.zeros((sizes.sum(), 3), dtype=numpy.float32)
+    xyz[:, 0] = numpy.concatenate([x for x, _, _ in parts])
+    xyz[:, 1] = numpy.concatenate([y for _, y, _ in parts])
+    pts = vtk.vtkPoints()
+    pts.SetData(numpy_to_vtk_wrapper(xyz, deep=False))
+
+    hasCell = sizes >= 2
+    offsets = numpy.concatenate([[0], numpy.cumsum(sizes[hasCell])])
+    pointIds = numpy.arange(len(xyz))[numpy.repeat(hasCell, sizes)]
+    linesPoly = vtk.vtkPolyData()
+    linesPoly.SetPoints(pts)
+    linesPoly.SetLines(genCellArray(offsets, pointIds))
+
+    rgba = numpy.array([color for _, _, color in parts], dtype=numpy.uint8).reshape((-1, 4))
+    colors = VN.numpy_to_vtk(rgba[hasCell], deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
+    colors.SetName("Colors")
+    linesPoly.GetCellData().SetScalars(colors)
+    return linesPoly, colors
 
-    # def printPoints(vtkPoints):
-    #     ptStr = ''
-    #     for ptIdx in range(vtkPoints.GetNumberOfPoints()):
-    #         point = vtkPoints.GetPoint(ptIdx)
-    #         ptStr = '{0}, {1}'.format(point, ptStr)
-    #     print(ptStr)
 
-    # print('Subdivided points')
-    # printPoints(pts)
-    # print('Transformed subdivided points')
-    # printPoints(xformPts)
+# Projected extents of world coordinates scans, see getProjectedWorldCoordsExtent.
+projectedExtentCache = LRUCache(256)
+
+
+def getProjectedWorldCoordsExtent(proj, wc, geo=None, subdiv=25):
+    '''
+    Returns [xmin, xmax, ymin, ymax] of a subdiv x subdiv grid of points
+    scanning the world coordinates wc once projected. The whole grid is used,
+    not only the boundary, in case the projection deformation brings
+    the origin close to other points. Memorized per transform, wc and subdiv.
+    '''
+    if geo is None:
+        geo = getGeoTransform(proj, wc)
+    key = (geo, tuple(float(v) for v in wc), subdiv)
+    extent = projectedExtentCache.get(key)
+    if extent is not None:
+        return list(extent)
 
-    return xformPts.GetBounds()
+    wx = numpy.arange(wc[0], wc[1], (wc[1] - wc[0]) / float(subdiv))
+    wy = numpy.arange(wc[2], wc[3], (wc[3] - wc[2]) / float(subdiv))
+    wx, wy = numpy.meshgrid(wx, wy, indexing="ij")
+    px, py = project_numpy(wx, wy, proj, wc, geo=geo)
+    extent = (px.min(), px.max(), py.min(), py.max())
+    projectedExtentCache.put(key, extent)
+    return list(extent)
 
 
 def prepLine(plotsContext, line, geoBounds=None, cmap=None):
@@ -2096,10 +3105,18 @@ def prepLine(plotsContext, line, geoBounds=None, cmap=None):
     if isinstance(cmap, str):
         cmap = vcs.elements["colormap"][cmap]
 
+    projectionType = vcs.elements["projection"][line.projection].type
+    if projectionType == "linear":
+        numberOfSubdivisions = None
+    elif projectionType in round_projections:
+        numberOfSubdivisions = 50
+    else:
+        numberOfSubdivisions = 25
+
     for i in range(number_lines):
 
-        x = line.x[i]
-        y = line.y[i]
+        x = getCoordinatesGroup(line.x, i)
+        y = getCoordinatesGroup(line.y, i)
         if isinstance(line.color[i], int):
             c = cmap.index[line.color[i]]
         else:
@@ -2107,58 +3124,27 @@ def prepLine(plotsContext, line, geoBounds=None, cmap=None):
         w = line.width[i]
         t = line.type[i]
 
-        if (t, w) not in line_data:
-            line_data[(t, w)] = __build_ld__()
-        pts, lines, linesPoly, colors = line_data[(t, w)]
         vtk_color = [int(component / 100. * 255) for component in c]
 
         number_points = max(len(x), len(y))
 
-        point_offset = pts.GetNumberOfPoints()
         # Extend x or y to the length of the other by duplicating the last
         # coord.
-        for a in [x, y]:
-            while len(a) < number_points:
-                a.append(a[-1])
-
-        if vcs.elements["projection"][line.projection].type == "linear":
-            for j in range(number_points):
-                pts.InsertNextPoint(x[j], y[j], 0.)
-            n2 = number_points - 1
-        else:
-            pts.InsertNextPoint(x[0], y[0], 0.)
-            n2 = 0
-            for j in range(1, number_points):
-                if vcs.elements["projection"][
-                        line.projection].type in round_projections:
-                    NPointsInterp = 50
-                else:
-                    NPointsInterp = 25
-                for i in range(1, NPointsInterp + 1):
-                    if x[j] != x[j - 1]:
-                        tmpx = x[j - 1] + \
-                            float(i) / NPointsInterp * (x[j] - x[j - 1])
-                    else:
-                        tmpx = x[j]
-                    if y[j] != y[j - 1]:
-                        tmpy = y[j - 1] + \
-                            float(i) / NPointsInterp * (y[j] - y[j - 1])
-                    else:
-                        tmpy = y[j]
-                    pts.InsertNextPoint(tmpx, tmpy, 0.)
-                    n2 += 1
-        for j in range(n2):
-            colors.InsertNextTypedTuple(vtk_color)
-            ln_tmp = vtk.vtkLine()
-            ln_tmp.GetPointIds().SetId(0, j + point_offset)
-            ln_tmp.GetPointIds().SetId(1, j + point_offset + 1)
-            lines.InsertNextCell(ln_tmp)
+        x = numpy.concatenate([x, numpy.repeat(x[-1:], number_points - len(x))])
+        y = numpy.concatenate([y, numpy.repeat(y[-1:], number_points - len(y))])
+        if numberOfSubdivisions is not None:
+            # the segments are curves once projected
+            if adaptiveLineDensification:
+                subdivisions = getLineSubdivisions(x, y, line.projection, line.worldcoordinate,
+                                                   numberOfSubdivisions, projBounds)
+            else:
+                subdivisions = numberOfSubdivisions
+            x, y = densifyLine(x, y, subdivisions)
+        line_data.setdefault((t, w), []).append((x, y, vtk_color))
 
     for t, w in line_data:
-        pts, _, linesPoly, colors = line_data[(t, w)]
-
-        linesPoly.GetCellData().SetScalars(colors)
-        geoTransform, pts = project(pts, line.projection, line.worldcoordinate)
+        linesPoly, colors = genPolyLines(line_data[(t, w)])
+        geoTransform, pts = project(linesPoly.GetPoints(), line.projection, line.worldcoordinate)
         linesPoly.SetPoints(pts)
 
         view = plotsContext.contextView
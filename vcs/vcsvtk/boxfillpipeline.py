@@ -293,19 +293,17 @@ class BoxfillPipeline(Pipeline2D):
             self._resultDict["vtk_backend_geofilters"] = \
                 [self._vtkPolyDataFilter]
         else:
-            thr = vtk.vtkThreshold()
-            # thr.SetInputConnection(self._vtkPolyDataFilter.GetOutputPort())
-            thr.SetInputData(self._vtkDataSetFittedToViewport)
+            # selects the cells of the polydata, no need for a surface filter
+            geoFilter2 = vcs2vtk.ThresholdPolyData()
+            geoFilter2.SetInputData(self._vtkDataSetFittedToViewport)
             if not self._gm.ext_1 and not self._gm.ext_2:
-                thr.ThresholdBetween(self._contourLevels[0],
-                                     self._contourLevels[-1])
+                geoFilter2.ThresholdBetween(self._contourLevels[0],
+                                            self._contourLevels[-1])
             elif self._gm.ext_1 and not self._gm.ext_2:
-                thr.ThresholdByLower(self._contourLevels[-1])
+                geoFilter2.ThresholdByLower(self._contourLevels[-1])
             elif not self._gm.ext_1 and self._gm.ext_2:
-                thr.ThresholdByUpper(self._contourLevels[0])
+                geoFilter2.ThresholdByUpper(self._contourLevels[0])
 
-            geoFilter2 = vtk.vtkDataSetSurfaceFilter()
-            geoFilter2.SetInputConnection(thr.GetOutputPort())
             mapper.SetInputConnection(geoFilter2.GetOutputPort())
             self._resultDict["vtk_backend_geofilters"] = [geoFilter2]
 
@@ -358,12 +356,9 @@ class BoxfillPipeline(Pipeline2D):
             for j, color in enumerate(tmpColors[i]):
                 mapper = vtk.vtkPolyDataMapper()
                 lut = vtk.vtkLookupTable()
-                th = vtk.vtkThreshold()
-                th.ThresholdBetween(l[j], l[j + 1])
-                # th.SetInputConnection(self._vtkPolyDataFilter.GetOutputPort())
-                th.SetInputData(self._vtkDataSetFittedToViewport)
-                geoFilter2 = vtk.vtkDataSetSurfaceFilter()
-                geoFilter2.SetInputConnection(th.GetOutputPort())
+                geoFilter2 = vcs2vtk.ThresholdPolyData()
+                geoFilter2.ThresholdBetween(l[j], l[j + 1])
+                geoFilter2.SetInputData(self._vtkDataSetFittedToViewport)
                 # Make the polydata output available here for patterning later
                 geoFilter2.Update()
                 geos.append(geoFilter2)
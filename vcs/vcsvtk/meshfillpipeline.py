@@ -67,12 +67,9 @@ class MeshfillPipeline(Pipeline2D):
             for j, color in enumerate(tmpColors[i]):
                 mapper = vtk.vtkPolyDataMapper()
                 lut = vtk.vtkLookupTable()
-                th = vtk.vtkThreshold()
-                th.ThresholdBetween(l[j], l[j + 1])
-                # th.SetInputConnection(self._vtkPolyDataFilter.GetOutputPort())
-                th.SetInputData(self._vtkDataSetFittedToViewport)
-                geoFilter2 = vtk.vtkDataSetSurfaceFilter()
-                geoFilter2.SetInputConnection(th.GetOutputPort())
+                geoFilter2 = vcs2vtk.ThresholdPolyData()
+                geoFilter2.ThresholdBetween(l[j], l[j + 1])
+                geoFilter2.SetInputData(self._vtkDataSetFittedToViewport)
                 # Make the polydata output available here for patterning later
                 geoFilter2.Update()
                 geos.append(geoFilter2)
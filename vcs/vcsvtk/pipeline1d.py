@@ -3,6 +3,7 @@ from .pipeline import Pipeline
 import numpy
 import vcs
 import cdms2
+from ..coordinates import Coordinates
 
 
 def smooth(x, beta, window_len=11):
@@ -15,6 +16,58 @@ def smooth(x, beta, window_len=11):
     return y[(window_len / 2):-(window_len / 2)]
 
 
+def segmentCoordinates(x, y):
+    """Splits x and y at their masked values, returns the Coordinates
+    of the runs of valid points (one line per run) and the row of each
+    line. 2D x or y hold one curve per row, 1D ones are shared by all
+    the curves."""
+    valid = ~(numpy.ma.getmaskarray(x) | numpy.ma.getmaskarray(y))
+    x = numpy.broadcast_to(numpy.ma.getdata(x), valid.shape)[valid]
+    y = numpy.broadcast_to(numpy.ma.getdata(y), valid.shape)[valid]
+    valid = numpy.atleast_2d(valid)
+    # starts and ends of the runs of valid points, an invalid point
+    # after each row splits the curves
+    padded = numpy.zeros((valid.shape[0], valid.shape[1] + 1), dtype=numpy.int8)
+    padded[:, :-1] = valid
+    edges = numpy.flatnonzero(numpy.diff(numpy.concatenate([[0], padded.ravel()])))
+    starts, ends = edges[::2], edges[1::2]
+    offsets = numpy.zeros(len(starts) + 1, dtype=numpy.int64)
+    numpy.cumsum(ends - starts, out=offsets[1:])
+    return (Coordinates(x, offsets), Coordinates(y, offsets.copy()),
+            starts // padded.shape[1])
+
+
+def decimateCoordinates(along, across, start, end, columns):
+    """Keeps the first, last, min and max point (across) of each pixel
+    column of the lines, the line drawn through these points covers the
+    same pixels as the full line.
+
+    along holds the Coordinates spanning start to end over columns
+    pixels, across the other coordinates (same offsets).
+    Returns the decimated Coordinates (along, across).
+    """
+    values = across.values
+    if len(values) == 0:
+        return along, across
+    column = numpy.floor((along.values - start) * (columns / float(end - start)))
+    line = numpy.repeat(numpy.arange(len(along)), along.sizes())
+    # runs of consecutive points of a line in the same column
+    first = numpy.ones(len(values), dtype=bool)
+    first[1:] = (column[1:] != column[:-1]) | (line[1:] != line[:-1])
+    run = numpy.cumsum(first) - 1
+    starts = numpy.flatnonzero(first)
+    ends = numpy.append(starts[1:], len(values)) - 1
+    byvalue = numpy.lexsort((values, run))
+    keep = numpy.zeros(len(values), dtype=bool)
+    keep[starts] = True
+    keep[ends] = True
+    keep[byvalue[starts]] = True  # min of each run
+    keep[byvalue[ends]] = True  # max of each run
+    offsets = numpy.searchsorted(numpy.flatnonzero(keep), along.offsets)
+    return (Coordinates(along.values[keep], offsets),
+            Coordinates(values[keep], offsets.copy()))
+
+
 class Pipeline1D(Pipeline):
 
     """Implementation of the Pipeline interface for 1D VCS plots."""
@@ -22,6 +75,30 @@ class Pipeline1D(Pipeline):
     def __init__(self, gm, context_, plot_keyargs):
         super(Pipeline1D, self).__init__(gm, context_, plot_keyargs)
 
+    def getCurves(self, data, axis):
+        """Returns the axes and the Coordinates of all the curves of data
+        along its last (shared) axis, with the row of each line.
+        The values axis only spans the range of the curves."""
+        curves = numpy.ma.masked_invalid(numpy.ma.reshape(data, (-1, data.shape[-1])))
+        if self._gm.smooth is not None:
+            curves = numpy.ma.array([smooth(curve, self._gm.smooth) for curve in curves])
+        if self._gm.flip:
+            location, axisLocation = "x", "y"
+        else:
+            location, axisLocation = "y", "x"
+        convert = vcs.utils.axisConvertFunctions[getattr(self._gm, location + "axisconvert")]
+        curves = convert["forward"](curves)
+        if curves.count() == 0:
+            # nothing to draw, any range will do
+            bounds = [0., 1.]
+        else:
+            bounds = [curves.min(), curves.max()]
+        values = cdms2.createAxis(numpy.array(bounds, dtype=numpy.float64))
+        axis = self.convertAxis(cdms2.createAxis(axis), axisLocation)
+        if self._gm.flip:
+            return (values, axis) + segmentCoordinates(curves, axis[:])
+        return (axis, values) + segmentCoordinates(axis[:], curves)
+
     def plot(self, data1, data2, tmpl, grid, transform, **kargs):
         """Overrides baseclass implementation."""
         Y = self._context().trimData1D(data1)
@@ -33,46 +110,37 @@ class Pipeline1D(Pipeline):
             if self._gm.flip:
                 raise RuntimeError("You cannot use the flip option on 1D graphic methods" +
                                    " if you are passing 2 arrays, please reverse order of arrays")
+            if self._gm.spaghetti:
+                raise RuntimeError("You cannot use the spaghetti option on 1D graphic methods" +
+                                   " if you are passing 2 arrays")
             X = Y
             data1._yname = data2.id
             Y = self._context().trimData1D(data2)
 
-        if self._gm.flip:
-            tmp = Y
-            Y = X
-            X = tmp
+        if self._gm.spaghetti:
+            X, Y, xs, ys, rows = self.getCurves(data1, X)
+        else:
+            if self._gm.flip:
+                tmp = Y
+                Y = X
+                X = tmp
 
-        X = self.convertAxis(cdms2.createAxis(X), "x")
-        if self._gm.smooth is not None:
-            Y = smooth(Y, self._gm.smooth)
-        Y = self.convertAxis(cdms2.createAxis(Y), "y")
+            X = self.convertAxis(cdms2.createAxis(X), "x")
+            if self._gm.smooth is not None:
+                Y = smooth(Y, self._gm.smooth)
+            Y = self.convertAxis(cdms2.createAxis(Y), "y")
+            xs, ys, rows = segmentCoordinates(X[:], Y[:])
 
         ln_tmp = self._context().canvas.createline()
-        Xs = X[:].tolist()
-        Ys = Y[:].tolist()
-        xs = []
-        ys = []
-        prev = None
-        for i, v in enumerate(Ys):
-            if v is not None and Xs[i] is not None:  # Valid data
-                if prev is None:
-                    prev = []
-                    prev2 = []
-                prev.append(Xs[i])
-                prev2.append(v)
-            else:
-                if prev is not None:
-                    xs.append(prev)
-                    ys.append(prev2)
-                    prev = None
-
-        if prev is not None:
-            xs.append(prev)
-            ys.append(prev2)
-
         ln_tmp._x = xs
         ln_tmp._y = ys
-        ln_tmp.color = [self._gm.linecolor, ]
+        if self._gm.spaghetti:
+            # one color per curve, spread over the colormap
+            colors = vcs.getcolors(range(data1.size // data1.shape[-1] + 1), split=0)
+            # the legend uses the first color, even without curves
+            ln_tmp.color = [colors[row] for row in rows] or colors[:1]
+        else:
+            ln_tmp.color = [self._gm.linecolor, ]
         ln_tmp.priority = tmpl.data.priority
         if self._gm.linewidth > 0:
             ln_tmp.width = self._gm.linewidth
@@ -101,6 +169,16 @@ class Pipeline1D(Pipeline):
             x2 += .0001
 
         ln_tmp._worldcoordinate = [x1, x2, y1, y2]
+        if self._gm.decimate:
+            # one column of pixels of the data area per bin, along the
+            # axis of the data (vertical when flipped)
+            width, height = self._context().renWin.GetSize()
+            if self._gm.flip:
+                columns = int(abs(tmpl.data.y2 - tmpl.data.y1) * height) + 1
+                ln_tmp._y, ln_tmp._x = decimateCoordinates(ys, xs, y1, y2, columns)
+            else:
+                columns = int(abs(tmpl.data.x2 - tmpl.data.x1) * width) + 1
+                ln_tmp._x, ln_tmp._y = decimateCoordinates(xs, ys, x1, x2, columns)
         if self._gm.marker is not None:
             m = self._context().canvas.createmarker()
             m.type = self._gm.marker
@@ -109,8 +187,8 @@ class Pipeline1D(Pipeline):
                 m.size = self._gm.markersize
             else:
                 m.priority = 0
-            m._x = ln_tmp.x
-            m._y = ln_tmp.y
+            m._x = xs
+            m._y = ys
             m._viewport = ln_tmp.viewport
             m._worldcoordinate = ln_tmp.worldcoordinate
 
@@ -134,7 +212,7 @@ class Pipeline1D(Pipeline):
             legd = self._context().canvas.createline()
             legd.x = [tmpl.legend.x1, tmpl.legend.x2]
             legd.y = [tmpl.legend.y1, tmpl.legend.y1]  # [y1, y1] intentional.
-            legd.color = ln_tmp.color
+            legd.color = ln_tmp.color[:1]
             legd.width = ln_tmp.width
             legd.type = ln_tmp.type
             t = self._context().canvas.createtext(
@@ -349,14 +349,18 @@ class Pipeline2D(IPipeline2D):
                                       deep=False,
                                       grid=self._vtkDataSet,
                                       geo=self._vtkGeoTransform, genVectors=self._needsVectors,
-                                      dualGrid=dualGrid)
+                                      dualGrid=dualGrid, pedigreeIds=False)
         self._data1 = genGridDict["data"]
         self._data2 = genGridDict["data2"]
         self._updateFromGenGridDict(genGridDict)
 
     def _createPolyDataFilter(self):
         """This is only used when we use the grid stored in the file for all plots."""
-        self._vtkPolyDataFilter = vtk.vtkDataSetSurfaceFilter()
+        if self._vtkDataSet.IsA("vtkPolyData"):
+            # genGrid already built the polydata (e.g. wrapped rectilinear grids)
+            self._vtkPolyDataFilter = vtk.vtkPassThrough()
+        else:
+            self._vtkPolyDataFilter = vtk.vtkDataSetSurfaceFilter()
         if self._hasCellData == self._needsCellData:
             self._vtkPolyDataFilter.SetInputData(self._vtkDataSet)
         elif self._hasCellData:
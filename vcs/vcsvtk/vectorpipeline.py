@@ -31,20 +31,12 @@ class VectorPipeline(Pipeline2D):
                 lat = latAccessor[:]
             if lonAccessor:
                 lon = lonAccessor[:]
-            newv = vtk.vtkDoubleArray()
-            newv.SetNumberOfComponents(3)
-            newv.InsertTypedTuple(0, [lon.min(), lat.min(), 0])
-            newv.InsertTypedTuple(1, [lon.max(), lat.max(), 0])
+            dimX, dimY = vcs2vtk.project_numpy([lon.min(), lon.max()],
+                                               [lat.min(), lat.max()],
+                                               projection, self._vtkDataSetBounds)
 
-            vcs2vtk.projectArray(newv, projection, self._vtkDataSetBounds)
-            dimMin = [0, 0, 0]
-            dimMax = [0, 0, 0]
-
-            newv.GetTypedTuple(0, dimMin)
-            newv.GetTypedTuple(1, dimMax)
-
-            maxDimX = max(dimMin[0], dimMax[0])
-            maxDimY = max(dimMin[1], dimMax[1])
+            maxDimX = dimX.max()
+            maxDimY = dimY.max()
 
             if lat.max() != 0.0:
                 scale = abs((maxDimY / lat.max()))